@@ -0,0 +1,73 @@
+"""
+Benchmark: chart render time per chart and render profile
+
+Answers Q1-Q8 on a cleaned synthetic frame, then draws every chart with
+each render profile: once on a new figure template, then again on the
+reused template (as a batch worker or chart pool process does from its
+second job on). Prints the seconds per chart and the file sizes, plus the
+same for the one-image dashboard.
+
+Usage:
+    python benchmarks/bench_charts.py [rows] [--format png|svg] [--repeat N]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts'))
+
+import synth  # noqa: E402
+from vrinda.aggregates import build_aggregates  # noqa: E402
+from vrinda.charts import (CHARTS, FORMATS, PROFILES, apply_style, clear_templates,  # noqa: E402
+                           render, render_dashboard, render_profile)
+from vrinda.cleaning import clean_data  # noqa: E402
+from vrinda.cli import answer_questions  # noqa: E402
+from vrinda.schema import compact_frame  # noqa: E402
+from vrinda.stages import plan  # noqa: E402
+
+
+def chart_tables(rows):
+    """{chart: tables} of a cleaned synthetic frame of `rows` rows."""
+    agg = build_aggregates(compact_frame(clean_data(synth.make_block(0, rows, seed=0)[0])))
+    tables = {}
+    with contextlib.redirect_stdout(io.StringIO()):
+        answer_questions(agg, plan(), lambda name, **kw: tables.__setitem__(name, kw))
+    return tables
+
+
+def main(rows, format, repeat):
+    tables = chart_tables(rows)
+    apply_style()
+    names = list(CHARTS)
+    print(f"{'profile':>8} {'chart':>9} {'new (s)':>8} {'reused (s)':>11} {'size (kB)':>10}")
+    with tempfile.TemporaryDirectory() as out:
+        for name in sorted(PROFILES):
+            profile = render_profile(name, format)
+            clear_templates()
+            total_new = total_reused = 0
+            for chart in names:
+                path = os.path.join(out, f'{name}_{chart}.{format}')
+                new = render(chart, path, profile, **tables[chart])
+                reused = min(render(chart, path, profile, **tables[chart]) for _ in range(repeat))
+                total_new, total_reused = total_new + new, total_reused + reused
+                print(f"{name:>8} {chart:>9} {new:>8.3f} {reused:>11.3f} "
+                      f"{os.path.getsize(path) / 1024:>10.1f}")
+            path = os.path.join(out, f'{name}_dashboard.{format}')
+            seconds = render_dashboard(path, tables, profile)
+            print(f"{name:>8} {'all 8':>9} {total_new:>8.3f} {total_reused:>11.3f}")
+            print(f"{name:>8} {'dashboard':>9} {seconds:>8.3f} {'-':>11} "
+                  f"{os.path.getsize(path) / 1024:>10.1f}")
+            print()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('rows', nargs='?', type=int, default=100_000)
+    parser.add_argument('--format', choices=FORMATS, default='png')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    main(args.rows, args.format, args.repeat)
@@ -0,0 +1,70 @@
+"""
+Benchmark: STEP 2 cleaning, per-row rules vs per-distinct-value rules
+
+Builds a Vrinda-shaped frame in memory, cleans it with the original per-row
+string operations and with vrinda.cleaning.clean_data(), checks that both
+give the same values and prints the timings.
+
+Usage:
+    python benchmarks/bench_cleaning.py [rows ...]
+"""
+
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts'))
+
+import synth  # noqa: E402
+from vrinda.cleaning import AGE_BINS, AGE_LABELS, DATE_FORMAT, GENDER_MAP, clean_data  # noqa: E402
+
+
+def make_frame(rows, seed=0):
+    """Raw frame with the export's quirks (see synth.py)."""
+    return synth.make_block(0, rows, seed=seed)[0]
+
+
+def legacy_clean(df):
+    """The original per-row STEP 2 rules."""
+    df.columns = df.columns.str.strip()
+    df['Gender'] = df['Gender'].map(GENDER_MAP)
+    df['Date'] = pd.to_datetime(df['Date'], format=DATE_FORMAT, errors='coerce')
+    df['Month'] = df['Date'].dt.month
+    df['Month_Name'] = df['Date'].dt.strftime('%B')
+    df['Year'] = df['Date'].dt.year
+    df['Amount'] = pd.to_numeric(df['Amount'], errors='coerce')
+    df['Status'] = df['Status'].str.strip().str.title()
+    df['Channel'] = df['Channel'].str.strip().str.title()
+    df['Age_Group'] = pd.cut(df['Age'], bins=AGE_BINS, labels=AGE_LABELS)
+    df['ship-state'] = df['ship-state'].str.strip().str.upper()
+    return df
+
+
+def timed(func, frame):
+    start = time.perf_counter()
+    result = func(frame)
+    return result, time.perf_counter() - start
+
+
+def check_same(legacy, current):
+    """Both paths must give the same value in every cell."""
+    for col in legacy.columns:
+        pd.testing.assert_series_equal(legacy[col].astype(object), current[col].astype(object),
+                                       check_dtype=False, obj=col)
+
+
+def main(sizes):
+    print(f"{'rows':>12} {'per-row (s)':>12} {'per-value (s)':>14} {'speedup':>8}")
+    for rows in sizes:
+        raw = make_frame(rows)
+        legacy, legacy_time = timed(legacy_clean, raw.copy())
+        current, current_time = timed(clean_data, raw.copy())
+        check_same(legacy, current)
+        print(f"{rows:>12,} {legacy_time:>12.3f} {current_time:>14.3f} "
+              f"{legacy_time / current_time:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [100_000, 1_000_000])
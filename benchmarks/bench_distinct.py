@@ -0,0 +1,95 @@
+"""
+Benchmark: exact distinct orders vs HyperLogLog sketches
+
+Builds a cleaned Vrinda-shaped frame in memory and aggregates it with exact
+distinct orders and with HyperLogLog at several precisions, in one pass and
+chunk by chunk (merged with AggregateAccumulator). Prints, per mode, the
+aggregation time, the memory held for distinct orders, the error of the
+total ("Total Orders") and the worst error of the per-state, per-channel
+and per-month distinct orders.
+
+Usage:
+    python benchmarks/bench_distinct.py [rows ...] [--precision P ...] [--chunksize N]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts'))
+
+import synth  # noqa: E402
+from vrinda.aggregates import AggregateAccumulator, build_aggregates  # noqa: E402
+from vrinda.cleaning import clean_data  # noqa: E402
+
+PER_DIMENSION = ['ship-state', 'Channel', 'Month']
+
+
+def distinct_bytes(agg):
+    """Memory held for distinct orders (hash sets or sketch registers)."""
+    if agg.approximate:
+        return agg.order_ids.registers.nbytes + sum(
+            table.registers.nbytes + table.keys.memory_usage(deep=True).sum()
+            for table in agg.distinct.values())
+    return agg.order_ids.nbytes + sum(
+        int(pairs.memory_usage(deep=True).sum()) for pairs in agg.distinct.values())
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def aggregate(df, precision, chunksize):
+    if not chunksize:
+        return build_aggregates(df, precision)
+    accumulator = AggregateAccumulator()
+    for start in range(0, len(df), chunksize):
+        accumulator.add(build_aggregates(df.iloc[start:start + chunksize], precision))
+    return accumulator.result()
+
+
+def worst_error(exact, approx):
+    """Largest relative error of distinct_orders over PER_DIMENSION."""
+    worst = 0.0
+    for dim in PER_DIMENSION:
+        truth = exact.table(dim, distinct=True)['distinct_orders']
+        estimate = approx.table(dim, distinct=True)['distinct_orders']
+        worst = max(worst, float((estimate / truth - 1).abs().max()))
+    return worst
+
+
+def main(sizes, precisions, chunksize):
+    print(f"{'rows':>10} {'mode':>12} {'chunked':>8} {'time (s)':>9} {'memory (MB)':>12} "
+          f"{'total err':>10} {'worst dim err':>14}")
+    for rows in sizes:
+        df = clean_data(synth.make_block(0, rows, seed=0)[0])
+        _, nunique_time = timed(lambda: df['Order ID'].nunique())
+        print(f"{rows:>10,} {'nunique()':>12} {'-':>8} {nunique_time:>9.3f}")
+        exact = None
+        for precision in [None] + precisions:
+            for chunks in (0, chunksize):
+                agg, seconds = timed(lambda: aggregate(df, precision, chunks))
+                if exact is None:
+                    exact = agg
+                mode = 'exact' if precision is None else f'hll p={precision}'
+                total_error = agg.total_orders / exact.total_orders - 1
+                dim_error = worst_error(exact, agg)
+                print(f"{rows:>10,} {mode:>12} {'yes' if chunks else 'no':>8} {seconds:>9.3f} "
+                      f"{distinct_bytes(agg) / 1e6:>12.2f} {total_error:>+10.2%} "
+                      f"{dim_error:>14.2%}")
+        expected = ', '.join(f"p={p}: {1.04 / np.sqrt(2 ** p):.2%}" for p in precisions)
+        print(f"{'':>10} expected standard error {expected}\n")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('rows', nargs='*', type=int, default=[100_000, 1_000_000])
+    parser.add_argument('--precision', type=int, action='append', default=None)
+    parser.add_argument('--chunksize', type=int, default=250_000)
+    args = parser.parse_args()
+    main(args.rows, args.precision or [10, 12, 14], args.chunksize)
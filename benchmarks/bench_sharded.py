@@ -0,0 +1,75 @@
+"""
+Benchmark: sharded aggregation speedup curve
+
+Builds a cleaned Vrinda-shaped frame in memory, then builds its aggregates
+with vrinda.sharding.sharded_aggregates() on 1, 2, 4, ... worker processes
+(up to the core count, or the --workers given). Prints the wall time per
+worker count, the speedup over one process and whether the cube's state
+digest matches the single-process build.
+
+Usage:
+    python benchmarks/bench_sharded.py [rows ...] [--workers W ...] [--precision P] [--repeat N]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts'))
+
+import synth  # noqa: E402
+from vrinda.cleaning import clean_data  # noqa: E402
+from vrinda.periods import sort_by_date  # noqa: E402
+from vrinda.schema import compact_frame  # noqa: E402
+from vrinda.sharding import sharded_aggregates  # noqa: E402
+from vrinda.state import state_digest  # noqa: E402
+
+
+def default_workers():
+    """1, 2, 4, ... up to the number of cores (and the core count itself)."""
+    cores = os.cpu_count() or 1
+    counts = [1]
+    while counts[-1] * 2 <= cores:
+        counts.append(counts[-1] * 2)
+    return counts if counts[-1] == cores else counts + [cores]
+
+
+def best_time(func, repeat):
+    """(result, fastest wall time of `repeat` runs)."""
+    best, result = None, None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        seconds = time.perf_counter() - start
+        best = seconds if best is None else min(best, seconds)
+    return result, best
+
+
+def main(sizes, worker_counts, precision, repeat):
+    print(f"cores: {os.cpu_count()}, distinct orders: "
+          f"{'exact' if precision is None else f'hll p={precision}'}")
+    print(f"{'rows':>10} {'workers':>7} {'time (s)':>9} {'speedup':>8} {'same cube':>10}")
+    for rows in sizes:
+        df = sort_by_date(compact_frame(clean_data(synth.make_block(0, rows, seed=0)[0])))
+        single = None
+        for workers in worker_counts:
+            agg, seconds = best_time(lambda: sharded_aggregates(df, workers, precision), repeat)
+            digest = state_digest(agg)
+            if single is None:
+                single = (seconds, digest)
+            print(f"{rows:>10,} {workers:>7} {seconds:>9.3f} {single[0] / seconds:>7.2f}x "
+                  f"{'yes' if digest == single[1] else 'NO':>10}")
+        print()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('rows', nargs='*', type=int, default=[1_000_000])
+    parser.add_argument('--workers', type=int, action='append', default=None)
+    parser.add_argument('--precision', type=int, default=None,
+                        help="HyperLogLog precision (default: exact distinct orders)")
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    main(args.rows, sorted(set(args.workers or default_workers()) | {1}), args.precision,
+         args.repeat)
@@ -0,0 +1,98 @@
+"""
+Benchmark: handing the cleaned frame to worker processes
+
+Each of W worker processes sums the Amount of its share of the rows, given
+the data one of three ways:
+  frame   - the whole cleaned frame pickled into every task
+  shard   - only the task's rows, pickled
+  shared  - a vrinda.shared handle; the worker attaches zero-copy views
+Prints the wall time of the round (pool start-up excluded), the bytes
+pickled per task and the private memory the workers gained (Linux only).
+
+Usage:
+    python benchmarks/bench_shared.py [rows ...] [--workers W ...]
+"""
+
+import argparse
+import os
+import pickle
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts'))
+
+import synth  # noqa: E402
+from vrinda.cleaning import clean_data  # noqa: E402
+from vrinda.schema import compact_frame  # noqa: E402
+from vrinda.shared import SHARED_COLUMNS, attach, publish  # noqa: E402
+
+MODES = ('frame', 'shard', 'shared')
+
+
+def private_kb():
+    """Private (unshared) memory of this process in kB, or None off Linux."""
+    try:
+        with open('/proc/self/smaps_rollup') as f:
+            return sum(int(line.split()[1]) for line in f
+                       if line.startswith(('Private_Clean:', 'Private_Dirty:')))
+    except OSError:
+        return None
+
+
+def baseline(_):
+    return private_kb()
+
+
+def task(mode, payload, start, stop):
+    if mode == 'shared':
+        df = attach(payload).iloc[start:stop]
+    elif mode == 'frame':
+        df = payload.iloc[start:stop]
+    else:
+        df = payload
+    return float(df['Amount'].sum()), private_kb()
+
+
+def run(df, mode, workers, handle):
+    bounds = [(len(df) * i // workers, len(df) * (i + 1) // workers) for i in range(workers)]
+    with ProcessPoolExecutor(workers) as pool:
+        # Start every worker first so their start-up is not timed
+        before = list(pool.map(baseline, range(workers)))
+        start = time.perf_counter()
+        futures = []
+        for lo, hi in bounds:
+            payload = {'frame': df, 'shard': df.iloc[lo:hi], 'shared': handle}[mode]
+            futures.append(pool.submit(task, mode, payload, lo, hi))
+        results = [future.result() for future in futures]
+        seconds = time.perf_counter() - start
+    sent = max(len(pickle.dumps({'frame': df, 'shard': df.iloc[lo:hi], 'shared': handle}[mode]))
+               for lo, hi in bounds)
+    gained = None
+    if None not in before and None not in (kb for _, kb in results):
+        gained = max(kb for _, kb in results) - min(before)
+    return seconds, sent, gained
+
+
+def main(sizes, worker_counts):
+    print(f"{'rows':>10} {'workers':>7} {'mode':>7} {'time (s)':>9} {'pickled/task (MB)':>18} "
+          f"{'worker private (MB)':>20}")
+    for rows in sizes:
+        df = compact_frame(clean_data(synth.make_block(0, rows, seed=0)[0]))[SHARED_COLUMNS]
+        with publish(df) as shared:
+            print(f"{rows:>10,} published {shared.nbytes / 1e6:.1f} MB in {shared.handle.folder}")
+            for workers in worker_counts:
+                for mode in MODES:
+                    seconds, sent, gained = run(df, mode, workers, shared.handle)
+                    private = '-' if gained is None else f"{gained / 1024:.1f}"
+                    print(f"{rows:>10,} {workers:>7} {mode:>7} {seconds:>9.3f} "
+                          f"{sent / 1e6:>18.2f} {private:>20}")
+        print()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('rows', nargs='*', type=int, default=[1_000_000])
+    parser.add_argument('--workers', type=int, action='append', default=None)
+    args = parser.parse_args()
+    main(args.rows, args.workers or [2, 4])
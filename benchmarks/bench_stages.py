@@ -0,0 +1,150 @@
+"""
+Benchmark: every pipeline stage, timed separately, on synthetic exports
+
+For each dataset (generated by synth.py on first use and kept in
+benchmarks/data/) the in-memory pipeline runs stage by stage - read, clean,
+compact, aggregate, questions, report, charts, excel - and optionally the
+chunked streaming path. Each stage is measured with vrinda.profiling (wall
+time, CPU time, peak resident memory, output bytes), as in a --profile run.
+Results are printed and written as JSON so runs can be compared over time.
+
+Usage:
+    python benchmarks/bench_stages.py [100k 1m 10m ...] [--csv PATH ...]
+        [--seed N] [--no-charts] [--raw-data MODE] [--chunksize N] [--output PATH]
+"""
+
+import argparse
+import contextlib
+import gc
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+from datetime import datetime
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts'))
+
+import synth  # noqa: E402
+from vrinda.aggregates import build_aggregates  # noqa: E402
+from vrinda.cleaning import clean_data  # noqa: E402
+from vrinda.cli import CHART_FILES, answer_questions  # noqa: E402
+from vrinda.excel import RAW_DATA_MODES, ExcelReport  # noqa: E402
+from vrinda.loading import stream_aggregates  # noqa: E402
+from vrinda.profiling import RunProfile  # noqa: E402
+from vrinda.report import excel_tables, summary_report  # noqa: E402
+from vrinda.schema import compact_frame, read_csv_options  # noqa: E402
+from vrinda.stages import plan  # noqa: E402
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+
+
+def run_dataset(path, args):
+    """Run every stage over `path`; returns the stage records."""
+    profile = RunProfile()
+    quiet = contextlib.redirect_stdout(io.StringIO())
+
+    def stage(name, rows=None):
+        gc.collect()
+        return profile.stage(name, rows)
+
+    with stage('read') as read:
+        df = pd.read_csv(path, encoding='utf-8', **read_csv_options(path))
+        df.columns = df.columns.str.strip()
+        read.rows = rows = len(df)
+
+    with stage('clean', rows):
+        clean_data(df)
+    with stage('compact', rows):
+        compact_frame(df)
+    with stage('aggregate', rows):
+        agg = build_aggregates(df)
+
+    tables = {}
+    with stage('questions'), quiet:
+        answer_questions(agg, plan(), lambda name, **kw: tables.__setitem__(name, kw))
+    with stage('report'):
+        summary_report(agg)
+
+    with tempfile.TemporaryDirectory() as out:
+        if not args.no_charts:
+            from vrinda.charts import ChartRenderer
+
+            with stage('charts') as charts:
+                renderer = ChartRenderer(workers=1)
+                for name, kw in tables.items():
+                    charts.outputs.append(os.path.join(out, CHART_FILES[name]))
+                    renderer.submit(name, charts.outputs[-1], **kw)
+
+        with stage(f'excel ({args.raw_data})', rows) as excel:
+            report = ExcelReport(os.path.join(out, 'report.xlsx'), raw_data=args.raw_data)
+            report.append_raw(df)
+            summary, sheets = excel_tables(agg)
+            report.close(summary=summary, sheets=sheets)
+            excel.outputs.append(report.path)
+        # Output sizes are read while the temporary files still exist
+        records = profile.records()
+
+    del df, agg
+    if args.chunksize:
+        with stage(f'stream ({args.chunksize:,} rows/chunk)', rows), quiet:
+            stream_aggregates(path, args.chunksize)
+        records += profile.records()[len(records):]
+    return records
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time each pipeline stage on synthetic data")
+    parser.add_argument('sizes', nargs='*', help="100k, 1m, 10m or row counts (default: 100k 1m)")
+    parser.add_argument('--csv', action='append', default=[], help="Benchmark this CSV as well")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--no-charts', action='store_true')
+    parser.add_argument('--raw-data', choices=RAW_DATA_MODES, default='none',
+                        help="Raw-row destination for the excel stage (default: %(default)s)")
+    parser.add_argument('--chunksize', type=int, default=None,
+                        help="Also time the streaming path with this chunk size")
+    parser.add_argument('--output', help="JSON results path "
+                                         "(default: benchmarks/results/stages-<timestamp>.json)")
+    args = parser.parse_args()
+
+    datasets = [(size, None) for size in (args.sizes or ([] if args.csv else ['100k', '1m']))]
+    datasets += [(os.path.basename(path), path) for path in args.csv]
+
+    results = []
+    for label, path in datasets:
+        if path is None:
+            print(f"Preparing {label} rows (seed {args.seed})...")
+            path = synth.dataset(label, seed=args.seed)
+        stages = run_dataset(path, args)
+        results.append({'dataset': label, 'path': os.path.abspath(path),
+                        'csv_bytes': os.path.getsize(path),
+                        'rows': stages[0]['rows'], 'stages': stages,
+                        'total_wall_s': round(sum(s['wall_s'] for s in stages), 4)})
+
+        print(f"\n{label}: {stages[0]['rows']:,} rows")
+        print(f"  {'stage':34} {'wall (s)':>9} {'cpu (s)':>9} {'peak MB':>9} {'+MB':>7}")
+        for s in stages:
+            print(f"  {s['stage']:34} {s['wall_s']:>9.3f} {s['cpu_s']:>9.3f} "
+                  f"{s['peak_rss_mb']:>9.1f} {s.get('peak_delta_mb', float('nan')):>7.1f}")
+
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"stages-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump({
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+            'seed': args.seed,
+            'results': results,
+        }, f, indent=2)
+    print(f"\nResults written to {output}")
+
+
+if __name__ == '__main__':
+    main()
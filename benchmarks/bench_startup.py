@@ -0,0 +1,47 @@
+"""
+Benchmark: interpreter startup cost of the analysis entry points
+
+Runs each command in a fresh interpreter several times and prints the
+median wall time, so the cost of importing the package with and without
+the plotting libraries can be compared.
+
+Usage:
+    python benchmarks/bench_startup.py [runs]
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+SCRIPTS = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts')
+
+COMMANDS = [
+    ('python (baseline)', ['-c', 'pass']),
+    ('import vrinda.cli', ['-c', 'import vrinda.cli']),
+    ('vrinda_analysis.py --help', [os.path.join(SCRIPTS, 'vrinda_analysis.py'), '--help']),
+    ('import vrinda.cli + chart style',
+     ['-c', 'import vrinda.cli, vrinda.charts; vrinda.charts.apply_style()']),
+]
+
+
+def median_seconds(args, runs):
+    env = dict(os.environ, PYTHONPATH=SCRIPTS)
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable] + args, env=env, check=True,
+                       stdout=subprocess.DEVNULL)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def main(runs):
+    print(f"{'command':36} {'median (s)':>10}")
+    for label, args in COMMANDS:
+        print(f"{label:36} {median_seconds(args, runs):>10.3f}")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
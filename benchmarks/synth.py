@@ -0,0 +1,177 @@
+"""
+Seeded synthetic Vrinda Store exports
+
+Writes CSVs with the real export's 21 columns and its quirks:
+  * 'Channel ' header with a trailing space
+  * Gender as 'Men'/'Women' and the short 'M'/'W' codes
+  * Status, Channel and ship-state in mixed case, some padded with spaces
+  * %m/%d/%Y dates, plus a few day-first and empty ones
+  * missing Amount values and orders spanning several rows (shared Order ID)
+
+Rows are generated in fixed-size blocks, each from its own seeded RNG, so a
+given (rows, seed) always produces the same file byte for byte, and 10M
+rows never have to be held in memory at once.
+
+Usage:
+    python benchmarks/synth.py 100k|1m|10m|<rows> [--seed N] [--out PATH]
+"""
+
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+SIZES = {'100k': 100_000, '1m': 1_000_000, '10m': 10_000_000}
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+
+# Rows generated (and written) per block; part of the output's identity
+BLOCK_ROWS = 250_000
+
+COLUMNS = ['index', 'Order ID', 'Cust ID', 'Gender', 'Age', 'Age Group', 'Date', 'Month',
+           'Status', 'Channel ', 'SKU', 'Category', 'Size', 'Qty', 'currency', 'Amount',
+           'ship-city', 'ship-state', 'ship-postal-code', 'ship-country', 'B2B']
+
+GENDERS = (['Women', 'Men', 'W', 'M'], [0.58, 0.30, 0.08, 0.04])
+STATUSES = (['Delivered', 'Returned', 'Refunded', 'Cancelled',
+             'delivered', 'DELIVERED', 'Delivered ', 'cancelled '],
+            [0.84, 0.03, 0.02, 0.06, 0.02, 0.01, 0.01, 0.01])
+CHANNELS = (['Amazon', 'Myntra', 'Flipkart', 'Ajio', 'Nalli', 'Meesho', 'Others',
+             'amazon ', 'myntra', 'Flipkart '],
+            [0.33, 0.22, 0.20, 0.06, 0.04, 0.04, 0.03, 0.03, 0.03, 0.02])
+CATEGORIES = (['Set', 'kurta', 'Western Dress', 'Top', 'Ethnic Dress', 'Blouse', 'Bottom', 'Saree'],
+              [0.40, 0.35, 0.13, 0.08, 0.02, 0.01, 0.005, 0.005])
+SIZE_LABELS = ['XS', 'S', 'M', 'L', 'XL', 'XXL', '3XL', 'Free']
+
+# (state as exported, a city in it, postal prefix), variants included
+STATES = [
+    ('MAHARASHTRA', 'MUMBAI', 400), ('Maharashtra', 'PUNE', 411),
+    ('KARNATAKA', 'BENGALURU', 560), (' KARNATAKA', 'MYSURU', 570),
+    ('UTTAR PRADESH', 'LUCKNOW', 226), ('Uttar Pradesh ', 'NOIDA', 201),
+    ('TELANGANA', 'HYDERABAD', 500), ('TAMIL NADU', 'CHENNAI', 600),
+    ('Tamil Nadu', 'COIMBATORE', 641), ('DELHI', 'NEW DELHI', 110),
+    ('Delhi ', 'DELHI', 110), ('KERALA', 'KOCHI', 682), ('GUJARAT', 'AHMEDABAD', 380),
+    ('WEST BENGAL', 'KOLKATA', 700), ('ANDHRA PRADESH', 'VIJAYAWADA', 520),
+    ('HARYANA', 'GURUGRAM', 122), ('RAJASTHAN', 'JAIPUR', 302), ('BIHAR', 'PATNA', 800),
+    ('MADHYA PRADESH', 'BHOPAL', 462), ('PUNJAB', 'LUDHIANA', 141), ('ODISHA', 'BHUBANESWAR', 751),
+    ('ASSAM', 'GUWAHATI', 781), ('JHARKHAND', 'RANCHI', 834), ('Goa', 'PANAJI', 403),
+]
+STATE_WEIGHTS = np.array([14, 4, 10, 2, 9, 3, 9, 7, 2, 6, 1, 5, 5, 4, 5, 4, 3, 3, 3, 2, 2, 2, 2, 1],
+                         dtype=float)
+
+DAYS = pd.date_range('2022-01-01', '2022-12-31')
+
+
+def _pick(rng, choices, n):
+    values, weights = choices
+    weights = np.asarray(weights, dtype=float)
+    return np.asarray(values, dtype=object)[rng.choice(len(values), n, p=weights / weights.sum())]
+
+
+def _digits(values, width):
+    return pd.Series(values).astype(str).str.zfill(width).to_numpy(dtype=object)
+
+
+def make_block(block, rows, seed=0, first_row=0, first_order=0):
+    """
+    One block of `rows` raw rows. Returns (frame, orders used) so the next
+    block can continue the Order ID sequence.
+    """
+    rng = np.random.default_rng([seed, block])
+
+    # About a quarter of rows continue the previous order (multi-item orders)
+    new_order = rng.random(rows) >= 0.25
+    new_order[0] = True
+    order_no = first_order + np.cumsum(new_order) - 1
+    order_ids = ('171-' + _digits(order_no % 10_000_000, 7) + '-'
+                 + _digits((order_no * 7919) % 10_000_000, 7))
+
+    day = rng.integers(0, len(DAYS), rows)
+    dates = DAYS.strftime('%m/%d/%Y').to_numpy(dtype=object)[day]
+    quirk = rng.random(rows)
+    dates[quirk < 0.003] = DAYS.strftime('%d-%m-%Y').to_numpy(dtype=object)[day[quirk < 0.003]]
+    dates[(quirk >= 0.003) & (quirk < 0.005)] = ''
+
+    age = rng.integers(18, 79, rows)
+    age_group = np.where(age < 30, 'Teenager', np.where(age < 50, 'Adult', 'Senior')).astype(object)
+
+    state = rng.choice(len(STATES), rows, p=STATE_WEIGHTS / STATE_WEIGHTS.sum())
+    state_names, cities, postal = (np.asarray(col, dtype=object) for col in zip(*STATES))
+
+    qty = np.where(rng.random(rows) < 0.9, 1, rng.integers(2, 4, rows))
+    amount = np.round(np.exp(rng.normal(6.6, 0.45, rows)) * qty).astype(float)
+    amount[rng.random(rows) < 0.01] = np.nan
+
+    frame = pd.DataFrame({
+        'index': np.arange(first_row, first_row + rows),
+        'Order ID': order_ids,
+        'Cust ID': rng.integers(1_000_000, 9_999_999, rows),
+        'Gender': _pick(rng, GENDERS, rows),
+        'Age': age,
+        'Age Group': age_group,
+        'Date': dates,
+        'Month': DAYS.strftime('%b').to_numpy(dtype=object)[day],
+        'Status': _pick(rng, STATUSES, rows),
+        'Channel ': _pick(rng, CHANNELS, rows),
+        'SKU': 'SKU-' + _digits(rng.integers(0, 20_000, rows), 5),
+        'Category': _pick(rng, CATEGORIES, rows),
+        'Size': np.asarray(SIZE_LABELS, dtype=object)[rng.integers(0, len(SIZE_LABELS), rows)],
+        'Qty': qty,
+        'currency': 'INR',
+        'Amount': amount,
+        'ship-city': cities[state],
+        'ship-state': state_names[state],
+        'ship-postal-code': postal[state].astype(np.int64) * 1000 + rng.integers(0, 1000, rows),
+        'ship-country': 'IN',
+        'B2B': rng.random(rows) < 0.01,
+    }, columns=COLUMNS)
+    return frame, int(new_order.sum())
+
+
+def write_csv(path, rows, seed=0):
+    """Write `rows` synthetic rows to `path` (atomically) and return path."""
+    folder = os.path.dirname(os.path.abspath(path))
+    os.makedirs(folder, exist_ok=True)
+    tmp_path = path + '.tmp'
+    orders = 0
+    with open(tmp_path, 'w', encoding='utf-8', newline='') as f:
+        for block, start in enumerate(range(0, rows, BLOCK_ROWS)):
+            count = min(BLOCK_ROWS, rows - start)
+            frame, used = make_block(block, count, seed=seed, first_row=start, first_order=orders)
+            frame.to_csv(f, index=False, header=block == 0)
+            orders += used
+    os.replace(tmp_path, path)
+    return path
+
+
+def parse_rows(text):
+    """'100k', '1m', '10m' or a plain row count."""
+    return SIZES.get(text.lower()) or int(text.replace('_', '').replace(',', ''))
+
+
+def default_path(size, seed=0):
+    return os.path.join(DATA_DIR, f"vrinda_{size.lower()}_seed{seed}.csv")
+
+
+def dataset(size, seed=0):
+    """Path of the synthetic CSV for `size`, generated on first use."""
+    path = default_path(size, seed)
+    if not os.path.exists(path):
+        write_csv(path, parse_rows(size), seed=seed)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a synthetic Vrinda Store CSV")
+    parser.add_argument('size', help="100k, 1m, 10m or a row count")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--out', help="Output path (default: benchmarks/data/vrinda_<size>_seed<N>.csv)")
+    args = parser.parse_args()
+    path = args.out or default_path(args.size, args.seed)
+    write_csv(path, parse_rows(args.size), seed=args.seed)
+    print(f"{parse_rows(args.size):,} rows written to {path}")
+
+
+if __name__ == '__main__':
+    main()
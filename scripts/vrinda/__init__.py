@@ -0,0 +1,8 @@
+"""
+Vrinda Store analysis
+Load, clean and aggregate the store export, answer the eight client
+questions and write the report, charts and Excel workbook.
+
+Entry point: vrinda.cli.main() (scripts/vrinda_analysis.py, python -m vrinda).
+Importing the package runs nothing and does not load matplotlib.
+"""
@@ -0,0 +1,5 @@
+import sys
+
+from vrinda.cli import main
+
+sys.exit(main())
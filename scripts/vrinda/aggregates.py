@@ -0,0 +1,427 @@
+"""
+Aggregation layer for the Vrinda Store analysis
+
+Every number printed by Q1-Q8, the summary report and the Excel export is a
+roll-up of a few per-dimension tables (orders, sales, distinct orders).
+build_aggregates() computes all of them in one grouped scan of the cleaned
+data; the questions then slice the cached result instead of running their
+own groupby on the full frame.
+
+The cube has no day-level dimension; `daily` holds per-day measures, in
+total and per Channel, Category and State, for vrinda.timeseries.
+
+Distinct orders are exact by default: the cube keeps every Order ID hash.
+With a HyperLogLog `precision` (vrinda.hll) it keeps fixed-size sketches
+instead - order_ids becomes a HyperLogLog and distinct[dim] a
+HyperLogLogTable - so memory no longer grows with the number of orders and
+merges stay cheap, at about 1.04 / sqrt(2**precision) relative error. A
+backend that counts distinct orders in place (vrinda.backends) keeps only
+the exact counts, in DistinctCounts, which answer the same questions but
+cannot be merged or saved as a state.
+"""
+
+import numpy as np
+import pandas as pd
+
+from vrinda.hll import HyperLogLog, HyperLogLogTable, register_updates
+
+# Columns the cube is grouped on. Every question and Excel sheet reads one or
+# two of these.
+DIMENSIONS = ['Year', 'Month', 'Month_Name', 'Gender', 'Status',
+              'Channel', 'ship-state', 'Category', 'Age_Group']
+
+# Additive measures stored per cube cell
+MEASURES = ['rows', 'orders', 'sales_paise', 'amount_count']
+
+# Breakdowns of the daily series ('total' is every dated row)
+DAILY_KEYS = ['total', 'Channel', 'Category', 'ship-state']
+
+# Additive measures stored per day
+DAILY_MEASURES = ['rows', 'orders', 'sales_paise']
+
+# Nullable UInt64 column of hash_ids('Order ID') that a frame may carry
+# instead of the Order IDs (see vrinda.shared)
+ORDER_HASH = 'order_hash'
+
+
+def to_paise(amount):
+    """Amount as int64 paise (NaN -> 0) so partial sums merge exactly."""
+    values = pd.to_numeric(amount, errors='coerce').fillna(0).to_numpy(dtype='float64')
+    return np.rint(values * 100).astype(np.int64)
+
+
+def hash_ids(ids):
+    """Stable 64-bit hash per Order ID, used for distinct counting."""
+    # Most IDs are unique, so hashing each one beats hashing the factorized
+    # uniques (categorize=True); both give the same values
+    return pd.util.hash_pandas_object(ids, index=False, categorize=False).to_numpy()
+
+
+def order_hashes(df):
+    """(mask of the rows with an Order ID, their hashes) from 'Order ID' or ORDER_HASH."""
+    if ORDER_HASH in df.columns:
+        hashes = df[ORDER_HASH]
+        has_order = hashes.notna().to_numpy()
+        return has_order, hashes.to_numpy(dtype=np.uint64, na_value=0)[has_order]
+    order_id = df['Order ID']
+    has_order = order_id.notna().to_numpy()
+    return has_order, hash_ids(order_id)[has_order]
+
+
+def unique_hashes(hashes):
+    """Sorted distinct values of a uint64 array (np.unique, which hashes them first, is slower)."""
+    values = np.sort(hashes)
+    keep = np.ones(len(values), dtype=bool)
+    np.not_equal(values[1:], values[:-1], out=keep[1:])
+    return values[keep]
+
+
+def distinct_columns(dim):
+    """Key columns of distinct[dim] (its order hashes are keyed per Year and value)."""
+    return ['Year'] if dim == 'Year' else ['Year', dim]
+
+
+def daily_columns(key):
+    """Index columns of daily[key]."""
+    return ['Date'] if key == 'total' else ['Date', key]
+
+
+class DistinctCounts:
+    """
+    Exact distinct orders of one dimension without the Order IDs behind
+    them: `by_year` counts them per distinct_columns(dim) and `overall` per
+    value over every Year (an order can span two Years), both in an 'orders'
+    column. The counted counterpart of Aggregates.distinct[dim].
+    """
+
+    def __init__(self, by_year, overall):
+        self.by_year = by_year
+        self.overall = overall
+
+    def counts(self, column, year=None):
+        """Distinct orders per value of `column`, over every Year or one `year`."""
+        table = self.overall if year is None else self.by_year[self.by_year['Year'] == year]
+        counts = pd.Series(table['orders'].to_numpy(dtype=np.int64),
+                           index=table[column].to_numpy(dtype=object))
+        return counts[counts.index.notna()]
+
+
+class Aggregates:
+    """
+    Cached aggregates of the cleaned dataset.
+
+    base      - additive measures grouped by every column in DIMENSIONS
+    distinct  - per dimension, the unique (Year, value, order hash) triples
+                (a HyperLogLogTable over (Year, value) when approximate, a
+                DistinctCounts when counted)
+    order_ids - sorted unique Order ID hashes (total distinct orders), a
+                HyperLogLog when approximate, or their number when counted
+    daily     - per key of DAILY_KEYS, DAILY_MEASURES grouped by Date (and
+                that column); rows without a Date are left out
+    """
+
+    def __init__(self, base, distinct, order_ids, min_date, max_date, daily):
+        self.base = base
+        self.distinct = distinct
+        self.order_ids = order_ids
+        self.min_date = min_date
+        self.max_date = max_date
+        self.daily = daily
+
+    # ------------------------------------------------------------------
+    # Totals
+    # ------------------------------------------------------------------
+
+    @property
+    def total_rows(self):
+        return int(self.base['rows'].sum())
+
+    @property
+    def total_sales(self):
+        return self.base['sales_paise'].sum() / 100
+
+    @property
+    def mean_amount(self):
+        count = self.base['amount_count'].sum()
+        return self.total_sales / count if count else np.nan
+
+    @property
+    def approximate(self):
+        """True when distinct orders are HyperLogLog estimates."""
+        return isinstance(self.order_ids, HyperLogLog)
+
+    @property
+    def counted(self):
+        """True when only the exact distinct-order counts are kept (no merge or state)."""
+        return isinstance(self.order_ids, (int, np.integer))
+
+    @property
+    def precision(self):
+        """HyperLogLog precision, or None when distinct orders are exact."""
+        return self.order_ids.precision if self.approximate else None
+
+    @property
+    def total_orders(self):
+        """Distinct Order IDs (Excel 'Total Orders')."""
+        if self.approximate:
+            return self.order_ids.count()
+        if self.counted:
+            return int(self.order_ids)
+        return len(self.order_ids)
+
+    # ------------------------------------------------------------------
+    # Roll-ups
+    # ------------------------------------------------------------------
+
+    def table(self, dims, year=None, distinct=False):
+        """
+        Roll the cube up to `dims` (a column name or list of names).
+
+        Returns a frame indexed like df.groupby(dims) with columns
+        rows, orders (non-null Order IDs), sales and amount_count.
+        Rows with a missing key are dropped, as groupby does. Pass `year`
+        to restrict to one Year and `distinct=True` to add distinct_orders
+        (single dimension only).
+        """
+        dims = [dims] if isinstance(dims, str) else list(dims)
+        base = self.base
+        if year is not None:
+            base = base[base.index.get_level_values('Year') == year]
+
+        grouped = base.groupby(level=dims, observed=True).sum()
+        table = pd.DataFrame({
+            'rows': grouped['rows'],
+            'orders': grouped['orders'],
+            'sales': grouped['sales_paise'] / 100,
+            'amount_count': grouped['amount_count'],
+        })
+
+        if distinct:
+            if len(dims) != 1:
+                raise ValueError("distinct_orders is only tracked per single dimension")
+            if self.approximate or self.counted:
+                counts = self.distinct[dims[0]].counts(dims[0], year=year)
+            else:
+                pairs = self.distinct[dims[0]]
+                if year is not None:
+                    pairs = pairs[pairs['Year'] == year]
+                counts = pairs.groupby(dims[0], observed=True)['oid'].nunique()
+            table['distinct_orders'] = counts.reindex(table.index, fill_value=0)
+
+        return table
+
+    def count(self, dim, value, year=None):
+        """Number of rows where `dim` equals `value`."""
+        table = self.table(dim, year=year)
+        return int(table['rows'].get(value, 0))
+
+    def merge(self, other):
+        """Combine with the aggregates of a disjoint set of rows."""
+        return merge_aggregates([self, other])
+
+
+def sketch_orders(agg, precision):
+    """`agg` with its exact distinct orders replaced by HyperLogLog sketches."""
+    if agg.counted:
+        raise ValueError("counted distinct orders have no Order IDs to sketch")
+    if agg.approximate:
+        if agg.precision != precision:
+            raise ValueError(f"aggregates already use HyperLogLog precision {agg.precision}")
+        return agg
+    return Aggregates(
+        base=agg.base,
+        distinct={dim: HyperLogLogTable.from_hashes(pairs[distinct_columns(dim)],
+                                                    pairs['oid'].to_numpy(), precision)
+                  for dim, pairs in agg.distinct.items()},
+        order_ids=HyperLogLog(precision).add(agg.order_ids),
+        min_date=agg.min_date,
+        max_date=agg.max_date,
+        daily=agg.daily,
+    )
+
+
+def _daily(work):
+    """Per-day DAILY_MEASURES of `work` (which has a Date column) for every key of DAILY_KEYS."""
+    # groupby leaves out the rows with no Date (or no label)
+    return {key: work.groupby(daily_columns(key), observed=True, sort=False)[DAILY_MEASURES].sum()
+            for key in DAILY_KEYS}
+
+
+def build_aggregates(df, precision=None):
+    """
+    Compute the full cube over a cleaned frame in a single grouped scan.
+    With a HyperLogLog `precision` distinct orders are sketched, not exact.
+    """
+    has_order, oid = order_hashes(df)
+
+    work = df[DIMENSIONS].assign(
+        Date=df['Date'],
+        rows=np.int64(1),
+        orders=has_order.astype(np.int64),
+        sales_paise=to_paise(df['Amount']),
+        amount_count=df['Amount'].notna().to_numpy().astype(np.int64),
+    )
+    base = work.groupby(DIMENSIONS, dropna=False, observed=True, sort=False)[MEASURES].sum()
+    daily = _daily(work)
+
+    if precision is not None:
+        keyed = df.loc[has_order, DIMENSIONS]
+        updates = register_updates(oid, precision)
+        return Aggregates(
+            base=base,
+            distinct={dim: HyperLogLogTable.from_hashes(keyed[distinct_columns(dim)], oid,
+                                                        precision, updates)
+                      for dim in DIMENSIONS},
+            order_ids=HyperLogLog(precision).add(oid, updates),
+            min_date=df['Date'].min(),
+            max_date=df['Date'].max(),
+            daily=daily,
+        )
+
+    keyed = df.loc[has_order, DIMENSIONS].assign(oid=oid)
+    distinct = {}
+    for dim in DIMENSIONS:
+        distinct[dim] = keyed[distinct_columns(dim) + ['oid']].drop_duplicates().reset_index(drop=True)
+
+    return Aggregates(
+        base=base,
+        distinct=distinct,
+        order_ids=unique_hashes(oid),
+        min_date=df['Date'].min(),
+        max_date=df['Date'].max(),
+        daily=daily,
+    )
+
+
+def _merge_base(bases):
+    combined = pd.concat(bases)
+    return combined.groupby(level=DIMENSIONS, dropna=False, observed=True, sort=False).sum()
+
+
+def _merge_daily(dailies):
+    return {key: pd.concat([daily[key] for daily in dailies])
+            .groupby(level=daily_columns(key), observed=True, sort=False).sum()
+            for key in DAILY_KEYS}
+
+
+def _merge_distinct(frames, disjoint_orders=False):
+    if isinstance(frames[0], HyperLogLogTable):
+        return HyperLogLogTable.merge_all(frames)
+    combined = pd.concat(frames, ignore_index=True)
+    if disjoint_orders:
+        return combined
+    return combined.drop_duplicates(ignore_index=True)
+
+
+def _merge_order_ids(parts):
+    if parts[0].approximate:
+        merged = parts[0].order_ids
+        for part in parts[1:]:
+            merged = merged.merge(part.order_ids)
+        return merged
+    return unique_hashes(np.concatenate([p.order_ids for p in parts]))
+
+
+def _same_kind(parts):
+    """Exact parts sketched when any part is approximate (sketches cannot be made exact)."""
+    precisions = {p.precision for p in parts} - {None}
+    if len(precisions) > 1:
+        raise ValueError(f"cannot merge HyperLogLog precisions {sorted(precisions)}")
+    if not precisions:
+        return parts
+    precision = precisions.pop()
+    return [sketch_orders(p, precision) for p in parts]
+
+
+def merge_aggregates(parts, disjoint_orders=False):
+    """
+    Merge Aggregates built over disjoint row sets into one. Pass
+    `disjoint_orders` when no Order ID has rows in two parts, so the
+    distinct-order pairs need no de-duplication.
+    """
+    parts = list(parts)
+    if any(p.counted for p in parts):
+        raise ValueError("counted distinct orders cannot be merged; build the aggregates "
+                         "with their Order IDs")
+    parts = _same_kind(parts)
+    if len(parts) == 1:
+        return parts[0]
+    return Aggregates(
+        base=_merge_base([p.base for p in parts]),
+        distinct={dim: _merge_distinct([p.distinct[dim] for p in parts], disjoint_orders)
+                  for dim in DIMENSIONS},
+        order_ids=_merge_order_ids(parts),
+        min_date=pd.Series([p.min_date for p in parts]).min(),
+        max_date=pd.Series([p.max_date for p in parts]).max(),
+        daily=_merge_daily([p.daily for p in parts]),
+    )
+
+
+class AggregateAccumulator:
+    """
+    Fold chunk aggregates into running totals with bounded work per chunk.
+
+    The additive cube and daily series are merged on every add(), so they
+    never hold more than one cell per distinct key combination. Distinct-order
+    pairs are only compacted once the pending chunks outgrow the compacted
+    set, which keeps the total merge cost linear in the number of rows.
+
+    Only the cube and daily series have bounded memory. With exact distinct
+    counts the accumulator keeps every distinct (key, Order ID) pair and
+    every Order ID, and the pending chunks can hold as many again, so its
+    memory grows with the number of orders. With HyperLogLog sketches
+    (build_aggregates(..., precision)) it stays constant.
+    """
+
+    def __init__(self):
+        self._merged = None
+        self._pending = []
+        self._pending_size = 0
+        self.chunks = 0
+
+    def add(self, part):
+        self.chunks += 1
+        if self._merged is None:
+            self._merged = part
+            return
+        merged = self._merged
+        self._merged = Aggregates(
+            base=_merge_base([merged.base, part.base]),
+            distinct=merged.distinct,
+            order_ids=merged.order_ids,
+            min_date=pd.Series([merged.min_date, part.min_date]).min(),
+            max_date=pd.Series([merged.max_date, part.max_date]).max(),
+            daily=_merge_daily([merged.daily, part.daily]),
+        )
+        self._pending.append(part)
+        if merged.approximate:
+            # Sketches merge in constant time, so they are folded in at once
+            self._compact()
+            return
+        self._pending_size += len(part.order_ids)
+        if self._pending_size >= len(merged.order_ids):
+            self._compact()
+
+    def _compact(self):
+        if not self._pending:
+            return
+        merged = self._merged
+        sources = [merged] + self._pending
+        self._merged = Aggregates(
+            base=merged.base,
+            distinct={dim: _merge_distinct([p.distinct[dim] for p in sources])
+                      for dim in DIMENSIONS},
+            order_ids=_merge_order_ids(sources),
+            min_date=merged.min_date,
+            max_date=merged.max_date,
+            daily=merged.daily,
+        )
+        self._pending = []
+        self._pending_size = 0
+
+    def result(self):
+        """The merged Aggregates of every chunk added so far."""
+        if self._merged is None:
+            raise ValueError("no chunks were added")
+        self._compact()
+        return self._merged
@@ -0,0 +1,349 @@
+"""
+Query backends that build the Aggregates cube
+
+Q1-Q8, the summary report and the Excel summary sheets are all roll-ups of
+one Aggregates cube (vrinda.aggregates), so a backend only has to build
+that cube; everything downstream is shared. Two backends exist:
+
+  pandas  the default: read the CSV (or the cleaned cache), clean it and
+          build_aggregates() in memory
+  duckdb  an embedded, in-process DuckDB database scans the CSV - or the
+          cleaned Parquet cache when it is current - and computes the cube
+          in SQL, spilling to a temporary directory instead of holding the
+          rows in memory
+
+DuckDB does not re-implement STEP 2. The distinct raw values of each
+cleaned column (a few hundred strings) are fetched in one scan, run through
+the rules in vrinda.cleaning and joined back as lookup tables. Order IDs
+are hashed inside the scan by a vectorized UDF over the pandas path's
+hash_ids(), and distinct orders are counted in SQL: COUNT(DISTINCT) per
+(Year, value), or HyperLogLog registers as MAX(rank) per register. Only the
+cube cells come back to Python, so both backends give identical tables.
+Only a cube that will be merged or saved as a state (`mergeable`) still
+fetches every distinct (Year, value, Order ID) triple, as the exact state
+holds them all; its state_digest() equals the pandas path's.
+
+DuckDB is optional (pip install duckdb); duckdb_available() says whether it
+can be used.
+"""
+
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from vrinda.aggregates import (DAILY_KEYS, DAILY_MEASURES, DIMENSIONS, MEASURES, Aggregates,
+                               DistinctCounts, daily_columns, distinct_columns, hash_ids,
+                               unique_hashes)
+from vrinda.cleaning import LABEL_RULES, age_groups, month_names, parse_dates
+from vrinda.hll import HyperLogLog, HyperLogLogTable, register_updates
+from vrinda.periods import ONE_DAY
+from vrinda.state import canonical
+
+BACKENDS = ('pandas', 'duckdb')
+
+# pandas.read_csv's default missing-value strings; DuckDB gets the same list
+# so both backends agree on which cells are missing
+NA_STRINGS = ['', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan',
+              '1.#IND', '1.#QNAN', '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None',
+              'n/a', 'nan', 'null']
+
+# Where DuckDB spills intermediate results that do not fit in memory
+SPILL_DIR = os.path.join(tempfile.gettempdir(), 'vrinda_duckdb')
+
+
+def duckdb_available():
+    try:
+        import duckdb  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _ident(name):
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def _literal(text):
+    return "'" + str(text).replace("'", "''") + "'"
+
+
+def _grouping_id(columns, grouped):
+    """GROUPING(columns...) of a grouping set: one bit per column left out of it."""
+    return sum(1 << (len(columns) - 1 - i)
+               for i, col in enumerate(columns) if col not in grouped)
+
+
+def _distinct_values(con, exprs):
+    """
+    {name: distinct values of the SQL expression} for every entry of
+    `exprs`, from a single scan of `src` (missing values are left out).
+    """
+    names = list(exprs)
+    columns = ', '.join(f"{expr} AS {_ident(name)}" for name, expr in exprs.items())
+    idents = ', '.join(_ident(name) for name in names)
+    sets = ', '.join(f"({_ident(name)})" for name in names)
+    result = con.execute(
+        f"SELECT {idents}, GROUPING({idents}) AS grouping_id "
+        f"FROM (SELECT {columns} FROM src) GROUP BY GROUPING SETS ({sets})").df()
+    return {name: result.loc[(result['grouping_id'] == _grouping_id(names, [name]))
+                             & result[name].notna(), name].reset_index(drop=True)
+            for name in names}
+
+
+def _objects(values):
+    """Object array with None for missing values (how DuckDB reads a NULL string)."""
+    values = pd.Series(values, dtype=object)
+    return values.where(values.notna(), None)
+
+
+def _register_lookups(con, raw):
+    """
+    Clean the distinct raw values with the STEP 2 rules and register them
+    as lookup tables. Returns the parsed dates.
+    """
+    dates = pd.Series(raw['Date'], dtype=object)
+    parsed = parse_dates(dates)
+    month = parsed.dt.month
+    con.register('lookup_date', pd.DataFrame({
+        'raw': dates,
+        'Date': parsed,
+        'Year': parsed.dt.year.astype(np.float64),
+        'Month': month.astype(np.float64),
+        'Month_Name': _objects(month_names(month)),
+    }))
+
+    for col, rule in LABEL_RULES.items():
+        values = pd.Series(raw[col], dtype=object)
+        con.register(f'lookup_{col}', pd.DataFrame({'raw': values, 'value': _objects(rule(values))}))
+
+    ages = pd.Series(raw['Age'], dtype=np.float64)
+    con.register('lookup_age', pd.DataFrame({'raw': ages, 'value': _objects(age_groups(ages))}))
+    return parsed
+
+
+def _register_functions(con, precision=None):
+    """
+    Vectorized UDFs over the pandas path's hashing: vrinda_oid(Order ID) is
+    hash_ids() (NULL for a missing ID) and vrinda_rank(hash) the HyperLogLog
+    rank register_updates() gives it at `precision`.
+    """
+    import pyarrow as pa
+
+    def oid(ids):
+        ids = pd.Series(ids.to_numpy(), dtype=object)
+        return pa.array(hash_ids(ids), type=pa.uint64(), mask=ids.isna().to_numpy())
+
+    con.create_function('vrinda_oid', oid, [con.sqltype('VARCHAR')], con.sqltype('UBIGINT'),
+                        type='arrow', null_handling='special')
+    if precision is None:
+        return
+
+    def rank(hashes):
+        return pa.array(register_updates(hashes.to_numpy(), precision)[1], type=pa.uint8())
+
+    con.create_function('vrinda_rank', rank, [con.sqltype('UBIGINT')], con.sqltype('UTINYINT'),
+                        type='arrow')
+
+
+def _raw_columns(con):
+    """Stripped column name of `src` -> its name as read (the export has 'Channel ')."""
+    raw_columns = [row[0] for row in con.execute('DESCRIBE src').fetchall()]
+    return {str(col).strip(): col for col in raw_columns}
+
+
+def _file_list(paths):
+    return '[' + ', '.join(_literal(path) for path in paths) + ']'
+
+
+def _csv_source(con, paths):
+    """
+    View `src` over the CSVs plus the cleaned column expressions.
+    Returns (select list, joins, the distinct dates present).
+    """
+    con.execute(f"CREATE VIEW src AS SELECT * FROM read_csv({_file_list(paths)}, header = true, "
+                f"all_varchar = true, union_by_name = true, encoding = 'utf-8', "
+                f"nullstr = [{', '.join(_literal(s) for s in NA_STRINGS)}])")
+    col = {name: 'src.' + _ident(raw) for name, raw in _raw_columns(con).items()}
+    age = f"TRY_CAST({col['Age']} AS DOUBLE)"
+
+    raw = _distinct_values(con, {**{name: col[name] for name in LABEL_RULES},
+                                 'Date': col['Date'], 'Age': age})
+    parsed = _register_lookups(con, raw)
+
+    select = {
+        'Date': 'd.Date',
+        'Year': 'd.Year', 'Month': 'd.Month', 'Month_Name': 'd.Month_Name',
+        **{name: f"{_ident('lookup_' + name)}.value" for name in LABEL_RULES},
+        'Category': col['Category'],
+        'Age_Group': 'a.value',
+        'amount': f"TRY_CAST({col['Amount']} AS DOUBLE)",
+        'oid': f"vrinda_oid({col['Order ID']})",
+    }
+    joins = [f"LEFT JOIN lookup_date d ON {col['Date']} = d.raw",
+             f"LEFT JOIN lookup_age a ON {age} = a.raw"]
+    joins += [f"LEFT JOIN {_ident('lookup_' + name)} ON {col[name]} = {_ident('lookup_' + name)}.raw"
+              for name in LABEL_RULES]
+    return select, joins, parsed
+
+
+def _parquet_source(con, paths):
+    """Like _csv_source() for cleaned Parquet caches, which need no lookups."""
+    con.execute(f"CREATE VIEW src AS SELECT * FROM read_parquet({_file_list(paths)}, "
+                f"union_by_name = true)")
+    raw = _distinct_values(con, {'Date': 'src."Date"'})
+
+    select = {name: 'src.' + _ident(name) for name in ['Date'] + DIMENSIONS}
+    select.update({'amount': 'CAST(src."Amount" AS DOUBLE)',
+                   'oid': 'vrinda_oid(CAST(src."Order ID" AS VARCHAR))'})
+    return select, [], pd.to_datetime(raw['Date'])
+
+
+
+
+def _grouped(con, select, keys, sets, source='cleaned'):
+    """
+    SELECT `select` per grouping set of `sets` (lists of `keys`) over
+    `source` (the cleaned rows), with GROUPING(keys) as grouping_id, as a
+    DataFrame.
+    """
+    idents = ', '.join(_ident(col) for col in keys)
+    groups = ', '.join('(' + ', '.join(_ident(col) for col in cols) + ')' for cols in sets)
+    return con.execute(f"""
+        SELECT {idents}, {select}, GROUPING({idents}) AS grouping_id
+        FROM {source}
+        GROUP BY GROUPING SETS ({groups})
+    """).to_arrow_table().to_pandas(strings_to_categorical=True)
+
+
+def _rows(result, keys, cols):
+    """The rows of a _grouped() result that belong to the grouping set `cols`."""
+    return result[result['grouping_id'].to_numpy() == _grouping_id(keys, cols)]
+
+
+def _additive(con):
+    """(base, daily): the additive measures per cube cell and per daily series."""
+    keys = DIMENSIONS + ['Date']
+    result = _grouped(con, """
+        COUNT(*) AS "rows",
+        COUNT(oid) AS orders,
+        CAST(SUM(COALESCE(CAST(round_even(amount * 100, 0) AS BIGINT), 0)) AS BIGINT)
+            AS sales_paise,
+        COUNT(amount) AS amount_count""",
+                      keys, [DIMENSIONS] + [daily_columns(key) for key in DAILY_KEYS])
+    base = _rows(result, keys, DIMENSIONS)[DIMENSIONS + MEASURES].set_index(DIMENSIONS)
+    daily = {}
+    for key in DAILY_KEYS:
+        cols = daily_columns(key)
+        rows = _rows(result, keys, cols)
+        # Rows without a Date (or a label) are left out, as groupby does
+        rows = rows[rows[cols].notna().all(axis=1).to_numpy()]
+        daily[key] = rows[cols + DAILY_MEASURES].set_index(cols)
+    return base, daily
+
+
+def _distinct_counts(con):
+    """(distinct, order_ids) as exact COUNT(DISTINCT) per (Year, value), per value and in total."""
+    sets = ([distinct_columns(dim) for dim in DIMENSIONS]
+            + [[dim] for dim in DIMENSIONS if dim != 'Year'] + [[]])
+    result = _grouped(con, 'COUNT(DISTINCT oid) AS orders', DIMENSIONS, sets)
+    distinct = {}
+    for dim in DIMENSIONS:
+        cols = distinct_columns(dim)
+        by_year = _rows(result, DIMENSIONS, cols)[cols + ['orders']].reset_index(drop=True)
+        values = by_year if dim == 'Year' else \
+            _rows(result, DIMENSIONS, [dim])[[dim, 'orders']].reset_index(drop=True)
+        distinct[dim] = DistinctCounts(by_year, values)
+    return distinct, int(_rows(result, DIMENSIONS, [])['orders'].sum())
+
+
+def _order_pairs(con):
+    """(distinct, order_ids) as the (Year, value, Order ID hash) triples build_aggregates keeps."""
+    keys = DIMENSIONS + ['oid']
+    sets = [distinct_columns(dim) + ['oid'] for dim in DIMENSIONS]
+    result = _grouped(con, 'COUNT(*) AS "rows"', keys, sets,
+                      source='(SELECT * FROM cleaned WHERE oid IS NOT NULL)')
+    distinct = {dim: _rows(result, keys, cols)[cols].reset_index(drop=True)
+                for dim, cols in zip(DIMENSIONS, sets)}
+    # Every keyed row has a (Year, order) pair, undated rows included
+    return distinct, unique_hashes(distinct['Year']['oid'].to_numpy())
+
+
+def _order_sketches(con, precision):
+    """(distinct, order_ids) as HyperLogLog registers, each the MAX(rank) of its hashes."""
+    keys = DIMENSIONS + ['register']
+    sets = [distinct_columns(dim) + ['register'] for dim in DIMENSIONS] + [['register']]
+    result = _grouped(con, 'MAX("rank") AS "rank"', keys, sets, source=f"""
+        (SELECT *, oid >> {64 - precision} AS register, vrinda_rank(oid) AS "rank"
+         FROM cleaned WHERE oid IS NOT NULL)""")
+    distinct = {}
+    for dim, cols in zip(DIMENSIONS, sets):
+        rows = _rows(result, keys, cols)
+        distinct[dim] = HyperLogLogTable.from_updates(
+            rows[distinct_columns(dim)], rows['register'].to_numpy(dtype=np.intp),
+            rows['rank'].to_numpy(dtype=np.uint8), precision)
+    rows = _rows(result, keys, ['register'])
+    order_ids = HyperLogLog(precision)
+    order_ids.registers[rows['register'].to_numpy(dtype=np.intp)] = rows['rank'].to_numpy()
+    return distinct, order_ids
+
+
+def duckdb_aggregates(paths, parquet_paths=None, period=None, threads=None, precision=None,
+                      mergeable=False):
+    """
+    The Aggregates cube of the CSV file(s) at `paths` (a path or a list),
+    computed by DuckDB.
+
+    With `parquet_paths` (current cleaned caches of those CSVs, see
+    cache.cached_path) the caches are scanned instead. With `period` (a
+    periods.Period) only rows dated inside it are aggregated. The cube has
+    canonical dtypes (state.canonical). Distinct orders are HyperLogLog
+    sketches with a `precision`; otherwise they are exact counts
+    (Aggregates.counted), or with `mergeable` the Order ID hashes
+    build_aggregates keeps, so the cube can be merged and saved as a state.
+    """
+    import duckdb
+
+    paths = [paths] if isinstance(paths, str) else list(paths)
+    os.makedirs(SPILL_DIR, exist_ok=True)
+    config = {'temp_directory': SPILL_DIR, 'preserve_insertion_order': False}
+    if threads:
+        config['threads'] = threads
+    con = duckdb.connect(config=config)
+    try:
+        _register_functions(con, precision)
+        if parquet_paths is None:
+            select, joins, dates = _csv_source(con, paths)
+        else:
+            select, joins, dates = _parquet_source(con, parquet_paths)
+        where = ''
+        if period is not None:
+            dates = dates[period.mask(dates)]
+            where = (f"WHERE \"Date\" >= TIMESTAMP '{period.start:%Y-%m-%d}' "
+                     f"AND \"Date\" < TIMESTAMP '{period.end + ONE_DAY:%Y-%m-%d}'")
+        for dim in ('Year', 'Month'):
+            select[dim] = f"CAST({select[dim]} AS DOUBLE)"
+
+        # Each query below scans this view, so no cleaned row is held in Python
+        columns = ', '.join(f"{expr} AS {_ident(name)}" for name, expr in select.items())
+        con.execute(f"CREATE VIEW cleaned AS SELECT * FROM "
+                    f"(SELECT {columns} FROM src {' '.join(joins)}) {where}")
+        base, daily = _additive(con)
+        if precision is not None:
+            distinct, order_ids = _order_sketches(con, precision)
+        elif mergeable:
+            distinct, order_ids = _order_pairs(con)
+        else:
+            distinct, order_ids = _distinct_counts(con)
+    finally:
+        con.close()
+
+    return canonical(Aggregates(
+        base=base,
+        distinct=distinct,
+        order_ids=order_ids,
+        min_date=dates.min(),
+        max_date=dates.max(),
+        daily=daily,
+    ), sort=False)
@@ -0,0 +1,164 @@
+"""
+Batch mode: many store extracts in one warm process pool
+
+Running the analysis once per store or region extract pays for interpreter
+start-up, the pandas/matplotlib/seaborn imports and the plot style set-up
+on every run. A batch runs the same analysis for every job of a manifest on
+a pool of worker processes that import and style once (warm_up), then take
+jobs one after another. Each job writes its usual outputs, plus its console
+log as run.log, into its own folder. The parent folds the jobs' aggregates
+into one cross-store comparison workbook.
+
+The manifest is a CSV with a header row:
+
+    name,data,output
+    north,extracts/north.csv,reports/north
+    south,extracts/south/,reports/south
+
+`data` takes anything --data does. `name` defaults to the output folder's
+name. Relative paths are relative to the manifest. Lines starting with #
+are skipped.
+"""
+
+import csv
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+from vrinda.excel import ExcelReport
+from vrinda.report import excel_tables
+from vrinda.timeseries import TimeSeriesIndex
+
+WORKBOOK_NAME = 'batch_comparison.xlsx'
+
+# Per-store sales compared side by side, one sheet each: (sheet, dimension)
+COMPARED = [('Channel_Sales', 'Channel'), ('Category_Sales', 'Category'),
+            ('State_Sales', 'ship-state'), ('Gender_Sales', 'Gender')]
+
+
+class BatchJob:
+    """One manifest row: a store `name`, its `data` source and its `output` folder."""
+
+    def __init__(self, name, data, output):
+        self.name = name
+        self.data = data
+        self.output = output
+
+    def __repr__(self):
+        return f"BatchJob({self.name}: {self.data} -> {self.output})"
+
+
+def read_manifest(path):
+    """The BatchJobs of manifest `path`; ValueError for a malformed manifest."""
+    base = os.path.dirname(os.path.abspath(path))
+    with open(path, newline='', encoding='utf-8') as f:
+        lines = [line for line in f if line.strip() and not line.lstrip().startswith('#')]
+    rows = list(csv.DictReader(lines, skipinitialspace=True))
+    if not rows or not {'data', 'output'} <= set(rows[0]):
+        raise ValueError(f"{path}: needs a header row with 'data' and 'output' columns")
+
+    jobs = []
+    for number, row in enumerate(rows, 1):
+        data, output = (row.get('data') or '').strip(), (row.get('output') or '').strip()
+        if not data or not output:
+            raise ValueError(f"{path}: job {number} has no data or output")
+        output = os.path.normpath(os.path.join(base, os.path.expanduser(output)))
+        name = (row.get('name') or '').strip() or os.path.basename(output)
+        jobs.append(BatchJob(name, os.path.join(base, os.path.expanduser(data)), output))
+
+    for attribute in ('name', 'output'):
+        seen = [getattr(job, attribute) for job in jobs]
+        repeated = sorted({value for value in seen if seen.count(value) > 1})
+        if repeated:
+            raise ValueError(f"{path}: {attribute} used by more than one job: {', '.join(repeated)}")
+    return jobs
+
+
+def warm_up(charts=True):
+    """Pool initializer: pay for the heavy imports and the plot style once per worker."""
+    import openpyxl  # noqa: F401
+
+    if charts:
+        from vrinda.charts import apply_style
+        apply_style()
+
+
+def store_tables(agg):
+    """The small per-store tables the comparison workbook is built from."""
+    summary, _ = excel_tables(agg)
+    monthly = TimeSeriesIndex(agg.daily).resample('M')['sales']
+    return {
+        'metrics': dict(zip(summary['Metric'], summary['Value'])),
+        'rows': agg.total_rows,
+        'period': (agg.min_date, agg.max_date),
+        'Monthly_Sales': monthly.set_axis(monthly.index.astype(str)).rename_axis('Month'),
+        **{sheet: agg.table(dim)['sales'] for sheet, dim in COMPARED},
+    }
+
+
+def comparison_sheets(results):
+    """
+    (Summary frame, [(sheet, frame), ...]) comparing the jobs; `results`
+    maps job name to its run_batch() result.
+    """
+    summary = []
+    for name, result in results.items():
+        row = {'Store': name, 'Data': result['data'], 'Status': result['status'],
+               'Seconds': result['seconds']}
+        tables = result['tables']
+        if tables is not None:
+            start, end = tables['period']
+            row.update({'Rows': tables['rows'],
+                        'From': start.strftime('%Y-%m-%d'), 'To': end.strftime('%Y-%m-%d'),
+                        **tables['metrics']})
+        summary.append(row)
+
+    done = {name: result['tables'] for name, result in results.items()
+            if result['tables'] is not None}
+    sheets = []
+    if done:
+        for sheet, dim in [('Monthly_Sales', 'Month')] + COMPARED:
+            # Labels as plain strings, so stores with different categories line up
+            frame = pd.DataFrame({name: tables[sheet].set_axis(tables[sheet].index.astype(str))
+                                  for name, tables in done.items()}).sort_index()
+            frame['Total'] = frame.sum(axis=1)
+            sheets.append((sheet, frame.rename_axis(dim).reset_index()))
+    return pd.DataFrame(summary), sheets
+
+
+def write_comparison(path, results):
+    """Write the cross-store workbook to `path`; returns path."""
+    summary, sheets = comparison_sheets(results)
+    report = ExcelReport(path, raw_data='none')
+    report.close(summary=summary, sheets=sheets)
+    return path
+
+
+def _timed(run_job, job):
+    start = time.perf_counter()
+    tables = run_job(job)
+    return tables, round(time.perf_counter() - start, 2)
+
+
+def run_batch(jobs, run_job, workers, charts=True):
+    """
+    Run `run_job(job)` for every BatchJob on `workers` warm processes and
+    yield (job, result) as each finishes. `run_job` (a picklable module-level
+    function) returns store_tables() of the job's aggregates, or raises.
+    """
+    with ProcessPoolExecutor(max_workers=max(1, min(workers, len(jobs))),
+                             initializer=warm_up, initargs=(charts,)) as pool:
+        futures = {pool.submit(_timed, run_job, job): job for job in jobs}
+        for future in as_completed(futures):
+            job = futures[future]
+            result = {'data': job.data}
+            try:
+                tables, seconds = future.result()
+                result.update(status='ok', tables=tables, seconds=seconds)
+            except Exception as e:
+                # The first line is enough for the summary; the job's run.log has the rest
+                reason = str(e).strip().splitlines()[0] if str(e).strip() else type(e).__name__
+                result.update(status=f'failed: {reason}', tables=None, seconds=None)
+            yield job, result
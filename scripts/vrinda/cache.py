@@ -0,0 +1,145 @@
+"""
+Persistent columnar cache of the cleaned dataset
+
+The cleaned frame is written as Parquet next to the source CSV
+(data/.vrinda_cache/<name>.<schema>.parquet) with a JSON sidecar holding
+the cache key: the CSV's size, mtime and SHA-256, CLEANING_VERSION and the
+schema variant the frame was loaded with. Each schema variant has its own
+files, so runs with and without --all-columns do not evict each other. A
+later run whose key matches loads the Parquet file and skips CSV parsing
+and all of STEP 2.
+
+Parquet support comes from pyarrow; without it the cache is disabled and
+every run falls back to parsing the CSV.
+"""
+
+import hashlib
+import json
+import os
+import re
+
+import pandas as pd
+
+from vrinda.cleaning import CLEANING_VERSION
+from vrinda.writer import atomic_path, atomic_write
+
+CACHE_DIRNAME = '.vrinda_cache'
+
+
+def parquet_available():
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _cache_folder(source_path):
+    return os.path.join(os.path.dirname(os.path.abspath(source_path)), CACHE_DIRNAME)
+
+
+def _schema_tag(schema):
+    """`schema` as a file name part (no dots or path separators)."""
+    return re.sub(r'[^A-Za-z0-9_+-]', '_', schema)
+
+
+def cache_paths(source_path, schema='compact'):
+    """(parquet path, key sidecar path) for a source CSV loaded with schema variant `schema`."""
+    folder = _cache_folder(source_path)
+    stem = f"{os.path.splitext(os.path.basename(source_path))[0]}.{_schema_tag(schema)}"
+    return (os.path.join(folder, f"{stem}.parquet"),
+            os.path.join(folder, f"{stem}.json"))
+
+
+def file_digest(path, block_size=1 << 20):
+    """SHA-256 of a file, read in 1 MB blocks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _stat_key(source_path, schema):
+    st = os.stat(source_path)
+    return {
+        'size': st.st_size,
+        'mtime_ns': st.st_mtime_ns,
+        'cleaning_version': CLEANING_VERSION,
+        'schema': schema,
+    }
+
+
+def cached_path(source_path, schema='compact'):
+    """Path of the cleaned Parquet cache for source_path if it is current, else None."""
+    if not parquet_available():
+        return None
+    data_path, key_path = cache_paths(source_path, schema)
+    try:
+        with open(key_path) as f:
+            stored = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not os.path.exists(data_path):
+        return None
+
+    # Cheap checks first; only hash the file when size and mtime agree
+    current = _stat_key(source_path, schema)
+    if any(stored.get(k) != v for k, v in current.items()):
+        return None
+    if stored.get('sha256') != file_digest(source_path):
+        return None
+    return data_path
+
+
+def load_cached(source_path, schema='compact'):
+    """Return the cached cleaned frame for source_path, or None on a miss."""
+    data_path = cached_path(source_path, schema)
+    if data_path is None:
+        return None
+    return pd.read_parquet(data_path)
+
+
+def cache_key(source_path, schema='compact'):
+    """
+    The key a cache of source_path is stored under. Take it before reading
+    the CSV: if the file changes during the read, the cache then holds the
+    old rows under the old file's key and is simply a miss next time.
+    """
+    key = _stat_key(source_path, schema)
+    key['sha256'] = file_digest(source_path)
+    return key
+
+
+def save_cache(source_path, df, schema='compact', key=None):
+    """
+    Write df as the cleaned cache for source_path under `key` (a
+    cache_key() taken before df was read; default: taken now). Returns
+    True on success.
+    """
+    if not parquet_available():
+        return False
+    data_path, key_path = cache_paths(source_path, schema)
+    os.makedirs(os.path.dirname(data_path), exist_ok=True)
+
+    key = dict(cache_key(source_path, schema) if key is None else key, rows=len(df))
+
+    # Each file is written under a unique temporary name and renamed, data
+    # first, so an interrupted run never leaves a key that points at a
+    # half-written Parquet file and concurrent runs never share a file.
+    with atomic_path(data_path) as tmp_path:
+        df.to_parquet(tmp_path, index=False)
+    atomic_write(key_path, json.dumps(key, indent=2))
+    return True
+
+
+def clear_cache(source_path):
+    """Remove the cached data of every schema variant for source_path."""
+    folder = _cache_folder(source_path)
+    stem = re.escape(os.path.splitext(os.path.basename(source_path))[0])
+    variant = re.compile(stem + r'\.[A-Za-z0-9_+-]+\.(parquet|json)')
+    if not os.path.isdir(folder):
+        return
+    for name in os.listdir(folder):
+        if variant.fullmatch(name):
+            os.remove(os.path.join(folder, name))
@@ -0,0 +1,614 @@
+"""
+Chart rendering for the Vrinda Store analysis
+
+Each chart is a plain function of the small aggregate tables a question
+produces, so figures can be drawn in worker processes: ChartRenderer sends
+the tables to a process pool and all eight PNGs rasterize concurrently while
+the main process moves on to the next question.
+
+Because a chart is a pure function of its tables and the render parameters,
+chart_key() hashes exactly those, and ChartCache remembers the key each PNG
+in the output folder was drawn with. A chart whose key matches the PNG on
+disk is not drawn again.
+
+Each chart draws into a figure template: the figure and its grid of axes
+are built once per process and chart, then cleared and reused for the next
+render. Batch workers and chart pools therefore only redraw the data. A
+RenderProfile decides how a figure is laid out and saved. 'quality' is tight
+layout and a tight bounding box at 150 dpi. 'fast' is fixed per-chart
+margins at 72 dpi, which skips the two extra layout passes, and it can also
+write SVG. render_dashboard() draws several charts into one image.
+"""
+
+import functools
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from importlib import metadata
+
+import numpy as np
+import pandas as pd
+
+from vrinda.writer import atomic_path, atomic_write
+
+# Bump when the drawing code of any chart changes, so cached PNGs are redrawn
+CHART_VERSION = 2
+
+# Render parameters; part of every chart's cache key (see chart_key)
+STYLE = 'seaborn-v0_8-darkgrid'
+PALETTE = 'husl'
+FIGSIZES = {
+    'q1': (12, 6),
+    'q2': (14, 6),
+    'q3': (12, 10),
+    'q4': (14, 6),
+    'q5': (14, 7),
+    'q6': (14, 10),
+    'q7': (14, 10),
+    'q8': (10, 6),
+}
+
+# Axes grid (rows, columns) of every chart
+GRIDS = {
+    'q1': (1, 1),
+    'q2': (1, 2),
+    'q3': (2, 2),
+    'q4': (1, 2),
+    'q5': (1, 2),
+    'q6': (2, 2),
+    'q7': (2, 2),
+    'q8': (1, 1),
+}
+
+# Charts saved with bbox_inches='tight' by the quality profile
+TIGHT_BBOX = {'q1', 'q2', 'q3', 'q4', 'q6', 'q7'}
+
+# Subplot margins of the fast profile, in place of tight_layout(); sized
+# for the longest state, status and category labels
+FIXED_LAYOUTS = {
+    'q1': dict(left=0.07, right=0.92, bottom=0.16, top=0.92),
+    'q2': dict(left=0.08, right=0.98, bottom=0.09, top=0.94, wspace=0.18),
+    'q3': dict(left=0.09, right=0.98, bottom=0.05, top=0.96, wspace=0.25, hspace=0.2),
+    'q4': dict(left=0.05, right=0.98, bottom=0.09, top=0.94, wspace=0.25),
+    'q5': dict(left=0.13, right=0.98, bottom=0.08, top=0.95, wspace=0.3),
+    'q6': dict(left=0.06, right=0.98, bottom=0.06, top=0.96, wspace=0.2, hspace=0.25),
+    'q7': dict(left=0.07, right=0.98, bottom=0.05, top=0.96, wspace=0.25, hspace=0.2),
+    'q8': dict(left=0.16, right=0.97, bottom=0.09, top=0.94),
+}
+
+# Size of each chart's cell in render_dashboard()
+DASHBOARD_CELL = (14, 9)
+DASHBOARD_COLUMNS = 2
+
+FORMATS = ('png', 'svg')
+
+
+class RenderProfile:
+    """
+    How charts are laid out and saved: `dpi`, `tight` (tight_layout and a
+    tight bounding box; otherwise FIXED_LAYOUTS) and the file `format`.
+    """
+
+    def __init__(self, name, dpi, tight, format='png'):
+        if format not in FORMATS:
+            raise ValueError(f"chart format must be one of {', '.join(FORMATS)}: {format!r}")
+        self.name = name
+        self.dpi = dpi
+        self.tight = tight
+        self.format = format
+
+    def params(self):
+        return {'profile': self.name, 'dpi': self.dpi, 'tight': self.tight,
+                'format': self.format}
+
+    def __repr__(self):
+        return f"RenderProfile({self.name}: {self.dpi} dpi, {self.format})"
+
+
+# name -> (dpi, tight)
+PROFILES = {
+    'quality': (150, True),
+    'fast': (72, False),
+}
+QUALITY = RenderProfile('quality', *PROFILES['quality'])
+
+
+def render_profile(name='quality', format='png'):
+    """The RenderProfile called `name` (a PROFILES key), saving `format` files."""
+    return RenderProfile(name, *PROFILES[name], format=format)
+
+
+def _matplotlib():
+    """
+    matplotlib on the non-interactive backend.
+
+    matplotlib and seaborn take most of a second to import, so they are
+    loaded on the first chart rather than when this module is imported.
+    """
+    import matplotlib
+    matplotlib.use('Agg')  # Non-interactive backend for Termux
+    return matplotlib
+
+
+def apply_style():
+    """Global plot style; run in every process that draws charts."""
+    _matplotlib()
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    plt.style.use(STYLE)
+    sns.set_palette(PALETTE)
+
+
+_MARGINS = ('left', 'right', 'bottom', 'top', 'wspace', 'hspace')
+
+# The figure templates of this process: (chart, tight) -> (fig, axes, [(ax, subplotspec)])
+_templates = {}
+
+
+def _template(name, profile):
+    """
+    The figure and axes of chart `name`, built on first use and cleared
+    for every later render. Figures are created without pyplot, so they
+    are never registered with (or drawn by) its figure manager.
+    """
+    key = (name, profile.tight)
+    template = _templates.get(key)
+    if template is None:
+        from matplotlib.figure import Figure
+
+        _matplotlib()
+        fig = Figure(figsize=FIGSIZES[name])
+        axes = fig.subplots(*GRIDS[name], gridspec_kw=None if profile.tight else FIXED_LAYOUTS[name])
+        template = _templates[key] = (fig, axes, [(ax, ax.get_subplotspec())
+                                                   for ax in np.ravel(axes)])
+        return fig, axes
+
+    fig, axes, grid = template
+    base = {ax for ax, _ in grid}
+    # Twin axes and colorbars are drawn afresh; a colorbar also took part
+    # of its parent's grid cell, which is given back
+    for ax in fig.axes:
+        if ax not in base:
+            ax.remove()
+    for ax, spec in grid:
+        ax.clear()
+        ax.set_subplotspec(spec)
+    if profile.tight:
+        # tight_layout() starts from the current margins; start it from a
+        # new figure's, so a reused figure comes out the same
+        rc = _matplotlib().rcParams
+        fig.subplots_adjust(**{side: rc[f'figure.subplot.{side}'] for side in _MARGINS})
+    return fig, axes
+
+
+def clear_templates():
+    """Drop this process's figure templates."""
+    _templates.clear()
+
+
+def _save(fig, path, profile, **options):
+    """Save `fig`; the file appears at `path` complete or not at all."""
+    with atomic_path(path) as tmp_path:
+        fig.savefig(tmp_path, format=profile.format, dpi=profile.dpi, **options)
+
+
+def render(name, path, profile=QUALITY, **tables):
+    """Draw chart `name` (a CHARTS key) from `tables` into `path`; returns the seconds taken."""
+    start = time.perf_counter()
+    fig, axes = _template(name, profile)
+    CHARTS[name](fig, axes, **tables)
+    options = {}
+    if profile.tight:
+        fig.tight_layout()
+        if name in TIGHT_BBOX:
+            options['bbox_inches'] = 'tight'
+    _save(fig, path, profile, **options)
+    return time.perf_counter() - start
+
+
+def render_dashboard(path, charts, profile=QUALITY):
+    """
+    Draw every chart of `charts` ({name: tables}) into one image at `path`,
+    DASHBOARD_COLUMNS charts per row; returns the seconds taken.
+    """
+    from matplotlib.figure import Figure
+
+    start = time.perf_counter()
+    _matplotlib()
+    names = list(charts)
+    columns = min(DASHBOARD_COLUMNS, len(names))
+    rows = -(-len(names) // columns)
+    fig = Figure(figsize=(DASHBOARD_CELL[0] * columns, DASHBOARD_CELL[1] * rows),
+                 layout='constrained' if profile.tight else None)
+    cells = np.ravel(fig.subfigures(rows, columns, squeeze=False))
+    for cell, name in zip(cells, names):
+        axes = cell.subplots(*GRIDS[name], gridspec_kw=None if profile.tight else FIXED_LAYOUTS[name])
+        CHARTS[name](cell, axes, **charts[name])
+    _save(fig, path, profile)
+    return time.perf_counter() - start
+
+
+def q1_sales_orders(fig, ax1, monthly):
+    """Q1: orders (bars) against sales (line) by month."""
+    x = np.arange(len(monthly))
+    width = 0.35
+
+    ax1.bar(x - width/2, monthly['Orders'], width, label='Orders', color='skyblue', alpha=0.8)
+    ax1.set_xlabel('Month', fontsize=11, fontweight='bold')
+    ax1.set_ylabel('Number of Orders', fontsize=11, fontweight='bold', color='skyblue')
+    ax1.tick_params(axis='y', labelcolor='skyblue')
+
+    ax2 = ax1.twinx()
+    ax2.plot(x, monthly['Sales'], color='red', marker='o', linewidth=2, markersize=8, label='Sales')
+    ax2.set_ylabel('Sales Amount (₹)', fontsize=11, fontweight='bold', color='red')
+    ax2.tick_params(axis='y', labelcolor='red')
+
+    ax1.set_xticks(x)
+    ax1.set_xticklabels(monthly['Month'], rotation=45, ha='right')
+
+    lines1, labels1 = ax1.get_legend_handles_labels()
+    lines2, labels2 = ax2.get_legend_handles_labels()
+    ax1.legend(lines1 + lines2, labels1 + labels2, loc='upper left')
+
+    ax2.set_title('Sales vs Orders Comparison by Month', fontsize=13, fontweight='bold', pad=15)
+
+
+def q2_highest_month(fig, axes, monthly, highest_orders_month, highest_sales_month):
+    """Q2: monthly orders and sales ranked, best month highlighted."""
+    ax1, ax2 = axes
+
+    monthly_sorted_orders = monthly.sort_values('Orders', ascending=False)
+    colors1 = ['#ff6b6b' if x == highest_orders_month else '#4ecdc4'
+              for x in monthly_sorted_orders['Month']]
+    ax1.barh(monthly_sorted_orders['Month'], monthly_sorted_orders['Orders'], color=colors1, alpha=0.8)
+    ax1.set_xlabel('Number of Orders', fontweight='bold')
+    ax1.set_title('Orders by Month', fontweight='bold')
+    ax1.grid(axis='x', alpha=0.3)
+
+    monthly_sorted_sales = monthly.sort_values('Sales', ascending=False)
+    colors2 = ['#ff6b6b' if x == highest_sales_month else '#95e1d3'
+              for x in monthly_sorted_sales['Month']]
+    ax2.barh(monthly_sorted_sales['Month'], monthly_sorted_sales['Sales'], color=colors2, alpha=0.8)
+    ax2.set_xlabel('Sales Amount (₹)', fontweight='bold')
+    ax2.set_title('Sales by Month', fontweight='bold')
+    ax2.grid(axis='x', alpha=0.3)
+
+
+def q3_gender(fig, axes, gender_stats):
+    """Q3: orders and sales split by gender."""
+
+    axes[0, 0].pie(gender_stats['Orders'], labels=gender_stats['Gender'],
+                  autopct='%1.1f%%', startangle=90, colors=['#ff6b6b', '#4ecdc4'])
+    axes[0, 0].set_title('Orders Distribution', fontweight='bold')
+
+    axes[0, 1].pie(gender_stats['Sales'], labels=gender_stats['Gender'],
+                  autopct='%1.1f%%', startangle=90, colors=['#ffd93d', '#6bcf7f'])
+    axes[0, 1].set_title('Sales Distribution', fontweight='bold')
+
+    axes[1, 0].bar(gender_stats['Gender'], gender_stats['Orders'],
+                  color=['#ff6b6b', '#4ecdc4'], alpha=0.8)
+    axes[1, 0].set_ylabel('Orders', fontweight='bold')
+    axes[1, 0].set_title('Total Orders', fontweight='bold')
+    axes[1, 0].grid(axis='y', alpha=0.3)
+
+    axes[1, 1].bar(gender_stats['Gender'], gender_stats['Sales'],
+                  color=['#ffd93d', '#6bcf7f'], alpha=0.8)
+    axes[1, 1].set_ylabel('Sales (₹)', fontweight='bold')
+    axes[1, 1].set_title('Total Sales', fontweight='bold')
+    axes[1, 1].grid(axis='y', alpha=0.3)
+
+
+def q4_order_status(fig, axes, status_stats):
+    """Q4: order status distribution."""
+    ax1, ax2 = axes
+
+    colors = _matplotlib().colormaps['Set3'](range(len(status_stats)))
+    ax1.pie(status_stats['Count'], labels=status_stats['Status'],
+           autopct='%1.1f%%', startangle=90, colors=colors)
+    ax1.set_title('Order Status Distribution', fontweight='bold')
+
+    ax2.barh(status_stats['Status'], status_stats['Count'], color=colors, alpha=0.8)
+    ax2.set_xlabel('Number of Orders', fontweight='bold')
+    ax2.set_title('Orders by Status', fontweight='bold')
+    ax2.grid(axis='x', alpha=0.3)
+
+
+def q5_top_states(fig, axes, top_states):
+    """Q5: top states by sales and by orders."""
+    ax1, ax2 = axes
+
+    y_pos = np.arange(len(top_states))
+    colors = _matplotlib().colormaps['viridis'](np.linspace(0, 1, len(top_states)))
+
+    # Sales Chart
+    ax1.barh(y_pos, top_states['Sales'], color=colors)
+    ax1.set_yticks(y_pos)
+    ax1.set_yticklabels(top_states['State'])
+    ax1.set_xlabel('Sales (₹)', fontweight='bold')
+    ax1.set_title('Top States by Sales', fontweight='bold')
+    ax1.invert_yaxis()
+    ax1.grid(axis='x', alpha=0.3)
+
+    # Orders Chart
+    ax2.barh(y_pos, top_states['Orders'], color=colors)
+    ax2.set_yticks(y_pos)
+    ax2.set_yticklabels(top_states['State'])
+    ax2.set_xlabel('Orders', fontweight='bold')
+    ax2.set_title('Top States by Orders', fontweight='bold')
+    ax2.invert_yaxis()
+    ax2.grid(axis='x', alpha=0.3)
+
+
+def q6_age_gender(fig, axes, age_gender, pivot_orders):
+    """Q6: orders by age group and gender."""
+
+    age_groups = age_gender['Age_Group'].unique()
+    x = np.arange(len(age_groups))
+    width = 0.35
+
+    men_data = age_gender[age_gender['Gender'] == 'Men'].set_index('Age_Group')['Orders'].reindex(age_groups, fill_value=0)
+    women_data = age_gender[age_gender['Gender'] == 'Women'].set_index('Age_Group')['Orders'].reindex(age_groups, fill_value=0)
+
+    axes[0, 0].bar(x - width/2, men_data, width, label='Men', color='#4ecdc4', alpha=0.8)
+    axes[0, 0].bar(x + width/2, women_data, width, label='Women', color='#ff6b6b', alpha=0.8)
+    axes[0, 0].set_xlabel('Age Group', fontweight='bold')
+    axes[0, 0].set_ylabel('Orders', fontweight='bold')
+    axes[0, 0].set_title('Orders by Age & Gender', fontweight='bold')
+    axes[0, 0].set_xticks(x)
+    axes[0, 0].set_xticklabels(age_groups)
+    axes[0, 0].legend()
+    axes[0, 0].grid(axis='y', alpha=0.3)
+
+    axes[0, 1].bar(age_groups, men_data, label='Men', color='#4ecdc4', alpha=0.8)
+    axes[0, 1].bar(age_groups, women_data, bottom=men_data, label='Women', color='#ff6b6b', alpha=0.8)
+    axes[0, 1].set_xlabel('Age Group', fontweight='bold')
+    axes[0, 1].set_ylabel('Orders', fontweight='bold')
+    axes[0, 1].set_title('Stacked Orders', fontweight='bold')
+    axes[0, 1].legend()
+    axes[0, 1].grid(axis='y', alpha=0.3)
+
+    # Heatmap
+    pivot_normalized = pivot_orders.div(pivot_orders.sum(axis=1), axis=0) * 100
+    im = axes[1, 0].imshow(pivot_normalized.T, cmap='YlOrRd', aspect='auto')
+    axes[1, 0].set_xticks(np.arange(len(age_groups)))
+    axes[1, 0].set_yticks(np.arange(len(pivot_orders.columns)))
+    axes[1, 0].set_xticklabels(age_groups)
+    axes[1, 0].set_yticklabels(pivot_orders.columns)
+    axes[1, 0].set_title('Distribution Heatmap (%)', fontweight='bold')
+    fig.colorbar(im, ax=axes[1, 0])
+
+    # Line chart
+    for gender in ['Men', 'Women']:
+        data = age_gender[age_gender['Gender'] == gender]
+        axes[1, 1].plot(data['Age_Group'], data['Orders'], marker='o', linewidth=2, markersize=8, label=gender)
+    axes[1, 1].set_xlabel('Age Group', fontweight='bold')
+    axes[1, 1].set_ylabel('Orders', fontweight='bold')
+    axes[1, 1].set_title('Orders Trend', fontweight='bold')
+    axes[1, 1].legend()
+    axes[1, 1].grid(True, alpha=0.3)
+
+
+def q7_channel(fig, axes, channel_stats):
+    """Q7: sales and orders by channel."""
+    colors = _matplotlib().colormaps['Set3'](range(len(channel_stats)))
+
+    axes[0, 0].pie(channel_stats['Sales'], labels=channel_stats['Channel'],
+                  autopct='%1.1f%%', startangle=90, colors=colors)
+    axes[0, 0].set_title('Sales Distribution', fontweight='bold')
+
+    axes[0, 1].pie(channel_stats['Orders'], labels=channel_stats['Channel'],
+                  autopct='%1.1f%%', startangle=90, colors=colors)
+    axes[0, 1].set_title('Orders Distribution', fontweight='bold')
+
+    axes[1, 0].barh(channel_stats['Channel'], channel_stats['Sales'], color=colors, alpha=0.8)
+    axes[1, 0].set_xlabel('Sales (₹)', fontweight='bold')
+    axes[1, 0].set_title('Sales by Channel', fontweight='bold')
+    axes[1, 0].invert_yaxis()
+    axes[1, 0].grid(axis='x', alpha=0.3)
+
+    axes[1, 1].barh(channel_stats['Channel'], channel_stats['Orders'], color=colors, alpha=0.8)
+    axes[1, 1].set_xlabel('Orders', fontweight='bold')
+    axes[1, 1].set_title('Orders by Channel', fontweight='bold')
+    axes[1, 1].invert_yaxis()
+    axes[1, 1].grid(axis='x', alpha=0.3)
+
+
+def q8_top_categories(fig, ax, top_10):
+    """Q8: top categories by sales."""
+    y_pos = np.arange(len(top_10))
+    colors = _matplotlib().colormaps['viridis'](np.linspace(0, 1, len(top_10)))
+
+    ax.barh(y_pos, top_10['Sales'], color=colors, alpha=0.8)
+
+    ax.set_yticks(y_pos)
+    ax.set_yticklabels(top_10['Category'])
+    ax.set_xlabel("Sales (₹)", fontweight='bold')
+    ax.set_title("Top Categories by Sales", fontweight='bold')
+
+    ax.invert_yaxis()
+    ax.grid(axis='x', alpha=0.3)
+
+
+CHARTS = {
+    'q1': q1_sales_orders,
+    'q2': q2_highest_month,
+    'q3': q3_gender,
+    'q4': q4_order_status,
+    'q5': q5_top_states,
+    'q6': q6_age_gender,
+    'q7': q7_channel,
+    'q8': q8_top_categories,
+}
+
+
+def default_workers():
+    return min(len(CHARTS), os.cpu_count() or 1)
+
+
+CACHE_FILENAME = '.chart_cache.json'
+
+
+def _package_version(name):
+    try:
+        return metadata.version(name)
+    except metadata.PackageNotFoundError:
+        return None
+
+
+def render_params(name, profile=QUALITY):
+    """
+    Everything besides the tables that decides how chart `name` looks;
+    `name` may also be a list of charts drawn as one dashboard.
+    """
+    if isinstance(name, str):
+        layout = {'figsize': FIGSIZES[name], 'grid': GRIDS[name],
+                  'margins': None if profile.tight else FIXED_LAYOUTS[name]}
+    else:
+        layout = {'cell': DASHBOARD_CELL, 'columns': DASHBOARD_COLUMNS,
+                  'charts': [render_params(chart, profile) for chart in name]}
+    return {
+        'chart': name,
+        'version': CHART_VERSION,
+        **layout,
+        **profile.params(),
+        'style': STYLE,
+        'palette': PALETTE,
+        'matplotlib': _package_version('matplotlib'),
+        'seaborn': _package_version('seaborn'),
+    }
+
+
+def _hash_table(digest, value):
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        frame = value.to_frame() if isinstance(value, pd.Series) else value
+        digest.update(repr((type(value).__name__, list(frame.columns), list(frame.index.names),
+                            [str(dtype) for dtype in frame.dtypes])).encode())
+        digest.update(pd.util.hash_pandas_object(frame, index=True).to_numpy().tobytes())
+    else:
+        digest.update(repr(value).encode())
+
+
+def chart_key(name, tables, profile=QUALITY):
+    """SHA-256 of chart `name`'s render parameters (see render_params) and input tables."""
+    digest = hashlib.sha256(json.dumps(render_params(name, profile), sort_keys=True).encode())
+    for arg in sorted(tables):
+        digest.update(arg.encode())
+        _hash_table(digest, tables[arg])
+    return digest.hexdigest()
+
+
+class ChartCache:
+    """
+    chart_key() of every PNG drawn into a folder, kept in
+    <folder>/.chart_cache.json with the PNG's size and mtime, so a PNG that
+    was replaced or deleted since is drawn again.
+    """
+
+    def __init__(self, folder):
+        self.path = os.path.join(folder, CACHE_FILENAME)
+        try:
+            with open(self.path) as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def hit(self, path, key):
+        entry = self.entries.get(os.path.basename(path))
+        if not entry or entry.get('key') != key:
+            return False
+        try:
+            st = os.stat(path)
+        except OSError:
+            return False
+        return entry.get('size') == st.st_size and entry.get('mtime_ns') == st.st_mtime_ns
+
+    def store(self, path, key):
+        st = os.stat(path)
+        self.entries[os.path.basename(path)] = {
+            'key': key, 'size': st.st_size, 'mtime_ns': st.st_mtime_ns}
+
+    def save(self):
+        atomic_write(self.path, json.dumps(self.entries, indent=2, sort_keys=True))
+
+
+class ChartRenderer:
+    """
+    Render charts in-process (workers <= 1) or on a process pool, with
+    RenderProfile `profile` (default QUALITY).
+
+    submit() returns immediately in pool mode; wait() blocks until every
+    queued chart is on disk and re-raises the first render error. The
+    seconds each chart took to draw and save are kept in `timings`, by path.
+
+    With a ChartCache, charts whose key matches the file on disk are skipped
+    (unless refresh is set). The pool and the plot style are only set up
+    for the first chart that is actually drawn, so a run where every chart
+    is cached never imports matplotlib.
+    """
+
+    def __init__(self, workers=1, cache=None, refresh=False, profile=QUALITY):
+        self.workers = workers
+        self.cache = cache
+        self.refresh = refresh
+        self.profile = profile
+        self.timings = {}
+        self._pool = None
+        self._styled = False
+        self._pending = []
+
+    @property
+    def parallel(self):
+        return self.workers > 1
+
+    def submit(self, name, path, **tables):
+        """
+        Draw chart `name` (a CHARTS key) from `tables` into `path`.
+        Returns False when the cached file is current and nothing is drawn.
+        """
+        return self._submit(name, tables, path,
+                            functools.partial(render, name, path, self.profile, **tables))
+
+    def submit_dashboard(self, path, charts):
+        """Draw `charts` ({name: tables}) as one render_dashboard() image; see submit()."""
+        tables = {f'{name}.{arg}': value for name, kw in charts.items() for arg, value in kw.items()}
+        return self._submit(list(charts), tables, path,
+                            functools.partial(render_dashboard, path, charts, self.profile))
+
+    def _submit(self, name, tables, path, draw):
+        key = None
+        if self.cache is not None:
+            key = chart_key(name, tables, self.profile)
+            if not self.refresh and self.cache.hit(path, key):
+                return False
+
+        if not self.parallel:
+            if not self._styled:
+                apply_style()
+                self._styled = True
+            self.timings[path] = draw()
+            if key is not None:
+                self.cache.store(path, key)
+            return True
+
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=apply_style)
+        self._pending.append((path, key, self._pool.submit(draw)))
+        return True
+
+    def wait(self):
+        """Wait for queued charts and return their paths in submission order."""
+        pending, self._pending = self._pending, []
+        try:
+            for path, key, future in pending:
+                self.timings[path] = future.result()
+                if key is not None:
+                    self.cache.store(path, key)
+        finally:
+            if self._pool is not None:
+                self._pool.shutdown()
+                self._pool = None
+            if self.cache is not None:
+                self.cache.save()
+        return [path for path, _, _ in pending]
@@ -0,0 +1,132 @@
+"""
+STEP 2 cleaning rules for the Vrinda Store dataset
+
+clean_data() is shared by the in-memory path and the chunked streaming path
+so both see exactly the same values.
+
+Label and date columns hold a few dozen (labels) or a few hundred (dates)
+distinct strings repeated across millions of rows, so every rule is applied
+once per distinct value and the result broadcast back through integer codes.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Bump whenever a rule below changes; cached cleaned data from an older
+# version is then rebuilt instead of reused.
+CLEANING_VERSION = 3
+
+GENDER_MAP = {
+    'M': 'Men',
+    'W': 'Women',
+    'Men': 'Men',
+    'Women': 'Women'
+}
+
+DATE_FORMAT = '%m/%d/%Y'
+
+AGE_BINS = [0, 18, 30, 40, 50, 100]
+AGE_LABELS = ['<18', '18-30', '30-40', '40-50', '50+']
+
+# Month number -> '%B' name, built with strftime so it matches the old
+# per-row Date.dt.strftime('%B') exactly
+MONTH_NAMES = [pd.Timestamp(2000, month, 1).strftime('%B') for month in range(1, 13)]
+
+
+def standardize_gender(values):
+    return values.map(GENDER_MAP)
+
+
+def title_label(values):
+    """Status and Channel: surrounding whitespace dropped, title case."""
+    return values.str.strip().str.title()
+
+
+def upper_label(values):
+    """ship-state: surrounding whitespace dropped, upper case."""
+    return values.str.strip().str.upper()
+
+
+# Per-value rules for the label columns; the query backends apply the same
+# functions to each distinct raw value
+LABEL_RULES = {
+    'Gender': standardize_gender,
+    'Status': title_label,
+    'Channel': title_label,
+    'ship-state': upper_label,
+}
+
+
+def normalize_values(series, rule):
+    """
+    Apply `rule` (a function of a Series) to each distinct value of `series`
+    once and broadcast the result back to every row.
+
+    Returns a categorical with lexically sorted categories, so grouping on
+    it orders keys exactly as grouping the equivalent strings would. Values
+    the rule maps to NaN stay NaN.
+    """
+    codes, uniques = pd.factorize(series)
+    cleaned = rule(pd.Series(np.asarray(uniques, dtype=object), dtype=object))
+    cleaned_codes, categories = pd.factorize(cleaned, sort=True)
+    # Append -1 so rows whose raw value was missing (code -1) stay missing
+    lookup = np.append(cleaned_codes, -1)
+    return pd.Series(
+        pd.Categorical.from_codes(lookup[codes], categories=categories),
+        index=series.index)
+
+
+def parse_dates(series):
+    """pd.to_datetime(series, format=DATE_FORMAT, errors='coerce'), one parse per distinct string."""
+    codes, uniques = pd.factorize(series)
+    parsed = pd.to_datetime(pd.Series(np.asarray(uniques, dtype=object), dtype=object),
+                            format=DATE_FORMAT, errors='coerce')
+    lookup = np.append(parsed.to_numpy(), np.array(['NaT'], dtype=parsed.dtype))
+    return pd.Series(lookup[codes], index=series.index)
+
+
+def month_names(month):
+    """'%B' names for a Month column (NaN -> NaN) as a sorted categorical."""
+    categories = sorted(MONTH_NAMES)
+    # month number -> position of its name in the sorted categories; 0 -> missing
+    lookup = np.array([-1] + [categories.index(name) for name in MONTH_NAMES])
+    numbers = month.fillna(0).to_numpy(dtype=np.int64)
+    return pd.Series(pd.Categorical.from_codes(lookup[numbers], categories=categories),
+                     index=month.index)
+
+
+def age_groups(age):
+    """Age bucketed into AGE_LABELS."""
+    return pd.cut(age, bins=AGE_BINS, labels=AGE_LABELS)
+
+
+def clean_data(df):
+    """Apply the seven STEP 2 cleaning steps to df in place and return it."""
+    # Clean column names (remove trailing spaces)
+    df.columns = df.columns.str.strip()
+
+    # 1. Standardize Gender
+    df['Gender'] = normalize_values(df['Gender'], LABEL_RULES['Gender'])
+
+    # 2. Convert Date
+    df['Date'] = parse_dates(df['Date'])
+    df['Month'] = df['Date'].dt.month
+    df['Month_Name'] = month_names(df['Month'])
+    df['Year'] = df['Date'].dt.year
+
+    # 3. Clean Amount
+    df['Amount'] = pd.to_numeric(df['Amount'], errors='coerce')
+
+    # 4. Standardize Status
+    df['Status'] = normalize_values(df['Status'], LABEL_RULES['Status'])
+
+    # 5. Clean Channel
+    df['Channel'] = normalize_values(df['Channel'], LABEL_RULES['Channel'])
+
+    # 6. Create Age Groups
+    df['Age_Group'] = age_groups(df['Age'])
+
+    # 7. Clean State names
+    df['ship-state'] = normalize_values(df['ship-state'], LABEL_RULES['ship-state'])
+
+    return df
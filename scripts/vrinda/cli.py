@@ -0,0 +1,952 @@
+"""
+Command-line entry point for the Vrinda Store analysis
+
+main() parses the options, builds the Aggregates cube (in memory, streamed
+or merged into a saved state), answers Q1-Q8 and writes the summary report,
+the charts and the Excel workbook. Nothing runs at import time, and the
+plotting libraries are only imported when charts are drawn, so
+`--no-charts` runs never load matplotlib or seaborn.
+"""
+
+import argparse
+import contextlib
+import functools
+import io
+import os
+import warnings
+
+import pandas as pd
+
+from vrinda import questions
+from vrinda.aggregates import build_aggregates, to_paise
+from vrinda.backends import BACKENDS, duckdb_aggregates, duckdb_available
+from vrinda.batch import WORKBOOK_NAME, read_manifest, run_batch, store_tables, write_comparison
+from vrinda.cache import (cache_key, cache_paths, cached_path, clear_cache, load_cached,
+                          parquet_available, save_cache)
+from vrinda.charts import FORMATS, PROFILES, ChartCache, ChartRenderer, default_workers, render_profile
+from vrinda.excel import RAW_DATA_MODES, ExcelReport
+from vrinda.hll import DEFAULT_PRECISION, MAX_PRECISION, MIN_PRECISION
+from vrinda.loading import (clean_and_report, load_data, print_memory_report, read_clean,
+                            step_banner, stream_aggregates)
+from vrinda.partitions import expand_source, is_partitioned, prune, read_partitions
+from vrinda.periods import DateIndex, parse_period, sort_by_date
+from vrinda.profiling import NullProfile, RunProfile
+from vrinda.report import excel_tables, summary_report
+from vrinda.schema import compact_frame, concat_frames, csv_columns
+from vrinda.sharding import sharded_aggregates
+from vrinda.service import DEFAULT_PORT, AnalyticsService, serve
+from vrinda.stages import QUESTIONS, TARGETS, parse_targets, plan, year_scoped
+from vrinda.state import (StateError, check_not_applied, load_state, save_state,
+                          source_record, state_digest)
+from vrinda.topn import HeavyHitters, top_totals
+from vrinda.writer import OutputWriter
+
+# File paths - UPDATE THIS to match your file location. A directory or glob
+# of per-month/per-day exports works too, e.g. 'data/exports/*.csv'
+FILE_PATH = 'data/Vrinda Store.csv'
+
+# Alternative paths if the above doesn't work:
+# FILE_PATH = 'Vrinda_Store.csv'
+# FILE_PATH = '/sdcard/Vrinda_Store.csv'
+# FILE_PATH = '~/storage/shared/Vrinda_Store.csv'
+
+# Create output directory in phone storage
+OUTPUT_DIR = "output"
+
+# Delta files are streamed too; they are usually small enough for one chunk
+APPEND_CHUNK_SIZE = 1_000_000
+
+# Values listed per --top-items column
+TOP_ITEMS = 10
+
+CHART_FILES = {
+    'q1': 'q1_sales_orders_comparison.png',
+    'q2': 'q2_highest_month.png',
+    'q3': 'q3_gender_analysis.png',
+    'q4': 'q4_order_status.png',
+    'q5': 'q5_top_states.png',
+    'q6': 'q6_age_gender_relation.png',
+    'q7': 'q7_channel_analysis.png',
+    'q8': 'q8_top_categories.png',
+}
+DASHBOARD_FILE = 'dashboard.png'
+
+
+def chart_file(name, format='png'):
+    """File name of chart `name` (a CHART_FILES key, or 'dashboard') saved as `format`."""
+    filename = DASHBOARD_FILE if name == 'dashboard' else CHART_FILES[name]
+    return f"{os.path.splitext(filename)[0]}.{format}"
+
+
+class CliError(Exception):
+    """A problem with the options or input files; reported as ❌ ERROR."""
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Vrinda Store sales analysis")
+    parser.add_argument('--data', metavar='PATH', default=FILE_PATH,
+                        help="Input CSV, directory of CSVs or glob such as 'data/exports/*.csv' "
+                             "(default: %(default)s)")
+    parser.add_argument('--output', metavar='DIR', default=OUTPUT_DIR,
+                        help="Folder for the charts, report, workbook and profile "
+                             "(default: %(default)s)")
+    parser.add_argument('--backend', choices=BACKENDS, default='pandas',
+                        help="Engine that builds the aggregates: pandas in memory (default) or "
+                             "an embedded DuckDB database scanning the CSV or cleaned cache "
+                             "out of core (requires duckdb)")
+    parser.add_argument('--check-backends', action='store_true',
+                        help="Build the aggregates with every backend, compare every output "
+                             "table and exit")
+    parser.add_argument('--period', metavar='PERIOD',
+                        help="Restrict every output to a period: a year (2022), quarter "
+                             "(2022-Q3), month (2022-07) or date range "
+                             "(2022-07-01:2022-09-30)")
+    parser.add_argument('--chunksize', type=int, default=None,
+                        help="Stream the CSV in chunks of this many rows. The aggregate cube "
+                             "stays bounded, but exact distinct-order counts grow with the "
+                             "number of orders; add --distinct-orders hll for constant memory")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="Do not read or write the cleaned-data cache")
+    parser.add_argument('--rebuild-cache', action='store_true',
+                        help="Delete the CSV's cached cleaned data (every column set) and "
+                             "rebuild it from the CSV")
+    parser.add_argument('--all-columns', action='store_true',
+                        help="Load every CSV column, not only the columns the analysis uses. "
+                             "Runs that export the raw rows (--raw-data) already do, so this "
+                             "only matters with --raw-data none or without the Excel output")
+    parser.add_argument('--memory-report', action='store_true',
+                        help="Compare per-column memory against pandas default dtypes")
+    parser.add_argument('--only', metavar='TARGETS', default=','.join(TARGETS),
+                        help="Comma-separated outputs to produce, e.g. q5,q7,excel; "
+                             "only the stages they need are run (choices: %(default)s)")
+    parser.add_argument('--top-items', metavar='COLUMNS',
+                        help="Also list the 10 best-selling values of these CSV columns, e.g. "
+                             "SKU,ship-city (exact in memory; a bounded-memory sketch with "
+                             "error bounds in streaming mode)")
+    parser.add_argument('--sketch-size', type=int, default=1000,
+                        help="Counters per --top-items column in streaming mode; more "
+                             "counters tighten the error bound (default: %(default)s)")
+    parser.add_argument('--distinct-orders', choices=('exact', 'hll'), default='exact',
+                        help="Count distinct Order IDs exactly (default) or with mergeable "
+                             "HyperLogLog sketches of fixed size")
+    parser.add_argument('--hll-precision', type=int, default=DEFAULT_PRECISION,
+                        help=f"HyperLogLog precision p ({MIN_PRECISION}-{MAX_PRECISION}): "
+                             "2**p registers per sketch, about 1.04/sqrt(2**p) relative "
+                             "error (default: %(default)s)")
+    parser.add_argument('--agg-workers', type=int, default=1,
+                        help="Processes that build the aggregates in memory, each over a shard "
+                             "of the rows, merged into the same cube (default: %(default)s)")
+    parser.add_argument('--read-workers', type=int, default=default_workers(),
+                        help="Threads reading the files of a directory or glob input "
+                             "concurrently (default: %(default)s)")
+    parser.add_argument('--no-charts', action='store_true',
+                        help="Skip the eight PNG charts (matplotlib is never imported); "
+                             "the report and Excel workbook are unchanged")
+    parser.add_argument('--chart-workers', type=int, default=default_workers(),
+                        help="Processes used to render the eight charts concurrently "
+                             "(1 renders them one after another; default: %(default)s)")
+    parser.add_argument('--refresh-charts', action='store_true',
+                        help="Redraw every chart even if its inputs and render settings "
+                             "match the PNG already in output/")
+    parser.add_argument('--chart-profile', choices=sorted(PROFILES), default='quality',
+                        help="quality: tight layout at 150 dpi (default); fast: fixed "
+                             "margins at 72 dpi, several times quicker and smaller")
+    parser.add_argument('--chart-format', choices=FORMATS, default='png',
+                        help="Image format of the charts (default: %(default)s)")
+    parser.add_argument('--dashboard', action='store_true',
+                        help="Draw the charts into one dashboard image instead of one "
+                             "file per question")
+    parser.add_argument('--raw-data', choices=RAW_DATA_MODES, default='sheet',
+                        help="Where the cleaned rows go: the Cleaned_Data sheet(s) (default), "
+                             "a compressed CSV or Parquet file next to the workbook, or nowhere")
+    parser.add_argument('--profile', action='store_true',
+                        help="Record wall time, CPU time, peak memory, rows and output bytes "
+                             "per stage in output/run_profile.json")
+    parser.add_argument('--cprofile', action='store_true',
+                        help="Also dump a cProfile per stage into output/profile/ "
+                             "(implies --profile)")
+    parser.add_argument('--state', metavar='PATH',
+                        help="Aggregate state file: written after a full run, merged "
+                             "with --append deltas on later runs")
+    parser.add_argument('--append', metavar='DELTA_CSV',
+                        help="Merge only this new CSV into --state and regenerate the "
+                             "report, charts and Excel summary sheets from the result")
+    parser.add_argument('--batch', metavar='MANIFEST',
+                        help="Run the analysis for every job of a CSV manifest (columns "
+                             "name,data,output) on warm worker processes, and write a "
+                             "cross-store comparison workbook into --output")
+    parser.add_argument('--batch-workers', type=int, default=default_workers(),
+                        help="Worker processes for --batch (default: %(default)s)")
+    parser.add_argument('--serve', metavar='PORT', type=int, nargs='?', const=DEFAULT_PORT,
+                        help="Load the data once and answer JSON queries for Q1-Q8 and the "
+                             "summary on http://127.0.0.1:PORT/ until interrupted "
+                             f"(default port: {DEFAULT_PORT}; 0 picks a free one)")
+    parser.add_argument('--cache-size', type=int, default=256,
+                        help="Query results kept by --serve; the least recently used are "
+                             "dropped first (default: %(default)s)")
+    return parser
+
+
+def _read_failed(path, error):
+    if isinstance(error, FileNotFoundError):
+        return CliError(f"File not found at {path}\n"
+                        "\nPlease ensure your CSV file is at the correct location."
+                        "\nYou can pass --data PATH or update FILE_PATH in scripts/vrinda/cli.py.")
+    return CliError(f"loading file failed: {error}")
+
+
+def append_aggregates(args, on_chunk, profile):
+    """Incremental mode: previous aggregates + only the new rows."""
+    try:
+        with profile.stage('load_state'):
+            state_agg, sources = load_state(args.state)
+        print(f"\n✓ Loaded state: {args.state} ({state_agg.total_rows:,} rows "
+              f"from {len(sources)} file(s))")
+    except FileNotFoundError:
+        state_agg, sources = None, []
+        print(f"\nⓘ No state at {args.state} yet - starting a new one")
+    except StateError as e:
+        raise CliError(e)
+
+    if not os.path.exists(args.append):
+        raise CliError(f"File not found at {args.append}")
+    record = source_record(args.append, rows=0)
+    try:
+        check_not_applied(sources, record)
+    except StateError as e:
+        raise CliError(e)
+
+    try:
+        with profile.stage('stream_delta') as stage:
+            if args.backend == 'duckdb':
+                delta = duckdb_aggregates(args.append, precision=_precision(args), mergeable=True)
+            else:
+                delta = stream_aggregates(args.append, args.chunksize or APPEND_CHUNK_SIZE,
+                                          on_chunk=on_chunk, precision=_precision(args))
+            stage.rows = delta.total_rows
+    except Exception as e:
+        raise _read_failed(args.append, e)
+    record['rows'] = delta.total_rows
+    with profile.stage('save_state', rows=delta.total_rows) as stage:
+        agg = delta if state_agg is None else state_agg.merge(delta)
+        digest = save_state(args.state, agg, sources + [record])
+        stage.outputs.append(args.state)
+    print(f"✓ State updated: {args.state} (+{delta.total_rows:,} rows)")
+    print(f"✓ State digest: {digest}")
+    return agg
+
+
+def _top_columns(args):
+    """The --top-items column names (stripped), in order."""
+    if not args.top_items:
+        return []
+    return [name.strip() for name in args.top_items.split(',') if name.strip()]
+
+
+def check_top_columns(args, paths):
+    """--top-items: fail before loading anything when a column is not in every CSV's header."""
+    wanted = _top_columns(args)
+    for path in paths:
+        try:
+            header = set(csv_columns(path))
+        except Exception as e:
+            raise _read_failed(path, e)
+        missing = [name for name in wanted if name not in header]
+        if missing:
+            raise CliError(f"--top-items: column(s) {', '.join(missing)} not in {path}")
+
+
+def _precision(args):
+    """HyperLogLog precision for --distinct-orders hll, or None for exact counts."""
+    return args.hll_precision if args.distinct_orders == 'hll' else None
+
+
+def _schema(args, all_columns=False):
+    """Cache schema variant: which columns the cleaned frame holds."""
+    if all_columns or args.all_columns:
+        return 'compact-all'
+    return 'compact' + ''.join(f'+{name}' for name in _top_columns(args))
+
+
+def load_frame(args, path, profile, all_columns=False):
+    """
+    STEP 1-2 for in-memory runs: the cleaned frame, from cache when possible.
+    `all_columns` keeps every CSV column (for the raw export), as --all-columns does.
+    """
+    all_columns = all_columns or args.all_columns
+    schema = _schema(args, all_columns)
+    use_cache = not args.no_cache
+    if use_cache and not parquet_available():
+        print("\nⓘ pyarrow not installed - cleaned-data cache disabled")
+        use_cache = False
+
+    df = None
+    if use_cache and not args.rebuild_cache:
+        with profile.stage('cache_load') as stage:
+            df = load_cached(path, schema=schema)
+            if df is not None:
+                # Caches written before rows were kept in Date order are sorted here
+                df = sort_by_date(df)
+            stage.rows = None if df is None else len(df)
+        if df is not None:
+            step_banner("STEP 1-2: LOADED CLEANED DATA FROM CACHE")
+            print(f"✓ Cache: {cache_paths(path, schema)[0]}")
+            print(f"✓ Total records: {len(df):,}")
+
+    if df is None:
+        if use_cache and args.rebuild_cache:
+            clear_cache(path)
+        try:
+            with profile.stage('read') as stage:
+                # Keyed on the file as it is before the read, not after
+                key = cache_key(path, schema) if use_cache else None
+                df = load_data(path, all_columns=all_columns, extra_columns=_top_columns(args))
+                stage.rows = len(df)
+        except Exception as e:
+            raise _read_failed(path, e)
+        with profile.stage('clean', rows=len(df)):
+            df = sort_by_date(compact_frame(clean_and_report(df)))
+        if use_cache:
+            try:
+                with profile.stage('cache_save', rows=len(df)) as stage:
+                    save_cache(path, df, schema=schema, key=key)
+                    stage.outputs.append(cache_paths(path, schema)[0])
+                print(f"✓ Cleaned data cached at: {cache_paths(path, schema)[0]}")
+            except Exception as e:
+                print(f"ⓘ Could not write cleaned-data cache: {e}")
+    return df
+
+
+def load_partitions(args, paths, profile, all_columns=False):
+    """
+    STEP 1-2 for a directory or glob: each file read and cleaned (or loaded
+    from its own cache) on a thread pool, then concatenated. `all_columns`
+    is as for load_frame.
+    """
+    all_columns = all_columns or args.all_columns
+    schema = _schema(args, all_columns)
+    use_cache = not args.no_cache and parquet_available()
+    workers = max(1, min(args.read_workers, len(paths)))
+
+    def load(path):
+        if use_cache and not args.rebuild_cache:
+            df = load_cached(path, schema=schema)
+            if df is not None:
+                return df, 'cache'
+        try:
+            if use_cache and args.rebuild_cache:
+                clear_cache(path)
+            key = cache_key(path, schema) if use_cache else None
+            df = read_clean(path, all_columns=all_columns, extra_columns=_top_columns(args))
+        except Exception as e:
+            raise _read_failed(path, e)
+        if not use_cache:
+            return df, 'csv'
+        try:
+            save_cache(path, df, schema=schema, key=key)
+        except Exception as e:
+            return df, f'csv, not cached: {e}'
+        return df, 'csv, cached'
+
+    step_banner(f"STEP 1-2: LOADING {len(paths)} FILES ({workers} thread(s))")
+    with profile.stage('read_partitions') as stage:
+        loaded = read_partitions(paths, load, workers)
+        stage.rows = sum(len(df) for df, _ in loaded)
+    for path, (df, origin) in zip(paths, loaded):
+        print(f"✓ {path}: {len(df):,} rows ({origin})")
+
+    with profile.stage('concat', rows=stage.rows):
+        # Each file is sorted already; overlapping files need one more pass
+        df = sort_by_date(concat_frames([df for df, _ in loaded]))
+    print(f"✓ Total records: {len(df):,}")
+    return df
+
+
+def query_aggregates(args, paths, profile, period=None):
+    """STEP 1-3 on the DuckDB backend: scan the cleaned caches when all are current, else the CSVs."""
+    for path in paths:
+        if not os.path.exists(path):
+            raise _read_failed(path, FileNotFoundError(path))
+    parquet_paths = None
+    if not (args.no_cache or args.rebuild_cache):
+        parquet_paths = [cached_path(path, schema='compact') for path in paths]
+        if None in parquet_paths:
+            parquet_paths = None
+
+    step_banner("STEP 1-3: AGGREGATING WITH DUCKDB")
+    scanned = parquet_paths or paths
+    print(f"✓ Scanning: {scanned[0] if len(scanned) == 1 else f'{len(scanned)} files'}")
+    try:
+        with profile.stage('duckdb') as stage:
+            # Only a saved state needs every Order ID; a report needs the counts
+            agg = duckdb_aggregates(paths, parquet_paths, period=period,
+                                    precision=_precision(args), mergeable=bool(args.state))
+            stage.rows = agg.total_rows
+    except Exception as e:
+        raise _read_failed(args.data, e)
+    print(f"✓ Total records: {agg.total_rows:,}")
+    return agg
+
+
+def answer_questions(agg, stages, save_chart, profile=NullProfile(), period=None):
+    """
+    The questions in `stages` (a stages.plan()), each chart handed to
+    save_chart(name, **tables) as it is ready and each timed as its own
+    profile stage. With a `period` the cube already holds only its rows, so
+    Q3/Q4 cover the period instead of REPORT_YEAR.
+    """
+    scope = {} if period is None else {'year': None, 'label': period.label}
+    if 'monthly' in stages:
+        with profile.stage('monthly'):
+            monthly = questions.monthly_table(agg)
+    if 'q1' in stages:
+        with profile.stage('q1'):
+            questions.q1_monthly(monthly)
+            save_chart('q1', monthly=monthly)
+    if 'q2' in stages:
+        with profile.stage('q2'):
+            highest_orders_month, highest_sales_month = questions.q2_highest_month(monthly)
+            save_chart('q2', monthly=monthly,
+                       highest_orders_month=highest_orders_month['Month'],
+                       highest_sales_month=highest_sales_month['Month'])
+    if 'q3' in stages:
+        with profile.stage('q3'):
+            save_chart('q3', gender_stats=questions.q3_gender(agg, **scope))
+    if 'q4' in stages:
+        with profile.stage('q4'):
+            save_chart('q4', status_stats=questions.q4_order_status(agg, **scope))
+    if 'q5' in stages:
+        with profile.stage('q5'):
+            save_chart('q5', top_states=questions.q5_top_states(agg))
+    if 'q6' in stages:
+        with profile.stage('q6'):
+            age_gender, pivot_orders = questions.q6_age_gender(agg)
+            save_chart('q6', age_gender=age_gender, pivot_orders=pivot_orders)
+    if 'q7' in stages:
+        with profile.stage('q7'):
+            save_chart('q7', channel_stats=questions.q7_channel(agg))
+    if 'q8' in stages:
+        with profile.stage('q8'):
+            save_chart('q8', top_10=questions.q8_categories(agg))
+
+
+def print_top_items(df, sketches):
+    """--top-items: exact totals from the cleaned rows, or the streaming sketches' estimates."""
+    if df is not None:
+        paise = to_paise(df['Amount'])
+        for column in sketches:
+            questions.top_items(column, top_totals(df[column], paise, TOP_ITEMS) / 100)
+        return
+    for column, sketch in sketches.items():
+        if sketch.skipped_rows:
+            print(f"\nⓘ {column}: {sketch.skipped_rows:,} rows with a negative Amount "
+                  f"(₹{sketch.skipped_weight / 100:,.2f}) left out of the estimate")
+        questions.top_items(column, sketch.top(TOP_ITEMS) / 100, sketch.error_bound() / 100)
+
+
+def export_excel(excel_report, df, summary, sheets):
+    """Finish the workbook (on the output writer): any in-memory raw rows, then the summary sheets."""
+    # Raw rows were streamed in earlier; this adds the summary and detailed sheets
+    if df is not None:
+        excel_report.append_raw(df)
+    excel_report.close(summary=summary, sheets=sheets)
+
+
+def output_tables(agg, period=None):
+    """
+    Everything the outputs are drawn from, by name: the chart tables, the
+    console report, the summary report (less its timestamp), the Excel
+    sheets and the state digest (unless distinct orders are only counted).
+    """
+    tables = {} if agg.counted else {'state_digest': state_digest(agg)}
+
+    def collect(name, **kwargs):
+        for key, value in kwargs.items():
+            tables[f'{name}.{key}'] = value
+
+    with contextlib.redirect_stdout(io.StringIO()) as console:
+        answer_questions(agg, plan(), collect, period=period)
+    tables['console'] = console.getvalue()
+    tables['report'] = '\n'.join(line for line in summary_report(agg).splitlines()
+                                  if not line.startswith('Report Generated:'))
+    summary, sheets = excel_tables(agg)
+    tables['excel.Summary'] = summary
+    for sheet, frame in sheets:
+        tables[f'excel.{sheet}'] = frame
+    return tables
+
+
+def _same(expected, actual):
+    """Equal values and labels; dtypes may differ (categorical vs plain labels)."""
+    options = {'check_dtype': False, 'check_categorical': False, 'check_index_type': False}
+    try:
+        if isinstance(expected, pd.DataFrame):
+            pd.testing.assert_frame_equal(expected, actual, check_column_type=False, **options)
+        elif isinstance(expected, pd.Series):
+            pd.testing.assert_series_equal(expected, actual, **options)
+        else:
+            return expected == actual
+    except AssertionError:
+        return False
+    return True
+
+
+def _period(args):
+    """The --period as a periods.Period, or None."""
+    if args.period is None:
+        return None
+    if args.state or args.append:
+        raise CliError("--period cannot be combined with --state or --append "
+                       "(a state holds every row)")
+    try:
+        return parse_period(args.period)
+    except ValueError as e:
+        raise CliError(f"--period: {e}")
+
+
+def check_backends(args):
+    """--check-backends: every backend must produce the tables the pandas path does."""
+    if not duckdb_available():
+        raise CliError("--check-backends needs the duckdb package (pip install duckdb)")
+    step_banner("BACKEND PARITY CHECK")
+    print(f"Data file: {args.data}")
+
+    period = _period(args)
+    try:
+        paths = expand_source(args.data)
+        df = sort_by_date(concat_frames([read_clean(path) for path in paths]))
+    except Exception as e:
+        raise _read_failed(args.data, e)
+    if period is not None:
+        df = df.iloc[DateIndex(df['Date']).rows(period)]
+        if df.empty:
+            raise CliError(f"no rows are dated in {period.label}")
+    candidates = {
+        'duckdb (csv)': lambda: duckdb_aggregates(paths, period=period),
+        'duckdb (csv, state)': lambda: duckdb_aggregates(paths, period=period, mergeable=True),
+    }
+    parquet_paths = [cached_path(path, schema='compact') for path in paths]
+    if None not in parquet_paths:
+        candidates['duckdb (cache)'] = lambda: duckdb_aggregates(paths, parquet_paths, period=period)
+
+    expected = output_tables(build_aggregates(df), period)
+    del df
+    mismatched = []
+    for name, build in candidates.items():
+        tables = output_tables(build(), period)
+        # A cube with counted distinct orders has no state digest; every other table must match
+        compared = [key for key in expected if key in tables or key != 'state_digest']
+        differing = [key for key in compared if not _same(expected[key], tables.get(key))]
+        if differing:
+            mismatched.append(name)
+            print(f"✗ {name}: {len(differing)} of {len(compared)} tables differ: {', '.join(differing)}")
+        else:
+            print(f"✓ {name}: all {len(compared)} tables identical to pandas")
+    if mismatched:
+        raise CliError(f"backend parity check failed for {', '.join(mismatched)}")
+
+
+def _source_signature(source):
+    """(path, size, mtime) per file of `source`: changes when any file is edited, added or removed."""
+    try:
+        paths = expand_source(source)
+    except FileNotFoundError:
+        return ()
+    signature = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            continue
+        signature.append((path, stat.st_size, stat.st_mtime_ns))
+    return tuple(signature)
+
+
+def serve_data(args):
+    """--serve: keep the cleaned data warm and answer JSON queries on localhost."""
+    if args.period:
+        raise CliError("--serve takes the period per query (period=...), not --period")
+    for option, used in (('--chunksize', args.chunksize), ('--state', args.state),
+                         ('--append', args.append), ('--backend duckdb', args.backend == 'duckdb')):
+        if used:
+            raise CliError(f"--serve keeps the cleaned rows in memory and cannot use {option}")
+    if args.cache_size < 1:
+        raise CliError("--cache-size must be at least 1")
+    if not MIN_PRECISION <= args.hll_precision <= MAX_PRECISION:
+        raise CliError(f"--hll-precision must be {MIN_PRECISION}-{MAX_PRECISION}")
+
+    def load():
+        try:
+            paths = expand_source(args.data)
+        except FileNotFoundError as e:
+            raise _read_failed(args.data, e)
+        if len(paths) > 1:
+            return load_partitions(args, paths, NullProfile())
+        return load_frame(args, paths[0], NullProfile())
+
+    service = AnalyticsService(load, lambda: _source_signature(args.data),
+                               precision=_precision(args), cache_size=args.cache_size)
+    print(f"✓ Warm data: {len(service.df):,} rows")
+    try:
+        serve(service, args.serve)
+    except OSError as e:
+        raise CliError(f"cannot serve on port {args.serve}: {e}")
+
+
+def run_job(args, job):
+    """
+    --batch worker: run the analysis for one BatchJob with the batch's
+    options, logging the console to <output>/run.log; returns store_tables().
+    """
+    warnings.filterwarnings('ignore')
+    job_args = argparse.Namespace(**vars(args))
+    job_args.data, job_args.output, job_args.batch = job.data, job.output, None
+    # The batch already keeps every core busy with one job per worker
+    job_args.chart_workers = job_args.agg_workers = 1
+    os.makedirs(job.output, exist_ok=True)
+    with open(os.path.join(job.output, 'run.log'), 'w', encoding='utf-8') as log, \
+            contextlib.redirect_stdout(log):
+        try:
+            agg = run(job_args)
+        except CliError as e:
+            print(f"\n❌ ERROR: {e}\n")
+            raise
+    return store_tables(agg)
+
+
+def run_batch_manifest(args):
+    """--batch: every manifest job on warm worker processes, then the comparison workbook."""
+    for option, used in (('--state', args.state), ('--append', args.append),
+                         ('--serve', args.serve is not None)):
+        if used:
+            raise CliError(f"--batch cannot be combined with {option}")
+    if args.batch_workers < 1:
+        raise CliError("--batch-workers must be at least 1")
+    try:
+        jobs = read_manifest(args.batch)
+    except (OSError, ValueError) as e:
+        raise CliError(f"--batch: {e}")
+    if not jobs:
+        raise CliError(f"--batch: {args.batch} lists no jobs")
+
+    workers = min(args.batch_workers, len(jobs))
+    step_banner(f"BATCH: {len(jobs)} JOBS ON {workers} WORKER(S)")
+    results = {}
+    for job, result in run_batch(jobs, functools.partial(run_job, args), workers,
+                                 charts=not args.no_charts):
+        results[job.name] = result
+        if result['tables'] is None:
+            print(f"✗ {job.name}: {result['status']} (log: {os.path.join(job.output, 'run.log')})")
+        else:
+            print(f"✓ {job.name}: {result['tables']['rows']:,} rows in {result['seconds']:.1f}s "
+                  f"-> {job.output}/")
+
+    os.makedirs(args.output, exist_ok=True)
+    # Manifest order, whatever order the jobs finished in
+    path = write_comparison(os.path.join(args.output, WORKBOOK_NAME),
+                            {job.name: results[job.name] for job in jobs})
+    print(f"\n✓ Comparison workbook: {path}")
+    failed = [name for name, result in results.items() if result['tables'] is None]
+    if failed:
+        raise CliError(f"{len(failed)} of {len(jobs)} batch job(s) failed: {', '.join(failed)}")
+
+
+def run(args):
+    if args.append and not args.state:
+        raise CliError("--append needs --state to merge into")
+    if args.backend == 'duckdb':
+        if not duckdb_available():
+            raise CliError("--backend duckdb needs the duckdb package (pip install duckdb)")
+        for option, used in (('--chunksize', args.chunksize), ('--memory-report', args.memory_report),
+                             ('--all-columns', args.all_columns), ('--top-items', args.top_items),
+                             ('--agg-workers', args.agg_workers > 1)):
+            if used:
+                raise CliError(f"{option} only applies to the pandas backend")
+    if args.append and args.top_items:
+        raise CliError("--top-items needs the rows, which --append does not re-read")
+    if args.sketch_size < 1:
+        raise CliError("--sketch-size must be at least 1")
+    if args.agg_workers < 1:
+        raise CliError("--agg-workers must be at least 1")
+    if args.agg_workers > 1 and (args.chunksize or args.append):
+        raise CliError("--agg-workers shards the in-memory rows; it cannot be combined "
+                       "with --chunksize or --append")
+    if not MIN_PRECISION <= args.hll_precision <= MAX_PRECISION:
+        raise CliError(f"--hll-precision must be {MIN_PRECISION}-{MAX_PRECISION}")
+    try:
+        stages = plan(parse_targets(args.only))
+    except ValueError as e:
+        raise CliError(f"--only: {e}")
+    period = _period(args)
+
+    os.makedirs(args.output, exist_ok=True)
+    print("Saving files to:", args.output)
+
+    if args.profile or args.cprofile:
+        profile = RunProfile(cprofile_dir=os.path.join(args.output, 'profile') if args.cprofile else None)
+    else:
+        profile = NullProfile()
+
+    print("\n" + "="*60)
+    print("VRINDA STORE DATA ANALYSIS")
+    print("Termux Optimized Version")
+    print("="*60)
+
+    print(f"\nLooking for data file at: {args.data}")
+
+    paths = []
+    if not args.append:
+        try:
+            paths = expand_source(args.data)
+        except FileNotFoundError as e:
+            raise _read_failed(args.data, e)
+        if args.memory_report and len(paths) > 1:
+            raise CliError("--memory-report needs a single CSV")
+
+    # A partitioned source skips the files outside the --period, or outside
+    # REPORT_YEAR when only Q3/Q4 are asked for (not when saving a state,
+    # which must hold every row)
+    needed = period
+    if needed is None and year_scoped(stages) and not args.state:
+        needed = parse_period(str(questions.REPORT_YEAR))
+    if is_partitioned(args.data) and paths and needed is not None:
+        with profile.stage('prune'):
+            kept = prune(paths, needed)
+        print(f"ⓘ Only {needed.label} is needed: reading {len(kept)} of {len(paths)} file(s)")
+        if not kept:
+            raise CliError(f"no file in {args.data} holds dates in {needed.label}")
+        paths = kept
+
+    if args.top_items:
+        check_top_columns(args, paths)
+
+    # Older rows are not re-read in append mode, and DuckDB never materialises
+    # the cleaned rows, so neither has a full raw export
+    raw_data = 'none' if args.append or args.backend == 'duckdb' else args.raw_data
+    if args.append and args.raw_data != 'none':
+        print("ⓘ Append mode: raw rows are not exported (only summary sheets)")
+    elif args.backend == 'duckdb' and args.raw_data != 'none':
+        print("ⓘ DuckDB backend: raw rows are not exported (only summary sheets)")
+
+    excel_report = None
+    if 'excel' in stages:
+        if raw_data == 'parquet' and not parquet_available():
+            raise CliError("--raw-data parquet requires pyarrow")
+
+        # Opened up front so streaming mode can write raw rows chunk by chunk
+        excel_path = os.path.join(args.output, "vrinda_analysis_report.xlsx")
+        excel_report = ExcelReport(excel_path, raw_data=raw_data)
+    on_chunk = None if excel_report is None else excel_report.append_raw
+    # The raw export keeps every CSV column; only the analysis needs the compact set
+    all_columns = args.all_columns or (excel_report is not None and raw_data != 'none')
+
+    # ========================================================================
+    # STEP 1-3: LOAD, CLEAN AND AGGREGATE
+    # ========================================================================
+
+    df = None
+    sketches = {column: HeavyHitters(args.sketch_size) for column in _top_columns(args)}
+    if args.append:
+        agg = append_aggregates(args, on_chunk, profile)
+    elif args.chunksize:
+        # Streaming mode never holds the full frame
+        try:
+            with profile.stage('stream') as stage:
+                agg = stream_aggregates(paths, args.chunksize, on_chunk=on_chunk, period=period,
+                                        sketches=sketches, precision=_precision(args),
+                                        all_columns=all_columns)
+                stage.rows = agg.total_rows
+        except Exception as e:
+            raise _read_failed(args.data, e)
+    elif args.backend == 'duckdb':
+        agg = query_aggregates(args, paths, profile, period)
+    else:
+        if len(paths) > 1:
+            df = load_partitions(args, paths, profile, all_columns)
+        else:
+            df = load_frame(args, paths[0], profile, all_columns)
+        if args.memory_report:
+            with profile.stage('memory_report', rows=len(df)):
+                print_memory_report(paths[0], df)
+        if period is not None:
+            # Rows are in Date order, so the period is one slice (a view, no copy)
+            with profile.stage('period', rows=len(df)):
+                rows = DateIndex(df['Date']).rows(period)
+                total, df = len(df), df.iloc[rows]
+            print(f"✓ Period {period.label}: rows {rows.start:,}-{rows.stop:,} "
+                  f"({len(df):,} of {total:,})")
+
+        step_banner("STEP 3: BUILDING AGGREGATES")
+        # One grouped scan over the cleaned data; every question, the summary
+        # report and the Excel export below read from this instead of re-grouping df.
+        with profile.stage('aggregate', rows=len(df)):
+            agg = sharded_aggregates(df, args.agg_workers, _precision(args))
+
+    if period is not None and not agg.total_rows:
+        raise CliError(f"no rows are dated in {period.label}")
+
+    if args.state and not args.append:
+        # A full run (re)starts the state from scratch
+        with profile.stage('save_state', rows=agg.total_rows) as stage:
+            rows = agg.total_rows if len(paths) == 1 else None
+            digest = save_state(args.state, agg, [source_record(path, rows) for path in paths])
+            stage.outputs.append(args.state)
+        print(f"✓ Aggregate state saved: {args.state}")
+        print(f"✓ State digest: {digest}")
+
+    print(f"✓ Aggregate cube: {len(agg.base):,} cells from {agg.total_rows:,} rows")
+    if agg.approximate:
+        print(f"✓ Distinct orders: ~{agg.total_orders:,} (HyperLogLog p={agg.precision}, "
+              f"±{agg.order_ids.relative_error:.1%} standard error)")
+
+    # Outputs are written on background threads while the next ones are
+    # computed; every file is renamed into place once complete
+    with OutputWriter() as writer:
+        write_outputs(args, agg, df, stages, period, sketches, excel_report, profile, writer)
+
+    if profile.enabled:
+        path = profile.write(f'{args.output}/run_profile.json',
+                             source=args.data, rows=int(agg.total_rows), options=vars(args))
+        print(f"✓ Run profile saved: {path}")
+    return agg
+
+
+def write_outputs(args, agg, df, stages, period, sketches, excel_report, profile, writer):
+    """Answer the questions and write the charts, summary report and workbook."""
+    if excel_report is not None:
+        # The workbook only needs the cube (and df's raw rows), so it is
+        # written in the background from the start
+        with profile.stage('excel_submit'):
+            summary, sheets = excel_tables(agg)
+            writer.submit(export_excel, excel_report, df, summary, sheets)
+
+    # ========================================================================
+    # QUESTIONS AND CHARTS
+    # ========================================================================
+
+    # Charts are drawn from the small per-question tables, on a process pool
+    # when --chart-workers > 1, while the main process moves on.
+    charted = [] if args.no_charts else [name for name in QUESTIONS if name in stages]
+    renderer = None
+    if charted:
+        # A dashboard is one image, so there is nothing to draw concurrently
+        workers = 1 if args.dashboard else min(args.chart_workers, len(charted))
+        renderer = ChartRenderer(workers=workers, cache=ChartCache(args.output),
+                                 refresh=args.refresh_charts,
+                                 profile=render_profile(args.chart_profile, args.chart_format))
+    dashboard = {}
+
+    def save_chart(name, **tables):
+        """Render chart `name` from `tables` into the output folder."""
+        if renderer is None:
+            return
+        if args.dashboard:
+            dashboard[name] = tables
+            return
+        path = f'{args.output}/{chart_file(name, args.chart_format)}'
+        drawn = renderer.submit(name, path, **tables)
+        profile.output(path)
+        if not drawn:
+            print(f"\n✓ Chart unchanged: {path}")
+        elif renderer.parallel:
+            print(f"\n→ Chart queued: {path}")
+        else:
+            print(f"\n✓ Chart saved: {path} ({renderer.timings[path]:.2f}s)")
+
+    answer_questions(agg, stages, save_chart, profile, period)
+
+    if dashboard:
+        with profile.stage('dashboard') as stage:
+            path = f'{args.output}/{chart_file("dashboard", args.chart_format)}'
+            drawn = renderer.submit_dashboard(path, dashboard)
+            stage.outputs.append(path)
+        if drawn:
+            print(f"\n✓ Dashboard saved: {path} ({renderer.timings[path]:.2f}s)")
+        else:
+            print(f"\n✓ Dashboard unchanged: {path}")
+
+    if sketches:
+        with profile.stage('top_items'):
+            print_top_items(df, sketches)
+
+    # ========================================================================
+    # SUMMARY REPORT
+    # ========================================================================
+
+    if 'report' in stages:
+        questions.section("GENERATING SUMMARY REPORT")
+
+        with profile.stage('report') as stage:
+            report_text = summary_report(agg)
+            writer.write(f'{args.output}/summary_report.txt', report_text)
+            stage.outputs.append(f'{args.output}/summary_report.txt')
+
+        print(report_text)
+
+    if renderer is not None:
+        with profile.stage('charts_wait'):
+            paths = renderer.wait()
+        for path in paths:
+            print(f"✓ Chart saved: {path} ({renderer.timings[path]:.2f}s)")
+        # Seconds spent drawing and saving each chart, where it was drawn
+        profile.note(chart_render_s={os.path.basename(path): round(seconds, 4)
+                                     for path, seconds in renderer.timings.items()})
+
+    # ========================================================================
+    # COMPLETION
+    # ========================================================================
+
+    print("\n" + "="*60)
+    print("✓ ANALYSIS COMPLETED SUCCESSFULLY!")
+    print("="*60)
+    print(f"\nAll outputs saved in: {args.output}/")
+    if args.dashboard:
+        generated = [chart_file('dashboard', args.chart_format)] if charted else []
+    else:
+        generated = [chart_file(name, args.chart_format) for name in charted]
+    if 'report' in stages:
+        generated.append('summary_report.txt')
+    if generated:
+        print("\nGenerated Files:")
+        for i, filename in enumerate(generated, 1):
+            print(f"  {i}. {filename}")
+    if charted:
+        print("\nYou can view the images using a file manager or gallery app.")
+    print("="*60 + "\n")
+
+    # ========================================================================
+    # EXPORT FULL ANALYSIS TO EXCEL
+    # ========================================================================
+
+    if excel_report is not None:
+        print("\nGenerating Excel Report...")
+        with profile.stage('excel_wait') as stage:
+            writer.wait()
+            stage.rows = excel_report.raw_rows
+            stage.outputs.append(excel_report.path)
+            if excel_report.sidecar and excel_report.raw_rows:
+                stage.outputs.append(excel_report.sidecar)
+        print(f"Excel report saved successfully at: {excel_report.path}")
+        if excel_report.raw_sheets:
+            print(f"  Raw data: {excel_report.raw_rows:,} rows in sheet(s) {', '.join(excel_report.raw_sheets)}")
+        elif excel_report.sidecar and excel_report.raw_rows:
+            print(f"  Raw data: {excel_report.raw_rows:,} rows in {excel_report.sidecar}")
+
+
+def main(argv=None):
+    """Run the analysis with command-line arguments `argv`; returns the exit status."""
+    warnings.filterwarnings('ignore')
+    args = build_parser().parse_args(argv)
+    try:
+        if args.check_backends:
+            check_backends(args)
+        elif args.batch:
+            run_batch_manifest(args)
+        elif args.serve is not None:
+            serve_data(args)
+        else:
+            run(args)
+    except CliError as e:
+        print(f"\n❌ ERROR: {e}\n")
+        return 1
+    return 0
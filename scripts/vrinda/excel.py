@@ -0,0 +1,245 @@
+"""
+Streaming Excel export for the Vrinda Store analysis
+
+pd.ExcelWriter with openpyxl builds the whole workbook in memory before
+saving, and the Cleaned_Data sheet (one Excel row per CSV row) dominates
+both its size and its runtime. ExcelReport writes through openpyxl's
+write-only mode instead: rows are streamed to disk as they are appended,
+so memory stays flat whatever the row count.
+
+Raw rows go to one of:
+  'sheet'   - Cleaned_Data, continued on Cleaned_Data_2, _3, ... past Excel's
+              1,048,576-row limit
+  'csv'     - a gzip-compressed CSV next to the workbook
+  'parquet' - a Parquet file next to the workbook (requires pyarrow)
+  'none'    - not exported
+The summary sheets are identical in every mode.
+"""
+
+import gzip
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+from vrinda.writer import atomic_path
+
+RAW_DATA_MODES = ('sheet', 'csv', 'parquet', 'none')
+
+# Rows per worksheet, header included
+EXCEL_MAX_ROWS = 1_048_576
+
+RAW_SHEET_NAME = "Cleaned_Data"
+
+# Same datetime format pandas uses for to_excel
+DATETIME_FORMAT = 'YYYY-MM-DD HH:MM:SS'
+
+# Rows converted to Python objects at a time while streaming a frame
+WRITE_BATCH_ROWS = 50_000
+
+
+def sidecar_path(excel_path, mode):
+    """Raw-data sidecar file written next to the workbook for `mode`."""
+    stem = os.path.splitext(excel_path)[0]
+    return {'csv': f"{stem}_raw.csv.gz", 'parquet': f"{stem}_raw.parquet"}.get(mode)
+
+
+def _cell_rows(frame):
+    """Yield rows of plain Python values (NaN/NaT -> empty cell)."""
+    for start in range(0, len(frame), WRITE_BATCH_ROWS):
+        batch = frame.iloc[start:start + WRITE_BATCH_ROWS]
+        values = batch.astype(object).where(batch.notna(), None)
+        yield from values.itertuples(index=False, name=None)
+
+
+def _parquet_schema(frame):
+    """
+    The sidecar's Parquet schema, fixed from the first block's dtypes:
+    strings for labels, float64 for numbers (int in one block may be float
+    in the next). A column that is empty in the first block says nothing
+    about its type and is typed as string, which any later value casts to.
+    """
+    import pyarrow as pa
+
+    fields = []
+    for col in frame.columns:
+        series = frame[col]
+        if pd.api.types.is_datetime64_any_dtype(series) or pd.api.types.is_bool_dtype(series):
+            kind = pa.from_numpy_dtype(series.dtype)
+        elif (pd.api.types.is_numeric_dtype(series)
+              and not isinstance(series.dtype, pd.CategoricalDtype) and series.notna().any()):
+            kind = pa.float64()
+        else:
+            kind = pa.string()
+        fields.append(pa.field(str(col), kind))
+    return pa.schema(fields)
+
+
+def _parquet_frame(frame, schema):
+    """`frame` with every column converted to its type in `schema`."""
+    import pyarrow as pa
+
+    frame = frame.copy()
+    for field in schema:
+        column = frame[field.name]
+        if field.type == pa.string():
+            values = column.astype(object)
+            if pd.api.types.is_numeric_dtype(column) or pd.api.types.is_bool_dtype(column):
+                values = values.where(values.isna(), values.astype(str))
+            frame[field.name] = values
+        elif field.type == pa.float64():
+            frame[field.name] = column.astype(np.float64)
+    return frame
+
+
+class ExcelReport:
+    """
+    Write-only workbook: the Summary sheet first, then raw rows as they
+    arrive, then the remaining summary sheets on close().
+
+    The workbook is saved under a temporary name and renamed into place,
+    so an interrupted run never leaves a truncated report behind.
+    """
+
+    def __init__(self, path, raw_data='sheet', max_rows=EXCEL_MAX_ROWS):
+        from openpyxl import Workbook
+
+        if raw_data not in RAW_DATA_MODES:
+            raise ValueError(f"raw_data must be one of {RAW_DATA_MODES}, got {raw_data!r}")
+        self.path = path
+        self.raw_data = raw_data
+        self.max_rows = max_rows
+        self.raw_rows = 0
+        self.raw_sheets = []
+
+        self._workbook = Workbook(write_only=True)
+        # Created now so it stays the first sheet; filled in on close()
+        self._summary = self._workbook.create_sheet("Summary")
+        self._raw_sheet = None
+        self._raw_sheet_rows = 0
+        self._raw_columns = None
+        self._datetime_columns = ()
+
+        self.sidecar = sidecar_path(path, raw_data)
+        self._csv_file = None
+        self._parquet_writer = None
+        # atomic_path() of the sidecar while it is written; see _open_sidecar
+        self._sidecar_tmp = None
+        self._parquet_schema = None
+
+    # ------------------------------------------------------------------
+    # Raw rows
+    # ------------------------------------------------------------------
+
+    def append_raw(self, frame):
+        """Stream a block of cleaned rows to the raw-data destination."""
+        if self.raw_data == 'none' or frame is None or frame.empty:
+            return
+        if self._raw_columns is None:
+            self._raw_columns = list(frame.columns)
+            self._datetime_columns = tuple(
+                i for i, col in enumerate(frame.columns)
+                if pd.api.types.is_datetime64_any_dtype(frame[col]))
+        frame = frame[self._raw_columns]
+
+        if self.raw_data == 'sheet':
+            self._append_sheet_rows(frame)
+        elif self.raw_data == 'csv':
+            self._append_csv(frame)
+        else:
+            self._append_parquet(frame)
+        self.raw_rows += len(frame)
+
+    def _new_raw_sheet(self):
+        number = len(self.raw_sheets) + 1
+        name = RAW_SHEET_NAME if number == 1 else f"{RAW_SHEET_NAME}_{number}"
+        self._raw_sheet = self._workbook.create_sheet(name)
+        self._raw_sheet.append(self._raw_columns)
+        self._raw_sheet_rows = 1
+        self.raw_sheets.append(name)
+
+    def _append_sheet_rows(self, frame):
+        from openpyxl.cell import WriteOnlyCell
+
+        for row in _cell_rows(frame):
+            if self._raw_sheet is None or self._raw_sheet_rows >= self.max_rows:
+                self._new_raw_sheet()
+            if self._datetime_columns:
+                row = list(row)
+                for i in self._datetime_columns:
+                    if row[i] is not None:
+                        cell = WriteOnlyCell(self._raw_sheet, value=row[i])
+                        cell.number_format = DATETIME_FORMAT
+                        row[i] = cell
+            self._raw_sheet.append(row)
+            self._raw_sheet_rows += 1
+
+    def _append_csv(self, frame):
+        if self._csv_file is None:
+            self._csv_file = gzip.open(self._open_sidecar(), 'wt', encoding='utf-8', newline='')
+            frame.to_csv(self._csv_file, index=False)
+        else:
+            frame.to_csv(self._csv_file, index=False, header=False)
+
+    def _append_parquet(self, frame):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if self._parquet_writer is None:
+            self._parquet_schema = _parquet_schema(frame)
+            self._parquet_writer = pq.ParquetWriter(self._open_sidecar(), self._parquet_schema)
+        table = pa.Table.from_pandas(_parquet_frame(frame, self._parquet_schema),
+                                     schema=self._parquet_schema, preserve_index=False)
+        self._parquet_writer.write_table(table)
+
+    # ------------------------------------------------------------------
+    # Summary sheets
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _write_frame(sheet, frame):
+        sheet.append([str(col) for col in frame.columns])
+        for row in _cell_rows(frame):
+            sheet.append(row)
+
+    def close(self, summary, sheets):
+        """
+        Fill in the Summary sheet, add the analysis sheets and save.
+
+        summary - the Summary sheet frame
+        sheets  - (sheet name, frame) pairs written after the raw data
+        """
+        self._write_frame(self._summary, summary)
+        for name, frame in sheets:
+            self._write_frame(self._workbook.create_sheet(name), frame)
+
+        try:
+            with atomic_path(self.path) as tmp_path:
+                self._workbook.save(tmp_path)
+        except BaseException:
+            self._close_sidecar(keep=False)
+            raise
+        self._close_sidecar(keep=True)
+
+    def _open_sidecar(self):
+        """Temporary path the sidecar is written to until close()."""
+        self._sidecar_tmp = atomic_path(self.sidecar)
+        return self._sidecar_tmp.__enter__()
+
+    def _close_sidecar(self, keep):
+        """Close the sidecar writer, then rename it into place (keep) or remove it."""
+        if self._sidecar_tmp is None:
+            return
+        tmp, self._sidecar_tmp = self._sidecar_tmp, None
+        handle = self._csv_file or self._parquet_writer
+        self._csv_file = self._parquet_writer = None
+        try:
+            handle.close()
+        except BaseException:
+            tmp.__exit__(*sys.exc_info())
+            raise
+        if keep:
+            tmp.__exit__(None, None, None)
+        else:
+            tmp.__exit__(RuntimeError, RuntimeError("workbook not saved"), None)
@@ -0,0 +1,217 @@
+"""
+HyperLogLog distinct counting of Order IDs
+
+The exact distinct-order counts keep every Order ID hash: once overall and
+once per (Year, value) of each cube dimension, which is most of the cube's
+memory and of a saved state's size. A HyperLogLog sketch replaces such a
+set with 2**precision one-byte registers, whatever the number of orders,
+and two sketches merge by taking the register-wise maximum. The result is
+the same whichever way the rows were split into chunks, files or days.
+
+The relative standard error is about 1.04 / sqrt(2**precision): 1.6% at
+precision 12 (4 KB per sketch), 0.8% at 14 (16 KB) and 0.4% at 16 (64 KB).
+Estimates use Ertl's improved raw estimator ("New cardinality estimation
+algorithms for HyperLogLog sketches", 2017), which needs no empirical bias
+tables and is accurate from a handful of orders up to billions.
+
+Registers are fed the 64-bit hashes from aggregates.hash_ids(), so a sketch
+and the exact path see the same Order IDs.
+"""
+
+import math
+
+import numpy as np
+import pandas as pd
+
+MIN_PRECISION = 4
+MAX_PRECISION = 18
+DEFAULT_PRECISION = 14
+
+_MAGIC = b'HLL1'
+
+
+def _check_precision(precision):
+    if not MIN_PRECISION <= precision <= MAX_PRECISION:
+        raise ValueError(f"HyperLogLog precision must be {MIN_PRECISION}-{MAX_PRECISION}, "
+                         f"got {precision}")
+
+
+def _bit_length(values):
+    """Bit length of each uint64 in `values`."""
+    values = values.copy()
+    length = np.zeros(values.shape, dtype=np.uint8)
+    for shift in (32, 16, 8, 4, 2, 1):
+        big = values >= (np.uint64(1) << np.uint64(shift))
+        length[big] += shift
+        values[big] >>= np.uint64(shift)
+    return length + (values > 0)
+
+
+def register_updates(hashes, precision):
+    """(register index, rank) per 64-bit hash."""
+    hashes = np.asarray(hashes, dtype=np.uint64)
+    q = 64 - precision
+    index = (hashes >> np.uint64(q)).astype(np.intp)
+    rest = hashes & np.uint64((1 << q) - 1)
+    # Position of the first 1-bit in the remaining q bits (q + 1 if none)
+    rank = (q + 1 - _bit_length(rest)).astype(np.uint8)
+    return index, rank
+
+
+def _sigma(x):
+    if x == 1.0:
+        return math.inf
+    y, z = 1.0, x
+    while True:
+        x *= x
+        previous = z
+        z += x * y
+        y += y
+        if z == previous:
+            return z
+
+
+def _tau(x):
+    if x == 0.0 or x == 1.0:
+        return 0.0
+    y, z = 1.0, 1.0 - x
+    while True:
+        x = math.sqrt(x)
+        previous = z
+        y *= 0.5
+        z -= (1.0 - x) ** 2 * y
+        if z == previous:
+            return z / 3
+
+
+def estimate(registers, precision):
+    """Cardinality estimate for one row of registers."""
+    m = 1 << precision
+    q = 64 - precision
+    counts = np.bincount(registers, minlength=q + 2)
+    z = m * _tau(1.0 - counts[q + 1] / m)
+    for k in range(q, 0, -1):
+        z = 0.5 * (z + counts[k])
+    z += m * _sigma(counts[0] / m)
+    return m * m / (2 * math.log(2)) / z
+
+
+class HyperLogLog:
+    """A mergeable, serializable distinct counter of 64-bit hashes."""
+
+    def __init__(self, precision=DEFAULT_PRECISION, registers=None):
+        _check_precision(precision)
+        self.precision = precision
+        if registers is None:
+            registers = np.zeros(1 << precision, dtype=np.uint8)
+        self.registers = registers
+
+    @property
+    def relative_error(self):
+        """Relative standard error of count()."""
+        return 1.04 / math.sqrt(1 << self.precision)
+
+    def add(self, hashes, updates=None):
+        """Add an array of 64-bit hashes (or their register_updates()); returns self."""
+        index, rank = updates or register_updates(hashes, self.precision)
+        np.maximum.at(self.registers, index, rank)
+        return self
+
+    def merge(self, other):
+        """A new sketch of the union of both streams."""
+        if other.precision != self.precision:
+            raise ValueError(f"cannot merge HyperLogLog precision {self.precision} "
+                             f"with {other.precision}")
+        return HyperLogLog(self.precision, np.maximum(self.registers, other.registers))
+
+    def count(self):
+        """Estimated number of distinct hashes added."""
+        return int(round(estimate(self.registers, self.precision)))
+
+    def to_bytes(self):
+        return _MAGIC + bytes([self.precision]) + self.registers.tobytes()
+
+    @classmethod
+    def from_bytes(cls, data):
+        if data[:len(_MAGIC)] != _MAGIC:
+            raise ValueError("not a serialized HyperLogLog")
+        precision = data[len(_MAGIC)]
+        registers = np.frombuffer(data, dtype=np.uint8, offset=len(_MAGIC) + 1).copy()
+        if len(registers) != 1 << precision:
+            raise ValueError("truncated HyperLogLog")
+        return cls(precision, registers)
+
+
+def _group_codes(keys):
+    """(code per row, key frame with one row per code) for the rows of `keys`."""
+    codes = keys.groupby(list(keys.columns), observed=True, dropna=False, sort=False) \
+        .ngroup().to_numpy()
+    first = np.unique(codes, return_index=True)[1]
+    return codes, keys.iloc[first].reset_index(drop=True)
+
+
+def _plain(keys):
+    """Keys as float64 numbers or plain labels, so tables from differently typed chunks align."""
+    return pd.DataFrame({col: keys[col].to_numpy(
+        dtype=np.float64 if pd.api.types.is_numeric_dtype(keys[col].dtype)
+        and not isinstance(keys[col].dtype, pd.CategoricalDtype) else object)
+        for col in keys.columns})
+
+
+class HyperLogLogTable:
+    """
+    One HyperLogLog per row of `keys` (e.g. per (Year, ship-state)): the
+    approximate counterpart of Aggregates.distinct[dim].
+    """
+
+    def __init__(self, keys, registers, precision):
+        self.keys = keys
+        self.registers = registers
+        self.precision = precision
+
+    @classmethod
+    def from_hashes(cls, keys, hashes, precision=DEFAULT_PRECISION, updates=None):
+        """
+        Sketch the hashes of each distinct key row (`keys` is aligned with
+        `hashes`). `updates` may pass register_updates(hashes, precision)
+        when several tables are built from the same hashes.
+        """
+        _check_precision(precision)
+        index, rank = updates or register_updates(hashes, precision)
+        return cls.from_updates(keys, index, rank, precision)
+
+    @classmethod
+    def from_updates(cls, keys, index, rank, precision=DEFAULT_PRECISION):
+        """Sketches from (register index, rank) updates, one per row of `keys`."""
+        _check_precision(precision)
+        codes, unique_keys = _group_codes(keys.reset_index(drop=True))
+        registers = np.zeros((len(unique_keys), 1 << precision), dtype=np.uint8)
+        np.maximum.at(registers, (codes, index), rank)
+        return cls(_plain(unique_keys), registers, precision)
+
+    @classmethod
+    def merge_all(cls, tables):
+        """Union of the sketches with equal keys across `tables`."""
+        tables = list(tables)
+        precision = tables[0].precision
+        if any(table.precision != precision for table in tables):
+            raise ValueError("cannot merge HyperLogLog tables of different precision")
+        codes, unique_keys = _group_codes(
+            pd.concat([table.keys for table in tables], ignore_index=True))
+        registers = np.zeros((len(unique_keys), 1 << precision), dtype=np.uint8)
+        np.maximum.at(registers, codes, np.concatenate([table.registers for table in tables]))
+        return cls(unique_keys, registers, precision)
+
+    def counts(self, column, year=None):
+        """Estimated distinct hashes per value of `column`, over every Year or one `year`."""
+        keys, registers = self.keys, self.registers
+        if year is not None:
+            rows = (keys['Year'] == year).to_numpy()
+            keys, registers = keys[rows], registers[rows]
+        # Fold the per-Year sketches of each value together
+        codes, values = _group_codes(keys[[column]])
+        folded = np.zeros((len(values), registers.shape[1]), dtype=np.uint8)
+        np.maximum.at(folded, codes, registers)
+        estimates = [int(round(estimate(row, self.precision))) for row in folded]
+        counts = pd.Series(estimates, index=values[column], dtype=np.int64)
+        return counts[counts.index.notna()]
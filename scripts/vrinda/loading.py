@@ -0,0 +1,128 @@
+"""
+STEP 1-3 of the Vrinda Store analysis: load, clean and aggregate
+
+Each function prints the same progress lines the analysis always has and
+returns its result; errors (a missing CSV, a bad file) propagate to the
+caller, which decides whether to exit.
+"""
+
+import pandas as pd
+
+from vrinda.aggregates import AggregateAccumulator, build_aggregates, to_paise
+from vrinda.cleaning import clean_data
+from vrinda.periods import sort_by_date
+from vrinda.schema import column_memory, compact_frame, memory_report, read_csv_options
+
+
+def step_banner(title):
+    print("\n" + "-"*60)
+    print(title)
+    print("-"*60)
+
+
+def load_data(path, all_columns=False, extra_columns=()):
+    """STEP 1: read the CSV into memory with the compact schema (plus `extra_columns`)."""
+    step_banner("STEP 1: LOADING DATA")
+    # Load only the needed columns, label columns as category
+    options = read_csv_options(path, all_columns=all_columns, extra_columns=extra_columns)
+    df = pd.read_csv(path, encoding='utf-8', **options)
+    print(df.columns.tolist())
+
+    # Clean column names
+    df.columns = df.columns.str.strip()
+
+    print(f"✓ Data loaded successfully!")
+    print(f"✓ Total records: {len(df):,}")
+    print(f"✓ Total columns: {len(df.columns)}")
+    return df
+
+
+def read_clean(path, all_columns=False, extra_columns=()):
+    """STEP 1-2 for one file of a partitioned source (sorted by Date), without progress output."""
+    df = pd.read_csv(path, encoding='utf-8', **read_csv_options(path, all_columns=all_columns,
+                                                                extra_columns=extra_columns))
+    df.columns = df.columns.str.strip()
+    return sort_by_date(compact_frame(clean_data(df)))
+
+
+def clean_and_report(df):
+    """STEP 2: apply the cleaning rules and print what they produced."""
+    step_banner("STEP 2: CLEANING DATA")
+
+    clean_data(df)
+
+    print("\n1. Standardizing Gender...")
+    print(f"   ✓ Gender values: {df['Gender'].value_counts().to_dict()}")
+    print("\n2. Converting Date column...")
+    print(f"   ✓ Date range: {df['Date'].min()} to {df['Date'].max()}")
+    print("\n3. Cleaning Amount column...")
+    print(f"   ✓ Amount range: ₹{df['Amount'].min():,.0f} to ₹{df['Amount'].max():,.0f}")
+    print("\n4. Standardizing Status...")
+    print(f"   ✓ Statuses: {df['Status'].unique()}")
+    print("\n5. Standardizing Channel...")
+    print(f"   ✓ Channels: {df['Channel'].unique()}")
+    print("\n6. Creating Age Groups...")
+    print(f"   ✓ Age groups: {df['Age_Group'].value_counts().to_dict()}")
+    print("\n7. Standardizing State names...")
+    print(f"   ✓ Total states: {df['ship-state'].nunique()}")
+
+    print("\n✓ DATA CLEANING COMPLETED!")
+    return df
+
+
+def stream_aggregates(paths, chunksize, on_chunk=None, period=None, sketches=None,
+                      precision=None, all_columns=False):
+    """
+    STEP 1-3 in streaming mode: clean and aggregate one chunk at a time.
+
+    `paths` is a CSV path or a list of them, streamed one after another.
+    With `period` only rows dated inside it are kept (chunks arrive in file
+    order, so this is a mask rather than a slice). on_chunk, if given, is
+    called with every cleaned chunk (the Excel export uses it to stream
+    raw rows). `sketches` maps column names to topn.HeavyHitters that are
+    fed each chunk's sales in paise. With a HyperLogLog `precision` distinct
+    orders are sketched (see build_aggregates). `all_columns` reads every
+    CSV column instead of only the analysis columns.
+    """
+    sketches = sketches or {}
+    paths = [paths] if isinstance(paths, str) else list(paths)
+    step_banner(f"STEP 1-3: STREAMING DATA ({chunksize:,} rows per chunk)")
+    accumulator = AggregateAccumulator()
+    rows = 0
+    for path in paths:
+        options = read_csv_options(path, all_columns=all_columns, extra_columns=list(sketches))
+        for chunk in pd.read_csv(path, encoding='utf-8', chunksize=chunksize, **options):
+            clean_data(chunk)
+            if period is not None:
+                chunk = chunk[period.mask(chunk['Date'])]
+            accumulator.add(build_aggregates(chunk, precision))
+            if sketches:
+                paise = to_paise(chunk['Amount'])
+                for column, sketch in sketches.items():
+                    sketch.update(chunk[column], paise)
+            if on_chunk is not None:
+                on_chunk(chunk)
+            rows += len(chunk)
+            print(f"   ✓ Chunk {accumulator.chunks}: {rows:,} rows processed")
+    print("\n✓ DATA CLEANING COMPLETED!")
+    return accumulator.result()
+
+
+def print_memory_report(path, df):
+    """Per-column memory of `df` against the same CSV read with pandas defaults."""
+    # Reload with pandas defaults purely to measure what the schema saves
+    default_df = pd.read_csv(path, encoding='utf-8')
+    default_df.columns = default_df.columns.str.strip()
+    report_table = memory_report(column_memory(default_df), column_memory(df))
+    del default_df
+    print("\nMemory by column (MB, pandas defaults -> compact schema):")
+    for column, row in report_table.iterrows():
+        after = "not loaded" if row['after'] == 0 else f"{row['after']/1e6:8.2f}"
+        if pd.isna(row['before']):
+            print(f"   {column:18} {'-':>8} -> {after:>10} (derived)")
+            continue
+        print(f"   {column:18} {row['before']/1e6:8.2f} -> {after:>10} ({row['saved_pct']:5.1f}% saved)")
+    total_before, total_after = report_table['before'].sum(), report_table['after'].sum()
+    print(f"   {'TOTAL':18} {total_before/1e6:8.2f} -> {total_after/1e6:10.2f} "
+          f"({total_before/total_after:.1f}x smaller)")
+
@@ -0,0 +1,147 @@
+"""
+Multi-file (partitioned) input
+
+Exports come as one CSV per month or day, so FILE_PATH may name a single
+CSV, a directory of CSVs or a glob pattern; expand_source() turns it into
+the list of files to read.
+
+Each file's date range comes from its name when the name carries a month
+or day (orders_2022-07.csv, 2022_07_01.csv, 20220701.csv), otherwise from
+the min/max of its parsed Date column. Ranges taken from the data are kept
+in a manifest (.vrinda_cache/partitions.json next to the files, keyed on
+size and mtime) so each file is scanned at most once. prune() uses the
+ranges to drop files outside a requested period before anything is read.
+
+read_partitions() maps a per-file reader over the files on a thread pool;
+pandas' CSV parser releases the GIL while tokenizing, so files are read
+concurrently without copying frames between processes.
+"""
+
+import glob
+import json
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from vrinda.cache import CACHE_DIRNAME
+from vrinda.cleaning import parse_dates
+from vrinda.writer import atomic_write
+
+MANIFEST_NAME = 'partitions.json'
+
+# YYYY-MM or YYYY-MM-DD in a file name ('-', '_' or no separator)
+NAME_DATE = re.compile(r'(?<!\d)((?:19|20)\d{2})[-_]?(0[1-9]|1[0-2])(?:[-_]?(0[1-9]|[12]\d|3[01]))?(?!\d)')
+
+
+def is_partitioned(source):
+    """True when `source` names a directory or a glob pattern rather than one file."""
+    return os.path.isdir(source) or glob.has_magic(source)
+
+
+def expand_source(source):
+    """Sorted CSV paths for a file, directory or glob; FileNotFoundError if none."""
+    if not is_partitioned(source):
+        return [source]
+    pattern = os.path.join(source, '*.csv') if os.path.isdir(source) else source
+    paths = sorted(path for path in glob.glob(pattern) if os.path.isfile(path))
+    if not paths:
+        raise FileNotFoundError(f"no CSV files match {source}")
+    return paths
+
+
+def name_range(path):
+    """(first day, last day) encoded in the file name, or None."""
+    match = NAME_DATE.search(os.path.splitext(os.path.basename(path))[0])
+    if match is None:
+        return None
+    year, month, day = match.groups()
+    try:
+        start = pd.Timestamp(int(year), int(month), int(day or 1))
+    except ValueError:  # e.g. 2022-02-31
+        return None
+    return (start, start) if day else (start, start + pd.offsets.MonthEnd(0))
+
+
+def data_range(path):
+    """(min, max) of the file's parsed Date column; NaT twice when no date parses."""
+    header = pd.read_csv(path, nrows=0, encoding='utf-8').columns
+    date_column = next(col for col in header if str(col).strip() == 'Date')
+    dates = parse_dates(pd.read_csv(path, usecols=[date_column], dtype=str,
+                                    encoding='utf-8')[date_column])
+    return dates.min(), dates.max()
+
+
+class Manifest:
+    """Per-directory record of the date ranges read from the data."""
+
+    def __init__(self):
+        self._folders = {}
+        self._changed = set()
+
+    def _entries(self, folder):
+        if folder not in self._folders:
+            try:
+                with open(os.path.join(folder, CACHE_DIRNAME, MANIFEST_NAME)) as f:
+                    self._folders[folder] = json.load(f)
+            except (OSError, ValueError):
+                self._folders[folder] = {}
+        return self._folders[folder]
+
+    @staticmethod
+    def _key(path):
+        st = os.stat(path)
+        return {'size': st.st_size, 'mtime_ns': st.st_mtime_ns}
+
+    def get(self, path):
+        """The recorded (min, max) for `path`, or None when missing or stale."""
+        folder, name = os.path.split(os.path.abspath(path))
+        entry = self._entries(folder).get(name)
+        if entry is None or any(entry.get(k) != v for k, v in self._key(path).items()):
+            return None
+        return pd.Timestamp(entry['min_date']), pd.Timestamp(entry['max_date'])
+
+    def put(self, path, min_date, max_date):
+        folder, name = os.path.split(os.path.abspath(path))
+        self._entries(folder)[name] = {**self._key(path),
+                                       'min_date': None if pd.isna(min_date) else min_date.isoformat(),
+                                       'max_date': None if pd.isna(max_date) else max_date.isoformat()}
+        self._changed.add(folder)
+
+    def save(self):
+        for folder in self._changed:
+            cache_dir = os.path.join(folder, CACHE_DIRNAME)
+            os.makedirs(cache_dir, exist_ok=True)
+            path = os.path.join(cache_dir, MANIFEST_NAME)
+            atomic_write(path, json.dumps(self._folders[folder], indent=2, sort_keys=True))
+        self._changed.clear()
+
+
+def date_range(path, manifest):
+    """(start, end) of the dates in `path`: from its name, the manifest or a Date scan."""
+    found = name_range(path) or manifest.get(path)
+    if found is None:
+        found = data_range(path)
+        manifest.put(path, *found)
+    return found
+
+
+def prune(paths, period):
+    """The paths whose date range overlaps `period` (a periods.Period)."""
+    manifest = Manifest()
+    kept = []
+    for path in paths:
+        first, last = date_range(path, manifest)
+        if pd.notna(first) and first.normalize() <= period.end and last.normalize() >= period.start:
+            kept.append(path)
+    manifest.save()
+    return kept
+
+
+def read_partitions(paths, read, workers):
+    """[read(path) for path in paths], run on up to `workers` threads."""
+    if workers <= 1 or len(paths) == 1:
+        return [read(path) for path in paths]
+    with ThreadPoolExecutor(max_workers=min(workers, len(paths))) as pool:
+        return list(pool.map(read, paths))
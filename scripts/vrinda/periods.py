@@ -0,0 +1,124 @@
+"""
+Reporting periods and the date-sorted row index
+
+Cleaned frames are kept sorted by Date (rows without a date last), so the
+rows of any period - a year, a quarter, a month or a date range - form one
+contiguous block. DateIndex stores the row offset of every month start;
+rows(period) turns a period into a slice in O(1) for month-aligned bounds
+(a binary search within one month otherwise), and frame.iloc[slice] is a
+view, not a copy.
+
+The CLI's --period restricts every output through this one mechanism: the
+Aggregates cube is built from the period's rows, so Q1-Q8, the summary
+report and the Excel sheets all describe the same period.
+"""
+
+import re
+
+import numpy as np
+import pandas as pd
+
+ONE_DAY = pd.Timedelta(days=1)
+
+_YEAR = re.compile(r'^(\d{4})$')
+_QUARTER = re.compile(r'^(\d{4})-?Q([1-4])$', re.IGNORECASE)
+_MONTH = re.compile(r'^(\d{4})-(\d{1,2})$')
+
+
+class Period:
+    """An inclusive range of whole days with a display label."""
+
+    def __init__(self, start, end, label):
+        self.start = pd.Timestamp(start).normalize()
+        self.end = pd.Timestamp(end).normalize()
+        self.label = label
+        if self.end < self.start:
+            raise ValueError(f"period {label} ends before it starts")
+
+    def __repr__(self):
+        return f"Period({self.label}: {self.start:%Y-%m-%d} to {self.end:%Y-%m-%d})"
+
+    def mask(self, dates):
+        """Boolean mask of `dates` inside the period (for frames not sorted by Date)."""
+        return (dates >= self.start) & (dates < self.end + ONE_DAY)
+
+
+def _bounds(text):
+    """(first day, last day) of a year, quarter, month or single date."""
+    text = text.strip()
+    if match := _YEAR.match(text):
+        year = int(match.group(1))
+        return pd.Timestamp(year, 1, 1), pd.Timestamp(year, 12, 31)
+    if match := _QUARTER.match(text):
+        start = pd.Timestamp(int(match.group(1)), 3 * int(match.group(2)) - 2, 1)
+        return start, start + pd.offsets.QuarterEnd(0)
+    if match := _MONTH.match(text):
+        start = pd.Timestamp(int(match.group(1)), int(match.group(2)), 1)
+        return start, start + pd.offsets.MonthEnd(0)
+    day = pd.Timestamp(text)
+    return day, day
+
+
+def parse_period(text):
+    """
+    A Period from '2022', '2022-Q3', '2022-07', '2022-07-15' or a range
+    'START:END' of any of those (e.g. '2022-07-01:2022-09-30', '2022-03:2022-05').
+    Raises ValueError for anything else.
+    """
+    try:
+        if ':' in text:
+            first, last = text.split(':', 1)
+            return Period(_bounds(first)[0], _bounds(last)[1], text.strip())
+        start, end = _bounds(text)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"cannot read period {text!r}: {e}") from None
+    return Period(start, end, text.strip())
+
+
+def sort_by_date(df):
+    """df with rows in Date order (stable; missing dates last), unchanged if already sorted."""
+    dates = df['Date'].to_numpy()
+    dated = ~np.isnat(dates)
+    count = int(dated.sum())
+    if dated[:count].all() and (np.diff(dates[:count].view(np.int64)) >= 0).all():
+        return df
+    return df.sort_values('Date', kind='stable', na_position='last', ignore_index=True)
+
+
+class DateIndex:
+    """Month -> first row offsets over a frame sorted with sort_by_date()."""
+
+    def __init__(self, dates):
+        values = np.asarray(dates, dtype='datetime64[ns]')
+        # NaT sorts last in numpy too, so its insertion point counts the dated rows
+        self.dated = int(np.searchsorted(values, np.datetime64('NaT', 'ns')))
+        self._dates = values[:self.dated]
+        if self.dated:
+            months = self._dates[[0, -1]].astype('datetime64[M]')
+            self.first_month = months[0]
+            boundaries = np.arange(months[0], months[1] + 2).astype('datetime64[ns]')
+            # month_offsets[i] is the first row of month first_month + i;
+            # the last entry is one past the final dated row
+            self.month_offsets = np.searchsorted(self._dates, boundaries)
+        else:
+            self.first_month = None
+            self.month_offsets = np.zeros(1, dtype=np.int64)
+
+    def _offset(self, day):
+        """Row offset of the first row dated `day` or later."""
+        if not self.dated:
+            return 0
+        day = np.datetime64(day, 'ns')
+        month = int((day.astype('datetime64[M]') - self.first_month).astype(np.int64))
+        if month < 0:
+            return 0
+        if month >= len(self.month_offsets) - 1:
+            return self.dated
+        lo, hi = self.month_offsets[month], self.month_offsets[month + 1]
+        if day == day.astype('datetime64[M]'):
+            return int(lo)
+        return int(lo + np.searchsorted(self._dates[lo:hi], day))
+
+    def rows(self, period):
+        """slice of the rows whose Date falls in `period`."""
+        return slice(self._offset(period.start), self._offset(period.end + ONE_DAY))
@@ -0,0 +1,181 @@
+"""
+Per-stage run instrumentation
+
+RunProfile.stage() wraps one stage of a run (loading, each question, the
+report, the Excel export, ...) and records its wall time, CPU time, peak
+resident memory, rows processed and the bytes of the files it wrote. It can
+also dump a cProfile per stage. write() saves everything as one JSON run
+profile.
+
+Peak memory is the kernel's high-water mark (VmHWM). On Linux the mark is
+reset through /proc/self/clear_refs when a stage starts, so each stage's
+peak is its own; elsewhere the process-lifetime peak is reported. Stages
+are therefore not nested.
+
+NullProfile has the same interface and records nothing, so a run without
+instrumentation only pays for an empty context manager per stage.
+"""
+
+import contextlib
+import json
+import os
+import resource
+import sys
+import time
+from datetime import datetime
+
+from vrinda.writer import atomic_write
+
+
+def _status_kb(field):
+    """A VmXXX field of /proc/self/status in kB, or None off Linux."""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith(field + ':'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def reset_peak():
+    """Reset the kernel's peak-RSS mark (Linux); False when unsupported."""
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+    except OSError:
+        return False
+    return True
+
+
+def peak_kb():
+    """Peak resident memory in kB (since the last reset_peak() on Linux)."""
+    peak = _status_kb('VmHWM')
+    if peak is None:
+        # Process-lifetime peak; kB on Linux, bytes on macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        if sys.platform == 'darwin':
+            peak //= 1024
+    return peak
+
+
+class Stage:
+    """Measurements of one stage; rows and outputs may be filled in by the stage."""
+
+    def __init__(self, name, rows=None):
+        self.name = name
+        self.rows = rows
+        self.outputs = []
+        self.wall_s = self.cpu_s = None
+        self.peak_rss_mb = self.peak_delta_mb = None
+        self.cprofile = None
+
+    def as_dict(self):
+        record = {'stage': self.name, 'wall_s': self.wall_s, 'cpu_s': self.cpu_s,
+                  'peak_rss_mb': self.peak_rss_mb}
+        if self.peak_delta_mb is not None:
+            record['peak_delta_mb'] = self.peak_delta_mb
+        if self.rows is not None:
+            record['rows'] = int(self.rows)
+        if self.outputs:
+            # Sized now rather than at stage end: pooled charts land later
+            record['outputs'] = self.outputs
+            record['output_bytes'] = sum(os.path.getsize(path) for path in self.outputs
+                                         if os.path.exists(path))
+        if self.cprofile:
+            record['cprofile'] = self.cprofile
+        return record
+
+
+class RunProfile:
+    """Collects a Stage per stage() block; see the module docstring."""
+
+    enabled = True
+
+    def __init__(self, cprofile_dir=None):
+        self.stages = []
+        self.cprofile_dir = cprofile_dir
+        self.notes = {}
+        self.per_stage_peak = reset_peak()
+        self._current = None
+        self._peak_kb = 0
+        self._wall = time.perf_counter()
+        self._cpu = time.process_time()
+
+    @contextlib.contextmanager
+    def stage(self, name, rows=None):
+        stage = Stage(name, rows)
+        profiler = None
+        if self.cprofile_dir:
+            import cProfile
+            profiler = cProfile.Profile()
+
+        reset_peak()
+        start_rss = _status_kb('VmRSS')
+        self._current = stage
+        wall, cpu = time.perf_counter(), time.process_time()
+        if profiler is not None:
+            profiler.enable()
+        try:
+            yield stage
+        finally:
+            if profiler is not None:
+                profiler.disable()
+            stage.wall_s = round(time.perf_counter() - wall, 4)
+            stage.cpu_s = round(time.process_time() - cpu, 4)
+            peak = peak_kb()
+            self._peak_kb = max(self._peak_kb, peak)
+            stage.peak_rss_mb = round(peak / 1024, 1)
+            if start_rss is not None and self.per_stage_peak:
+                stage.peak_delta_mb = round(max(peak - start_rss, 0) / 1024, 1)
+            if profiler is not None:
+                os.makedirs(self.cprofile_dir, exist_ok=True)
+                stage.cprofile = os.path.join(
+                    self.cprofile_dir, f"{len(self.stages) + 1:02d}_{stage.name}.prof")
+                profiler.dump_stats(stage.cprofile)
+            self._current = None
+            self.stages.append(stage)
+
+    def output(self, path):
+        """Count `path` as written by the stage that is running."""
+        if self._current is not None:
+            self._current.outputs.append(path)
+
+    def note(self, **fields):
+        """Extra top-level fields for the written profile."""
+        self.notes.update(fields)
+
+    def records(self):
+        return [stage.as_dict() for stage in self.stages]
+
+    def write(self, path, **meta):
+        """Write the run profile (plus `meta` fields) as JSON; returns path."""
+        payload = {
+            'created': datetime.now().isoformat(timespec='seconds'),
+            **meta,
+            'total': {
+                'wall_s': round(time.perf_counter() - self._wall, 4),
+                'cpu_s': round(time.process_time() - self._cpu, 4),
+                'peak_rss_mb': round(max(self._peak_kb, peak_kb()) / 1024, 1),
+            },
+            'stages': self.records(),
+            **self.notes,
+        }
+        return atomic_write(path, json.dumps(payload, indent=2))
+
+
+class NullProfile:
+    """RunProfile stand-in for uninstrumented runs."""
+
+    enabled = False
+
+    @contextlib.contextmanager
+    def stage(self, name, rows=None):
+        yield Stage(name, rows)
+
+    def output(self, path):
+        pass
+
+    def note(self, **fields):
+        pass
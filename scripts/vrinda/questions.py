@@ -0,0 +1,205 @@
+"""
+The eight client questions, answered from the Aggregates cube
+
+Each function prints its section of the console report and returns the
+small tables its chart (and any later question) is drawn from.
+"""
+
+import pandas as pd
+
+from vrinda.cleaning import AGE_LABELS
+from vrinda.timeseries import TimeSeriesIndex
+from vrinda.topn import top_n
+
+MONTH_ORDER = ['January', 'February', 'March', 'April', 'May', 'June',
+               'July', 'August', 'September', 'October', 'November', 'December']
+
+# Q3 and Q4 look at a single year unless the run is restricted to a --period
+REPORT_YEAR = 2022
+
+
+def section(title):
+    print("\n" + "="*60)
+    print(title)
+    print("="*60)
+
+
+def monthly_table(agg):
+    """
+    Orders and sales per year-month with rows, in date order (read by Q1
+    and Q2), from the daily time series. Months are labelled by name, plus
+    the year when the data spans more than one.
+    """
+    monthly = TimeSeriesIndex(agg.daily).resample('M')
+    monthly = monthly[monthly['rows'] > 0]
+    periods = monthly.index
+    names = [MONTH_ORDER[month - 1] for month in periods.month]
+    if len(set(periods.year)) > 1:
+        names = [f"{name} {year}" for name, year in zip(names, periods.year)]
+    return pd.DataFrame({'Month': names,
+                         'Orders': monthly['orders'].to_numpy(),
+                         'Sales': monthly['sales'].to_numpy()})
+
+
+def q1_monthly(monthly):
+    """Q1: print orders against sales for each month of monthly_table()."""
+    section("Q1: COMPARING SALES AND ORDERS BY MONTH")
+
+    print("\nMonthly Summary:")
+    width = max([12] + [len(month) for month in monthly['Month']])
+    for _, row in monthly.iterrows():
+        print(f"{row['Month']:{width}} - Orders: {row['Orders']:5,} | Sales: ₹{row['Sales']:12,.2f}")
+    return monthly
+
+
+def q2_highest_month(monthly):
+    """Q2: (highest-orders row, highest-sales row) of monthly_table()."""
+    section("Q2: MONTH WITH HIGHEST SALES AND ORDERS")
+
+    highest_orders_month = monthly.loc[monthly['Orders'].idxmax()]
+    highest_sales_month = monthly.loc[monthly['Sales'].idxmax()]
+
+    print(f"\n📊 HIGHEST ORDERS:")
+    print(f"   Month: {highest_orders_month['Month']}")
+    print(f"   Total Orders: {highest_orders_month['Orders']:,}")
+
+    print(f"\n💰 HIGHEST SALES:")
+    print(f"   Month: {highest_sales_month['Month']}")
+    print(f"   Total Sales: ₹{highest_sales_month['Sales']:,.2f}")
+    return highest_orders_month, highest_sales_month
+
+
+def q3_gender(agg, year=REPORT_YEAR, label=None):
+    """Q3: orders, sales and shares per gender in `year` (all of agg if None), titled `label`."""
+    label = label or year
+    section(f"Q3: GENDER-WISE PURCHASE ANALYSIS ({label})")
+
+    gender_stats = agg.table('Gender', year=year)[['orders', 'sales']].reset_index()
+    gender_stats.columns = ['Gender', 'Orders', 'Sales']
+    gender_stats['Avg_Order_Value'] = gender_stats['Sales'] / gender_stats['Orders']
+    gender_stats['Orders_Pct'] = (gender_stats['Orders'] / gender_stats['Orders'].sum() * 100).round(2)
+    gender_stats['Sales_Pct'] = (gender_stats['Sales'] / gender_stats['Sales'].sum() * 100).round(2)
+
+    print(f"\nGender Statistics ({label}):")
+    for _, row in gender_stats.iterrows():
+        print(f"\n{row['Gender']}:")
+        print(f"  Orders: {row['Orders']:,} ({row['Orders_Pct']}%)")
+        print(f"  Sales: ₹{row['Sales']:,.2f} ({row['Sales_Pct']}%)")
+        print(f"  Avg Order Value: ₹{row['Avg_Order_Value']:,.2f}")
+
+    max_orders = gender_stats.loc[gender_stats['Orders'].idxmax()]
+    print(f"\n👥 MORE ORDERS: {max_orders['Gender']} with {max_orders['Orders']:,} orders")
+    return gender_stats
+
+
+def q4_order_status(agg, year=REPORT_YEAR, label=None):
+    """Q4: orders and sales per order status in `year` (all of agg if None), largest first."""
+    label = label or year
+    section(f"Q4: ORDER STATUS BREAKDOWN ({label})")
+
+    status_stats = agg.table('Status', year=year)[['orders', 'sales']].reset_index()
+    status_stats.columns = ['Status', 'Count', 'Sales']
+    status_stats['Percentage'] = (status_stats['Count'] / status_stats['Count'].sum() * 100).round(2)
+    status_stats = status_stats.sort_values('Count', ascending=False)
+
+    print("\nOrder Status Summary:")
+    for _, row in status_stats.iterrows():
+        print(f"{row['Status']:15} - {row['Count']:6,} orders ({row['Percentage']:5.2f}%) | ₹{row['Sales']:12,.2f}")
+    return status_stats
+
+
+def q5_top_states(agg, n=10):
+    """Q5: the `n` states with the highest sales."""
+    section(f"Q5: TOP {n} STATES BY SALES")
+
+    state_stats = agg.table('ship-state')[['orders', 'sales']].reset_index()
+    state_stats.columns = ['State', 'Orders', 'Sales']
+    state_stats = top_n(state_stats, n, 'Sales')
+    state_stats['Sales_Pct'] = (state_stats['Sales'] / agg.total_sales * 100).round(2)
+
+    print(f"\nTop {n} States:")
+    for i, row in enumerate(state_stats.itertuples(), 1):
+        print(f"{i:2}. {row.State:20} - Orders: {row.Orders:6,} | Sales: ₹{row.Sales:12,.2f} ({row.Sales_Pct}%)")
+    return state_stats
+
+
+def q6_age_gender(agg):
+    """Q6: (long age x gender order counts, age x gender pivot)."""
+    section("Q6: AGE AND GENDER RELATIONSHIP")
+
+    # Keep every age group for both genders (empty cells become 0 orders)
+    age_gender = agg.table(['Age_Group', 'Gender'])[['orders']]
+    age_gender = age_gender.reindex(
+        pd.MultiIndex.from_product(
+            [pd.CategoricalIndex(AGE_LABELS, categories=AGE_LABELS, ordered=True),
+             age_gender.index.get_level_values('Gender').unique().sort_values()],
+            names=['Age_Group', 'Gender']),
+        fill_value=0).reset_index()
+    age_gender.columns = ['Age_Group', 'Gender', 'Orders']
+
+    pivot_orders = age_gender.pivot(index='Age_Group', columns='Gender', values='Orders').fillna(0)
+
+    print("\nOrders by Age Group and Gender:")
+    print(pivot_orders)
+    return age_gender, pivot_orders
+
+
+def q7_channel(agg):
+    """Q7: orders, sales and sales share per channel, best first."""
+    section("Q7: CHANNEL CONTRIBUTION ANALYSIS")
+
+    channel_stats = agg.table('Channel')[['orders', 'sales']].reset_index()
+    channel_stats.columns = ['Channel', 'Orders', 'Sales']
+    channel_stats = channel_stats.sort_values('Sales', ascending=False)
+    channel_stats['Sales_Pct'] = (channel_stats['Sales'] / channel_stats['Sales'].sum() * 100).round(2)
+
+    print("\nChannel Performance:")
+    for _, row in channel_stats.iterrows():
+        print(f"{row['Channel']:12} - Orders: {row['Orders']:6,} | Sales: ₹{row['Sales']:12,.2f} ({row['Sales_Pct']:5.2f}%)")
+
+    top_channel = channel_stats.iloc[0]
+    print(f"\n🏆 TOP CHANNEL: {top_channel['Channel']}")
+    print(f"   Sales: ₹{top_channel['Sales']:,.2f} ({top_channel['Sales_Pct']}%)")
+    return channel_stats
+
+
+def q8_categories(agg, n=10):
+    """Q8: orders, sales and sales share of the `n` best-selling categories, best first."""
+    section("Q8: HIGHEST SELLING CATEGORY")
+
+    category_stats = agg.table('Category')[['orders', 'sales']].reset_index()
+    category_stats.columns = ['Category', 'Orders', 'Sales']
+    total_sales = category_stats['Sales'].sum()
+    category_stats = top_n(category_stats, n, 'Sales')
+    category_stats['Percentage'] = (category_stats['Sales'] / total_sales * 100).round(2)
+
+    print(f"\nTop {n} Categories:")
+    for i, row in enumerate(category_stats.itertuples(), 1):
+        print(f"{i:2}. {row.Category:15} - Orders: {row.Orders:6,} | Sales: ₹{row.Sales:12,.2f} ({row.Percentage}%)")
+
+    top_category = category_stats.iloc[0]
+    print(f"\n🏆 HIGHEST SELLING: {top_category['Category']}")
+    print(f"   Sales: ₹{top_category['Sales']:,.2f} ({top_category['Percentage']}%)")
+    return category_stats
+
+
+def top_items(column, top, error_bound=None):
+    """
+    --top-items: print the values of `column` with the highest sales, from
+    `top` (sales by value, best first). With `error_bound` the figures are
+    streaming-sketch lower bounds, each at most that far below the truth.
+    """
+    if not error_bound:
+        error_bound = None  # the sketch held every value: the totals are exact
+    title = f"TOP {len(top)} {column.upper()} BY SALES"
+    section(title if error_bound is None else f"{title} (STREAMING ESTIMATE)")
+
+    print()
+    for i, (value, sales) in enumerate(top.items(), 1):
+        line = f"{i:2}. {str(value):20} - Sales: ₹{sales:12,.2f}"
+        if error_bound is not None:
+            line += f" to ₹{sales + error_bound:,.2f}"
+        print(line)
+    if error_bound is not None:
+        print(f"\nEach total is at most ₹{error_bound:,.2f} below the true figure; every "
+              f"{column} selling more than that is guaranteed to be tracked.")
@@ -0,0 +1,115 @@
+"""
+Summary report and Excel summary tables for the Vrinda Store analysis
+
+Both are built from the Aggregates cube only, so they come out the same
+whether the cube was built in memory, streamed or merged from a state.
+"""
+
+from datetime import datetime
+
+import pandas as pd
+
+from vrinda.questions import monthly_table
+from vrinda.topn import top_n
+
+
+def summary_report(agg):
+    """The text of summary_report.txt."""
+    report = []
+    report.append("="*60)
+    report.append("VRINDA STORE - SALES ANALYSIS SUMMARY REPORT")
+    report.append("="*60)
+    report.append(f"\nReport Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    report.append(f"Data Period: {agg.min_date.strftime('%Y-%m-%d')} to {agg.max_date.strftime('%Y-%m-%d')}")
+    report.append(f"Total Records: {agg.total_rows:,}")
+
+    report.append("\n" + "-"*60)
+    report.append("KEY METRICS")
+    report.append("-"*60)
+    report.append(f"Total Sales Revenue: ₹{agg.total_sales:,.2f}")
+    report.append(f"Total Orders: {agg.total_rows:,}")
+    report.append(f"Average Order Value: ₹{agg.mean_amount:,.2f}")
+
+    report.append("\n" + "-"*60)
+    report.append("KEY INSIGHTS")
+    report.append("-"*60)
+
+    monthly = monthly_table(agg)
+    best_month = monthly.loc[monthly['Sales'].idxmax()]
+    report.append(f"• Best Month: {best_month['Month']} (₹{best_month['Sales']:,.2f})")
+
+    gender_best = agg.table('Gender')['sales']
+    top_gender = gender_best.idxmax()
+    report.append(f"• Top Gender: {top_gender} ({gender_best.max()/gender_best.sum()*100:.1f}%)")
+
+    channel_best = agg.table('Channel')['sales']
+    top_channel_name = channel_best.idxmax()
+    report.append(f"• Top Channel: {top_channel_name} ({channel_best.max()/channel_best.sum()*100:.1f}%)")
+
+    top_state = top_n(agg.table('ship-state')['sales'], 1)
+    report.append(f"• Top State: {top_state.index[0]} (₹{top_state.iloc[0]:,.2f})")
+
+    top_cat = top_n(agg.table('Category')['sales'], 1)
+    report.append(f"• Top Category: {top_cat.index[0]} (₹{top_cat.iloc[0]:,.2f})")
+
+    delivered = agg.count('Status', 'Delivered')
+    report.append(f"• Success Rate: {delivered/agg.total_rows*100:.1f}%")
+
+    report.append("\n" + "="*60)
+    return "\n".join(report)
+
+
+def excel_tables(agg):
+    """
+    (Summary sheet frame, [(sheet name, frame), ...]) for the Excel report.
+    """
+    def sales_by(dim):
+        """Sales per value of `dim` as a two-column (dim, Amount) frame."""
+        return agg.table(dim)["sales"].rename("Amount").reset_index()
+
+    # Grouped analysis
+    monthly_stats = sales_by("Month")
+    state_stats = sales_by("ship-state").sort_values("Amount", ascending=False)
+    category_stats = sales_by("Category")
+    gender_stats = sales_by("Gender")
+    channel_stats = sales_by("Channel")
+
+    order_status_stats = (
+        agg.table("Status")["rows"]
+        .sort_values(ascending=False)
+        .reset_index()
+    )
+    order_status_stats.columns = ["Status", "Count"]
+
+    # Top values
+    top_channel = channel_stats.set_index("Channel")["Amount"].idxmax()
+    top_state = state_stats.iloc[0]["ship-state"]
+    top_category = category_stats.set_index("Category")["Amount"].idxmax()
+
+    summary = pd.DataFrame({
+        "Metric": [
+            "Total Sales",
+            "Total Orders",
+            "Average Order Value",
+            "Top Channel",
+            "Top State",
+            "Top Category"
+        ],
+        "Value": [
+            agg.total_sales,
+            agg.total_orders,
+            agg.mean_amount,
+            top_channel,
+            top_state,
+            top_category
+        ]
+    })
+    sheets = [
+        ("Monthly_Analysis", monthly_stats),
+        ("State_Analysis", state_stats),
+        ("Category_Analysis", category_stats),
+        ("Gender_Analysis", gender_stats),
+        ("Channel_Analysis", channel_stats),
+        ("Order_Status", order_status_stats),
+    ]
+    return summary, sheets
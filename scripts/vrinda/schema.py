@@ -0,0 +1,126 @@
+"""
+Compact column schema for the Vrinda Store dataset
+
+The raw export has ~20 columns, most of which no question reads, and pandas
+defaults give object strings for every label column and 64-bit numbers for
+the rest. This module:
+
+  * picks only the columns the analysis needs at read time (usecols),
+  * reads the low-cardinality label columns as `category`,
+  * narrows Age, Month, Year and Amount after cleaning, and
+  * reports the memory saved per column.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Columns (after stripping header whitespace) used by Q1-Q8, the summary
+# report and the Excel summary sheets
+ANALYSIS_COLUMNS = ['Order ID', 'Gender', 'Age', 'Date', 'Status',
+                    'Channel', 'Category', 'Amount', 'ship-state']
+
+# Low-cardinality label columns, read straight into `category`
+CATEGORY_COLUMNS = ['Gender', 'Status', 'Channel', 'ship-state', 'Category']
+
+# Columns derived during cleaning that are kept as `category` afterwards
+DERIVED_CATEGORY_COLUMNS = CATEGORY_COLUMNS + ['Month_Name']
+
+
+def csv_columns(path, encoding='utf-8'):
+    """The column names of a CSV's header row, stripped."""
+    return [str(col).strip() for col in pd.read_csv(path, nrows=0, encoding=encoding).columns]
+
+
+def read_csv_options(path, all_columns=False, encoding='utf-8', extra_columns=()):
+    """
+    Keyword arguments for pd.read_csv that apply the compact schema, also
+    reading `extra_columns` (stripped names; ValueError if one is missing).
+
+    The export's headers carry stray whitespace ('Channel '), so the
+    header row is read first to map the stripped names back to the raw
+    ones pandas expects in usecols/dtype.
+    """
+    raw_columns = pd.read_csv(path, nrows=0, encoding=encoding).columns
+    by_name = {str(col).strip(): col for col in raw_columns}
+
+    options = {
+        'dtype': {by_name[name]: 'category'
+                  for name in CATEGORY_COLUMNS if name in by_name},
+    }
+    missing = [name for name in extra_columns if name not in by_name]
+    if missing:
+        raise ValueError(f"column(s) {', '.join(missing)} not found in {path}")
+    if not all_columns:
+        wanted = ANALYSIS_COLUMNS + [name for name in extra_columns if name not in ANALYSIS_COLUMNS]
+        options['usecols'] = [by_name[name] for name in wanted if name in by_name]
+    return options
+
+
+def _narrow_integer(series, int_type):
+    """int_type when the values allow it, else float32 (holds the same integers)."""
+    if series.isna().any():
+        return series.astype(np.float32)
+    return series.astype(int_type)
+
+
+def _narrow_amount(series):
+    """float32 only when every value survives the round trip unchanged."""
+    narrowed = series.astype(np.float32)
+    widened = narrowed.astype(np.float64)
+    same = (widened == series) | (series.isna() & widened.isna())
+    return narrowed if same.all() else series
+
+
+def compact_frame(df):
+    """Convert a cleaned frame to the compact dtypes in place and return it."""
+    for col in DERIVED_CATEGORY_COLUMNS:
+        if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype('category')
+
+    if 'Age' in df.columns:
+        age = pd.to_numeric(df['Age'], errors='coerce')
+        int_type = np.int8 if age.dropna().between(0, 127).all() else np.int16
+        df['Age'] = _narrow_integer(age, int_type)
+    if 'Month' in df.columns:
+        df['Month'] = _narrow_integer(df['Month'], np.int8)
+    if 'Year' in df.columns:
+        df['Year'] = _narrow_integer(df['Year'], np.int16)
+    if 'Amount' in df.columns:
+        df['Amount'] = _narrow_amount(df['Amount'])
+    return df
+
+
+def concat_frames(frames):
+    """
+    Concatenate cleaned frames, keeping label columns categorical: where the
+    frames' categories differ they are first widened to the sorted union
+    (plain pd.concat would fall back to object strings).
+    """
+    frames = list(frames)
+    for col in frames[0].columns:
+        dtypes = [frame[col].dtype for frame in frames]
+        if (all(isinstance(dtype, pd.CategoricalDtype) and not dtype.ordered for dtype in dtypes)
+                and any(dtype != dtypes[0] for dtype in dtypes)):
+            categories = sorted(set().union(*(dtype.categories for dtype in dtypes)))
+            frames = [frame.assign(**{col: frame[col].cat.set_categories(categories)})
+                      for frame in frames]
+    return compact_frame(pd.concat(frames, ignore_index=True))
+
+
+def column_memory(df):
+    """Deep memory usage per column, in bytes."""
+    return df.memory_usage(deep=True, index=False)
+
+
+def memory_report(before, after):
+    """
+    Per-column memory table from two column_memory() snapshots.
+
+    Columns missing from `after` were not loaded at all; columns only in
+    `after` were derived during cleaning (their `before` is NaN).
+    """
+    columns = before.index.append(after.index.difference(before.index))
+    report = pd.DataFrame({'before': before.reindex(columns),
+                           'after': after.reindex(columns, fill_value=0)})
+    report['saved_pct'] = (1 - report['after'] / report['before']) * 100
+    return report
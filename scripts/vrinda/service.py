@@ -0,0 +1,308 @@
+"""
+Local JSON query service (--serve)
+
+Dashboards used to re-run the whole analysis and scrape its outputs.
+AnalyticsService loads and cleans the data once and keeps the cleaned rows
+(sorted by Date, with their DateIndex) and the full Aggregates cube warm.
+It answers HTTP GET requests for any Q1-Q8 table or the summary metrics:
+
+    GET /q5?period=2022-Q3&Channel=Amazon,Myntra&n=5
+    GET /summary?Category=Set
+    GET /health
+
+`period` takes anything --period does. Every other parameter except `n`
+filters a cube dimension to one or more comma-separated values. A filtered
+query slices the sorted rows to the period and masks the rest, then builds
+a cube for it. These cubes, and the JSON of every answer, are memoized in
+size-bounded LRU caches. Before each request the service stats the source
+files; if any file changed, appeared or went away, the data is reloaded and
+both caches are emptied.
+
+The lock covers only that check and the cache lookups and stores: a cache
+miss is built outside it, so concurrent requests do not queue behind one
+another. Cache keys carry the data version, and a result built from data
+that was reloaded in the meantime is returned but not stored.
+
+The server binds to 127.0.0.1 only and is not meant to be exposed.
+"""
+
+import contextlib
+import io
+import json
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+import pandas as pd
+
+from vrinda import questions
+from vrinda.aggregates import DIMENSIONS, build_aggregates
+from vrinda.periods import DateIndex, parse_period
+from vrinda.report import excel_tables, summary_report
+
+HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+
+QUERIES = ('q1', 'q2', 'q3', 'q4', 'q5', 'q6', 'q7', 'q8', 'summary')
+
+# Dimensions a query can filter on (Year/Month are covered by `period`)
+FILTERS = [dim for dim in DIMENSIONS if dim not in ('Year', 'Month')]
+
+
+class QueryError(ValueError):
+    """A request that cannot be answered; `status` is its HTTP status code."""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+class LRUCache:
+    """Mapping of at most `maxsize` entries; the least recently used is evicted first."""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self.hits = self.misses = 0
+
+    def get(self, key):
+        try:
+            self._entries.move_to_end(key)
+        except KeyError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return self._entries[key]
+
+    def put(self, key, value):
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self):
+        return {'entries': len(self._entries), 'maxsize': self.maxsize,
+                'hits': self.hits, 'misses': self.misses}
+
+
+def _plain(value):
+    """JSON-ready version of a question's result (frames become lists of records)."""
+    if isinstance(value, pd.DataFrame):
+        # Named index levels are columns of the answer; positional ones are dropped
+        frame = value.reset_index(drop=all(name is None for name in value.index.names))
+        frame = frame.astype(object).where(frame.notna(), None)
+        return [{str(col): _plain(v) for col, v in row.items()} for _, row in frame.iterrows()]
+    if isinstance(value, pd.Series):
+        return {str(key): _plain(v) for key, v in value.items()}
+    if isinstance(value, dict):
+        return {str(key): _plain(v) for key, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_plain(v) for v in value]
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and np.isnan(value):
+        return None
+    if isinstance(value, (pd.Timestamp, pd.Period)):
+        return str(value)
+    return value
+
+
+def answer(agg, query, period=None, n=10):
+    """The result of `query` (one of QUERIES) on `agg`, as plain JSON data."""
+    scope = {} if period is None else {'year': None, 'label': period.label}
+    # The question functions print their console sections; discard them
+    with contextlib.redirect_stdout(io.StringIO()):
+        if query in ('q1', 'q2'):
+            monthly = questions.monthly_table(agg)
+            if query == 'q1':
+                return _plain(questions.q1_monthly(monthly))
+            orders, sales = questions.q2_highest_month(monthly)
+            return {'highest_orders': _plain(orders), 'highest_sales': _plain(sales)}
+        if query == 'q3':
+            return _plain(questions.q3_gender(agg, **scope))
+        if query == 'q4':
+            return _plain(questions.q4_order_status(agg, **scope))
+        if query == 'q5':
+            return _plain(questions.q5_top_states(agg, n))
+        if query == 'q6':
+            age_gender, _ = questions.q6_age_gender(agg)
+            return _plain(age_gender)
+        if query == 'q7':
+            return _plain(questions.q7_channel(agg))
+        if query == 'q8':
+            return _plain(questions.q8_categories(agg, n))
+    summary, _ = excel_tables(agg)
+    return {
+        'period': [str(agg.min_date.date()), str(agg.max_date.date())],
+        'rows': agg.total_rows,
+        'metrics': dict(zip(summary['Metric'], _plain(summary['Value'].tolist()))),
+        'report': summary_report(agg).splitlines(),
+    }
+
+
+class AnalyticsService:
+    """
+    Warm data plus the query caches. `load()` returns the cleaned frame and
+    `signature()` a value that changes whenever the source data does.
+    """
+
+    def __init__(self, load, signature, precision=None, cache_size=256, cube_cache_size=16):
+        self._load = load
+        self._signature = signature
+        self.precision = precision
+        self.responses = LRUCache(cache_size)
+        self.cubes = LRUCache(cube_cache_size)
+        self._lock = threading.Lock()
+        self.version = 0
+        self.source = None
+        self.df = None
+        self._refresh()
+
+    def _refresh(self):
+        """Reload the data and empty the caches when the source changed."""
+        source = self._signature()
+        if source == self.source:
+            return
+        df = self._load()
+        self.df, self.index, self.agg = df, DateIndex(df['Date']), build_aggregates(df, self.precision)
+        self.source = source
+        self.version += 1
+        self.loaded_at = time.time()
+        self.responses.clear()
+        self.cubes.clear()
+
+    def _snapshot(self):
+        """(version, df, index, agg) of the current data, reloading it if the source changed."""
+        with self._lock:
+            self._refresh()
+            return self.version, self.df, self.index, self.agg
+
+    def _store(self, cache, version, key, value):
+        """Memoize `value` unless the data was reloaded since `version` was read."""
+        with self._lock:
+            if version == self.version:
+                cache.put((version,) + key, value)
+
+    def _cube(self, data, period, filters):
+        """Aggregates of the rows of `data` (a _snapshot) in `period` matching `filters` (memoized)."""
+        version, df, index, agg = data
+        if period is None and not filters:
+            return agg
+        key = (None if period is None else (period.start, period.end), filters)
+        with self._lock:
+            cube = self.cubes.get((version,) + key)
+        if cube is None:
+            df = df if period is None else df.iloc[index.rows(period)]
+            for column, values in filters:
+                df = df[df[column].isin(values)]
+            cube = build_aggregates(df, self.precision)
+            self._store(self.cubes, version, key, cube)
+        return cube
+
+    def health(self):
+        return {'rows': len(self.df), 'version': self.version,
+                'loaded_at': time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(self.loaded_at)),
+                'response_cache': self.responses.stats(), 'cube_cache': self.cubes.stats()}
+
+    def query(self, name, params):
+        """
+        (JSON bytes, cache hit?) for GET /<name>?<params>; `params` maps
+        names to lists of values (urllib.parse.parse_qs). Raises QueryError.
+        """
+        if name not in QUERIES:
+            raise QueryError(f"unknown query {name!r}; choose from {', '.join(QUERIES)}", 404)
+        params = dict(params)
+        period_text = params.pop('period', [None])[-1]
+        try:
+            period = None if period_text is None else parse_period(period_text)
+        except ValueError as e:
+            raise QueryError(str(e)) from None
+        n_text = params.pop('n', ['10'])[-1]
+        if not n_text.strip().isdigit() or int(n_text) < 1:
+            raise QueryError(f"n must be a positive integer, got {n_text!r}")
+        n = int(n_text)
+        unknown = [key for key in params if key not in FILTERS]
+        if unknown:
+            raise QueryError(f"unknown filter(s) {', '.join(unknown)}; choose from {', '.join(FILTERS)}")
+        filters = tuple(sorted((column, tuple(sorted(v for value in values for v in value.split(','))))
+                               for column, values in params.items()))
+
+        data = self._snapshot()
+        version = data[0]
+        key = (name, None if period is None else period.label, n, filters)
+        with self._lock:
+            body = self.responses.get((version,) + key)
+        if body is not None:
+            return body, True
+        agg = self._cube(data, period, filters)
+        if not agg.total_rows:
+            raise QueryError("no rows match the period and filters", 404)
+        result = {'query': name, 'period': None if period is None else period.label,
+                  'filters': {column: list(values) for column, values in filters},
+                  'version': version,
+                  'result': answer(agg, name, period, n)}
+        body = json.dumps(result, ensure_ascii=False).encode('utf-8')
+        self._store(self.responses, version, key, body)
+        return body, False
+
+
+def _handler(service):
+    class Handler(BaseHTTPRequestHandler):
+        def _send(self, status, body, cache=None):
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            if cache is not None:
+                self.send_header('X-Cache', 'hit' if cache else 'miss')
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _error(self, status, message):
+            self._send(status, json.dumps({'error': message}).encode('utf-8'))
+
+        def do_GET(self):
+            url = urlsplit(self.path)
+            name = url.path.strip('/')
+            try:
+                if name in ('', 'health'):
+                    with service._lock:
+                        service._refresh()
+                        info = service.health()
+                    if not name:
+                        info.update(queries=list(QUERIES), filters=FILTERS)
+                    self._send(200, json.dumps(info).encode('utf-8'))
+                    return
+                body, hit = service.query(name, parse_qs(url.query))
+            except QueryError as e:
+                self._error(e.status, str(e))
+                return
+            except Exception as e:
+                self._error(500, f"{type(e).__name__}: {e}")
+                return
+            self._send(200, body, cache=hit)
+
+    return Handler
+
+
+def make_server(service, port=DEFAULT_PORT):
+    """A threaded HTTP server for `service` on 127.0.0.1:`port` (0 picks a free port)."""
+    return ThreadingHTTPServer((HOST, port), _handler(service))
+
+
+def serve(service, port=DEFAULT_PORT):
+    """Serve until interrupted (Ctrl+C)."""
+    server = make_server(service, port)
+    print(f"\n✓ Serving JSON queries on http://{HOST}:{server.server_address[1]}/ "
+          f"({', '.join(QUERIES)}); Ctrl+C to stop")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n✓ Service stopped")
+    finally:
+        server.server_close()
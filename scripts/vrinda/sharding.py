@@ -0,0 +1,55 @@
+"""
+Multi-core aggregation over row shards
+
+Q1-Q8, the summary report and the Excel sheets all read the Aggregates
+cube, so building it is the one grouped scan of the full data, and
+build_aggregates() runs it on a single core. sharded_aggregates() splits the
+cleaned rows into shards and builds a partial cube per shard on a process
+pool. The partial cubes hold only counts, sums, Date min/max and order hash
+sets or sketches, so merge_aggregates() folds them into the cube the
+single-core path produces. Every output is the same.
+
+Rows are sharded by their Order ID hash, so every row of an order falls in
+the same shard. The shards' distinct-order sets are then disjoint and are
+merged by concatenation, without de-duplicating the pairs again.
+
+The workers read the rows through vrinda.shared: the frame is published
+once and each task receives a handle and its shard number, not a pickled
+copy.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from vrinda.aggregates import ORDER_HASH, build_aggregates, merge_aggregates
+from vrinda.shared import attach, publish
+
+# Below this many rows per worker, starting the pool costs more than it saves
+MIN_SHARD_ROWS = 50_000
+
+
+def shard_rows(handle, shard, shards):
+    """Positions of the rows in `shard` (of `shards`); rows without an Order ID go to shard 0."""
+    hashes = attach(handle)[ORDER_HASH].to_numpy(dtype=np.uint64, na_value=0)
+    return np.flatnonzero(hashes % np.uint64(shards) == shard)
+
+
+def _shard_aggregates(handle, shard, shards, precision):
+    return build_aggregates(attach(handle).iloc[shard_rows(handle, shard, shards)], precision)
+
+
+def sharded_aggregates(df, workers, precision=None, shards=None):
+    """
+    build_aggregates(df, precision), computed as `shards` (default
+    `workers`) partial cubes on `workers` processes and merged. Falls back
+    to one process when there are too few rows to be worth splitting.
+    """
+    workers = min(workers, len(df) // MIN_SHARD_ROWS)
+    if workers <= 1:
+        return build_aggregates(df, precision)
+    shards = shards or workers
+    with publish(df) as shared, ProcessPoolExecutor(max_workers=workers) as pool:
+        parts = list(pool.map(_shard_aggregates, [shared.handle] * shards, range(shards),
+                              [shards] * shards, [precision] * shards))
+    return merge_aggregates(parts, disjoint_orders=True)
@@ -0,0 +1,189 @@
+"""
+Shared columnar store for worker processes
+
+Handing the cleaned frame to a process pool pickles every column into every
+worker: the copying and the duplicated memory eat the gains of working in
+parallel. publish() instead writes each column once, as a plain array in a
+.npy file in a private folder on /dev/shm (RAM-backed on Linux; the system
+temp folder elsewhere). It returns a SharedFrame, whose small picklable
+`handle` is what the workers receive. attach(handle) memory-maps the files
+read-only and wraps them in a DataFrame without copying, so every process
+reads the same physical pages.
+
+Columns are stored as:
+  category      - the integer codes; the (few) categories travel in the handle
+  numbers/dates - the values as they are
+  Order ID      - its 64-bit hash (aggregates.hash_ids) as the nullable
+                  UInt64 column ORDER_HASH, which build_aggregates() accepts
+                  in its place
+  anything else - category codes, after pd.factorize
+
+The folder is removed by SharedFrame.close() (or leaving its `with` block),
+when the SharedFrame is garbage collected and at interpreter exit. A process
+killed outright cannot clean up after itself, so publish() first removes any
+folder left behind by a process that is no longer running.
+"""
+
+import os
+import re
+import shutil
+import tempfile
+import weakref
+
+import numpy as np
+import pandas as pd
+
+from vrinda.aggregates import DIMENSIONS, ORDER_HASH, hash_ids
+
+# Columns published by default: everything build_aggregates() reads
+SHARED_COLUMNS = ['Order ID', 'Date', 'Amount', 'Age'] + DIMENSIONS
+
+_PREFIX = 'vrinda-shared-'
+_FOLDER = re.compile(re.escape(_PREFIX) + r'(\d+)-')
+
+# The frame last attached in this process: (folder, frame)
+_attached = (None, None)
+
+
+def _base_dir():
+    shm = '/dev/shm'
+    if os.path.isdir(shm) and os.access(shm, os.W_OK):
+        return shm
+    return tempfile.gettempdir()
+
+
+def _alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def sweep_stale(base_dir=None):
+    """Remove folders published by processes that are no longer running; returns their paths."""
+    if os.name != 'posix':
+        # os.kill(pid, 0) is not a liveness probe elsewhere
+        return []
+    base_dir = base_dir or _base_dir()
+    removed = []
+    for name in os.listdir(base_dir):
+        match = _FOLDER.match(name)
+        if match and not _alive(int(match.group(1))):
+            shutil.rmtree(os.path.join(base_dir, name), ignore_errors=True)
+            removed.append(os.path.join(base_dir, name))
+    return removed
+
+
+def _remove(folder, owner):
+    # Forked children inherit the finalizer; only the publisher removes
+    if os.getpid() == owner:
+        shutil.rmtree(folder, ignore_errors=True)
+
+
+class FrameHandle:
+    """Picklable description of a published frame: its folder, length and column layout."""
+
+    def __init__(self, folder, rows, columns):
+        self.folder = folder
+        self.rows = rows
+        # [(name, kind, extra)]: kind is 'values', 'category' (extra =
+        # (categories, ordered)) or 'nullable' (values plus a mask file)
+        self.columns = columns
+
+    def __repr__(self):
+        return f"FrameHandle({self.folder}: {self.rows:,} rows, {len(self.columns)} columns)"
+
+
+class SharedFrame:
+    """The publisher's side of a shared frame; see publish()."""
+
+    def __init__(self, handle):
+        self.handle = handle
+        self._finalizer = weakref.finalize(self, _remove, handle.folder, os.getpid())
+
+    @property
+    def nbytes(self):
+        """Size of the published arrays."""
+        return sum(entry.stat().st_size for entry in os.scandir(self.handle.folder))
+
+    def close(self):
+        """Remove the published files (attached views stay valid until unmapped)."""
+        self._finalizer()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _write(folder, index, array):
+    np.save(os.path.join(folder, f'{index}.npy'), np.ascontiguousarray(array))
+
+
+def publish(df, columns=None, base_dir=None):
+    """
+    Write `columns` of `df` (default SHARED_COLUMNS, those present) to a
+    new shared folder; returns its SharedFrame.
+    """
+    base_dir = base_dir or _base_dir()
+    sweep_stale(base_dir)
+    names = [name for name in (SHARED_COLUMNS if columns is None else columns) if name in df.columns]
+    folder = tempfile.mkdtemp(prefix=f'{_PREFIX}{os.getpid()}-', dir=base_dir)
+    shared = SharedFrame(FrameHandle(folder, len(df), []))
+    layout = shared.handle.columns
+    try:
+        for index, name in enumerate(names):
+            column = df[name]
+            if name == 'Order ID':
+                has_order = column.notna().to_numpy()
+                _write(folder, index, np.where(has_order, hash_ids(column), np.uint64(0)))
+                _write(folder, f'{index}.mask', ~has_order)
+                layout.append((ORDER_HASH, 'nullable', None))
+            elif isinstance(column.dtype, pd.CategoricalDtype):
+                _write(folder, index, column.cat.codes.to_numpy())
+                layout.append((name, 'category', (column.cat.categories, column.cat.ordered)))
+            elif isinstance(column.dtype, np.dtype) and column.dtype.kind in 'biufM':
+                _write(folder, index, column.to_numpy())
+                layout.append((name, 'values', None))
+            else:
+                codes, categories = pd.factorize(column)
+                dtype = np.int8 if len(categories) < 127 else np.int32
+                _write(folder, index, codes.astype(dtype))
+                layout.append((name, 'category', (categories, False)))
+    except BaseException:
+        shared.close()
+        raise
+    return shared
+
+
+def attach(handle):
+    """
+    The published frame as read-only views of the shared files (no copy).
+    Attaching the same handle again in a process returns the same frame.
+    """
+    global _attached
+    folder, frame = _attached
+    if folder == handle.folder:
+        return frame
+
+    def load(index):
+        return np.load(os.path.join(handle.folder, f'{index}.npy'), mmap_mode='r')
+
+    data = {}
+    for index, (name, kind, extra) in enumerate(handle.columns):
+        values = load(index)
+        if kind == 'category':
+            categories, ordered = extra
+            data[name] = pd.Categorical.from_codes(values, categories, ordered=ordered,
+                                                   validate=False)
+        elif kind == 'nullable':
+            data[name] = pd.arrays.IntegerArray(values, load(f'{index}.mask'))
+        else:
+            data[name] = values
+    frame = pd.DataFrame(data, copy=False)
+    _attached = (handle.folder, frame)
+    return frame
@@ -0,0 +1,61 @@
+"""
+Stage graph for selective runs (--only)
+
+Every output the CLI can produce is a target; each stage lists the stages
+whose results it reads. plan() expands the requested targets to the
+smallest closed set of stages, so `--only q2` builds the cube and Q1's
+monthly table but does not print Q1, draw its chart or touch the Excel
+workbook.
+"""
+
+# Stage -> stages it reads from, in the order stages run
+DEPENDENCIES = {
+    'data': (),                  # cleaned rows (or the streamed/merged cube)
+    'aggregates': ('data',),     # the Aggregates cube every output reads
+    'monthly': ('aggregates',),  # per-month orders and sales (Q1, Q2)
+    'q1': ('monthly',),
+    'q2': ('monthly',),
+    'q3': ('aggregates',),
+    'q4': ('aggregates',),
+    'q5': ('aggregates',),
+    'q6': ('aggregates',),
+    'q7': ('aggregates',),
+    'q8': ('aggregates',),
+    'report': ('aggregates',),   # summary_report.txt
+    'excel': ('aggregates', 'data'),  # workbook (summary sheets + raw rows)
+}
+
+# What --only accepts
+TARGETS = ('q1', 'q2', 'q3', 'q4', 'q5', 'q6', 'q7', 'q8', 'report', 'excel')
+
+QUESTIONS = TARGETS[:8]
+
+# Targets that read a single Year of the cube (questions.REPORT_YEAR)
+YEAR_SCOPED = ('q3', 'q4')
+
+
+def parse_targets(text):
+    """Targets from a comma-separated list such as 'q5,q7,excel'."""
+    targets = [name.strip().lower() for name in text.split(',') if name.strip()]
+    unknown = [name for name in targets if name not in TARGETS]
+    if unknown or not targets:
+        raise ValueError(f"unknown target(s) {', '.join(unknown) or '(none)'}; "
+                         f"choose from {', '.join(TARGETS)}")
+    return targets
+
+
+def plan(targets=TARGETS):
+    """Stages needed for `targets`, dependencies first, as a tuple."""
+    needed = set()
+    pending = list(targets)
+    while pending:
+        stage = pending.pop()
+        if stage not in needed:
+            needed.add(stage)
+            pending.extend(DEPENDENCIES[stage])
+    return tuple(stage for stage in DEPENDENCIES if stage in needed)
+
+
+def year_scoped(stages):
+    """True when every target in `stages` only reads the report year."""
+    return all(stage in YEAR_SCOPED for stage in stages if stage in TARGETS)
@@ -0,0 +1,179 @@
+"""
+Persisted aggregate state for incremental runs
+
+The Aggregates cube is fully mergeable (integer counts and paise sums,
+Order ID hash sets, min/max dates), so it can be saved after a run and
+merged with the aggregates of a delta CSV the next day without re-reading
+older data. The state file also records which source files went into it,
+so the same delta cannot be applied twice.
+
+States are stored in a canonical form (plain labels, float Year/Month,
+sorted rows), so a state built incrementally and one rebuilt from scratch
+over the same rows hold identical arrays; state_digest() hashes exactly
+those arrays so the two can be compared. That holds for HyperLogLog
+states too: merging sketches is order-independent, so their registers are
+identical as well.
+"""
+
+import hashlib
+import os
+import pickle
+
+import numpy as np
+import pandas as pd
+
+from vrinda.aggregates import DAILY_KEYS, DIMENSIONS, Aggregates, daily_columns
+from vrinda.hll import HyperLogLogTable
+from vrinda.cache import file_digest
+from vrinda.cleaning import AGE_LABELS, CLEANING_VERSION
+from vrinda.writer import atomic_path
+
+STATE_FORMAT = 2
+
+
+class StateError(Exception):
+    """The state file cannot be used for the requested update."""
+
+
+def _canonical_values(name, values):
+    if name == 'Date':
+        return np.asarray(values, dtype='datetime64[ns]')
+    if name == 'Age_Group':
+        return pd.Categorical(np.asarray(values, dtype=object), categories=AGE_LABELS, ordered=True)
+    if name in ('Year', 'Month'):
+        return np.asarray(values, dtype=np.float64)
+    return np.asarray(values, dtype=object)
+
+
+def canonical(agg, sort=True):
+    """
+    Aggregates with normalised dtypes and sorted rows. sort=False leaves the
+    distinct triples in their current order, which is all a run needs.
+    """
+    index = pd.MultiIndex.from_arrays(
+        [_canonical_values(name, agg.base.index.get_level_values(name)) for name in DIMENSIONS],
+        names=DIMENSIONS)
+    base = pd.DataFrame(agg.base.to_numpy(), index=index, columns=agg.base.columns) \
+        .astype(np.int64).sort_index()
+
+    distinct = {}
+    for dim, pairs in agg.distinct.items():
+        if agg.counted:
+            distinct[dim] = pairs
+            continue
+        if agg.approximate:
+            distinct[dim] = _canonical_sketches(pairs)
+            continue
+        frame = pd.DataFrame({col: (pairs[col].to_numpy(dtype=np.uint64) if col == 'oid'
+                                    else _canonical_values(col, pairs[col]))
+                              for col in pairs.columns})
+        distinct[dim] = frame.sort_values(list(frame.columns), ignore_index=True) if sort else frame
+
+    daily = {}
+    for key in DAILY_KEYS:
+        frame = agg.daily[key]
+        columns = daily_columns(key)
+        levels = [_canonical_values(name, frame.index.get_level_values(name)) for name in columns]
+        index = (pd.MultiIndex.from_arrays(levels, names=columns) if len(columns) > 1
+                 else pd.Index(levels[0], name=columns[0]))
+        daily[key] = pd.DataFrame(frame.to_numpy(), index=index, columns=frame.columns) \
+            .astype(np.int64).sort_index()
+
+    order_ids = agg.order_ids if agg.approximate or agg.counted else np.sort(agg.order_ids)
+    return Aggregates(base=base, distinct=distinct, order_ids=order_ids,
+                      min_date=agg.min_date, max_date=agg.max_date, daily=daily)
+
+
+def _canonical_sketches(table):
+    """A HyperLogLogTable with canonical key dtypes and its rows in key order."""
+    keys = pd.DataFrame({col: _canonical_values(col, table.keys[col]) for col in table.keys.columns})
+    order = keys.sort_values(list(keys.columns)).index.to_numpy()
+    return HyperLogLogTable(keys.iloc[order].reset_index(drop=True), table.registers[order],
+                            table.precision)
+
+
+def state_digest(agg):
+    """SHA-256 over the canonical aggregate arrays (not the pickle bytes)."""
+    if agg.counted:
+        raise ValueError("counted distinct orders have no Order IDs to save or compare")
+    agg = canonical(agg)
+    digest = hashlib.sha256()
+    digest.update(pd.util.hash_pandas_object(agg.base.index).to_numpy().tobytes())
+    digest.update(np.ascontiguousarray(agg.base.to_numpy()).tobytes())
+    for dim in DIMENSIONS:
+        if agg.approximate:
+            digest.update(pd.util.hash_pandas_object(agg.distinct[dim].keys, index=False)
+                          .to_numpy().tobytes())
+            digest.update(agg.distinct[dim].registers.tobytes())
+        else:
+            digest.update(pd.util.hash_pandas_object(agg.distinct[dim], index=False)
+                          .to_numpy().tobytes())
+    digest.update(agg.order_ids.to_bytes() if agg.approximate else agg.order_ids.tobytes())
+    for key in DAILY_KEYS:
+        digest.update(pd.util.hash_pandas_object(agg.daily[key].index).to_numpy().tobytes())
+        digest.update(np.ascontiguousarray(agg.daily[key].to_numpy()).tobytes())
+    digest.update(f"{agg.min_date}|{agg.max_date}".encode())
+    return digest.hexdigest()
+
+
+def source_record(path, rows):
+    """What the state remembers about an ingested file."""
+    st = os.stat(path)
+    return {
+        'path': os.path.abspath(path),
+        'size': st.st_size,
+        'sha256': file_digest(path),
+        'rows': rows,
+    }
+
+
+def save_state(path, agg, sources):
+    """
+    Write the canonical state for `agg`, built from `sources`
+    (source_record dicts). Returns the state digest.
+    """
+    agg = canonical(agg)
+    digest = state_digest(agg)
+    payload = {
+        'format': STATE_FORMAT,
+        'digest': digest,
+        'cleaning_version': CLEANING_VERSION,
+        'sources': list(sources),
+        'base': agg.base,
+        'distinct': agg.distinct,
+        'order_ids': agg.order_ids,
+        'min_date': agg.min_date,
+        'max_date': agg.max_date,
+        'daily': agg.daily,
+    }
+    folder = os.path.dirname(os.path.abspath(path))
+    os.makedirs(folder, exist_ok=True)
+    with atomic_path(path) as tmp_path:
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+    return digest
+
+
+def load_state(path):
+    """Return (Aggregates, sources) from a state file."""
+    with open(path, 'rb') as f:
+        payload = pickle.load(f)
+    if payload.get('format') != STATE_FORMAT:
+        raise StateError(f"{path} uses state format {payload.get('format')}, expected {STATE_FORMAT}; "
+                         f"rebuild it from the full data")
+    if payload.get('cleaning_version') != CLEANING_VERSION:
+        raise StateError(f"{path} was built with cleaning rules v{payload.get('cleaning_version')}, "
+                         f"current rules are v{CLEANING_VERSION}; rebuild it from the full data")
+    agg = Aggregates(base=payload['base'], distinct=payload['distinct'],
+                     order_ids=payload['order_ids'],
+                     min_date=payload['min_date'], max_date=payload['max_date'],
+                     daily=payload['daily'])
+    return agg, payload['sources']
+
+
+def check_not_applied(sources, record):
+    """Refuse a delta whose contents are already part of the state."""
+    for source in sources:
+        if source['sha256'] == record['sha256']:
+            raise StateError(f"{record['path']} was already applied to this state "
+                             f"(as {source['path']})")
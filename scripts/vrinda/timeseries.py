@@ -0,0 +1,101 @@
+"""
+Prefix-sum time series over the daily aggregates
+
+Aggregates.daily holds rows, orders and sales per day, in total and per
+Channel, Category and State. TimeSeriesIndex lays each series out on a
+dense day grid and stores its running totals, so the total of any date
+range is one subtraction, and resampling to weeks, months, quarters or
+years is one subtraction per period. Neither touches the cleaned rows or
+re-groups anything.
+
+    ts = TimeSeriesIndex(agg.daily)
+    ts.total('2022-07-01', '2022-09-30')                  # {'rows', 'orders', 'sales'}
+    ts.total('2022-07-01', '2022-09-30', dim='Channel')   # frame per channel
+    ts.resample('W')                                      # weekly rows/orders/sales
+    ts.resample('M', dim='ship-state')                    # monthly, per state
+
+Dates are inclusive whole days, like periods.Period.
+"""
+
+import numpy as np
+import pandas as pd
+
+from vrinda.aggregates import DAILY_KEYS, DAILY_MEASURES
+
+# resample() frequencies (pandas Period frequencies)
+FREQUENCIES = ('D', 'W', 'M', 'Q', 'Y')
+
+
+def _measures(sums):
+    """{'rows', 'orders', 'sales'} from summed DAILY_MEASURES (last axis)."""
+    return {'rows': sums[..., 0], 'orders': sums[..., 1], 'sales': sums[..., 2] / 100}
+
+
+class TimeSeriesIndex:
+    """Running totals of the daily series, answering date-range queries in O(1)."""
+
+    def __init__(self, daily):
+        days = daily['total'].index.get_level_values('Date').to_numpy().astype('datetime64[D]')
+        if len(days):
+            self.first_day = days.min()
+            self.days = int((days.max() - self.first_day).astype(np.int64)) + 1
+        else:
+            self.first_day, self.days = None, 0
+        # key -> (labels, running totals shaped (labels, days + 1, measures));
+        # totals[:, i] sums the days before first_day + i
+        self._series = {key: self._running_totals(daily[key], key) for key in DAILY_KEYS}
+
+    def _running_totals(self, frame, key):
+        if key == 'total':
+            labels, codes = pd.Index([key]), np.zeros(len(frame), dtype=np.intp)
+        else:
+            codes, labels = pd.factorize(frame.index.get_level_values(key), sort=True)
+        dense = np.zeros((len(labels), self.days + 1, len(DAILY_MEASURES)), dtype=np.int64)
+        if len(frame):
+            offsets = self._offsets(frame.index.get_level_values('Date').to_numpy())
+            np.add.at(dense, (codes, offsets + 1), frame[DAILY_MEASURES].to_numpy())
+        return pd.Index(labels, name=None if key == 'total' else key), np.cumsum(dense, axis=1)
+
+    def _offsets(self, days):
+        """Grid offsets of `days` (datetime64 values), clipped to the index (0 .. self.days)."""
+        days = np.asarray(days).astype('datetime64[D]')
+        if not self.days:
+            return np.zeros(days.shape, dtype=np.int64)
+        return np.clip((days - self.first_day).astype(np.int64), 0, self.days)
+
+    def total(self, start, end, dim=None):
+        """
+        Rows, orders and sales dated `start` to `end` (inclusive): a dict,
+        or with `dim` (Channel, Category or ship-state) a frame per value.
+        """
+        start, stop = self._offsets([np.datetime64(pd.Timestamp(start), 'D'),
+                                     np.datetime64(pd.Timestamp(end), 'D') + 1])
+        stop = max(start, stop)
+        labels, totals = self._series[dim or 'total']
+        sums = totals[:, stop] - totals[:, start]
+        if dim is None:
+            return {name: values[0].item() for name, values in _measures(sums).items()}
+        return pd.DataFrame(_measures(sums), index=labels)
+
+    def resample(self, freq, dim=None):
+        """
+        Rows, orders and sales per period of `freq` (D, W, M, Q or Y),
+        indexed by pandas Period (and `dim` value when given). Periods with
+        no dated rows are included, with zeros.
+        """
+        if freq not in FREQUENCIES:
+            raise ValueError(f"unknown frequency {freq!r}; choose from {', '.join(FREQUENCIES)}")
+        labels, totals = self._series[dim or 'total']
+        if not self.days:
+            periods = pd.PeriodIndex([], freq=freq)
+        else:
+            periods = pd.period_range(pd.Timestamp(self.first_day),
+                                      pd.Timestamp(self.first_day + self.days - 1), freq=freq)
+        # Period i covers grid days edges[i] .. edges[i + 1] - 1
+        edges = np.append(self._offsets(periods.start_time.to_numpy()), self.days)
+        sums = totals[:, edges[1:]] - totals[:, edges[:-1]]   # (labels, periods, measures)
+        if dim is None:
+            return pd.DataFrame(_measures(sums[0]), index=periods.rename('Period'))
+        index = pd.MultiIndex.from_product([periods, labels], names=['Period', dim])
+        return pd.DataFrame(_measures(sums.transpose(1, 0, 2).reshape(-1, sums.shape[2])),
+                            index=index)
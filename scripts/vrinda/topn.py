@@ -0,0 +1,102 @@
+"""
+Top-N selection and streaming heavy hitters
+
+The "top states" and "top categories" outputs only need the few largest
+entries of a table, so top_n() selects them by partial selection
+(nlargest, an O(n) heap/argpartition pass) instead of sorting the whole
+table; ties keep their table order, as a stable sort would.
+
+For columns with too many distinct values to hold an exact total per
+value in streaming mode (SKU, ship-city), HeavyHitters keeps a bounded
+number of weighted counters: the Misra-Gries summary, the mergeable form
+of Space-Saving. With `capacity` counters over a stream of total weight W:
+
+  * every kept counter is a lower bound on its value's true total, low by
+    at most error_bound() <= W / (capacity + 1);
+  * every value whose true total exceeds error_bound() is kept.
+
+So top(n) is exact whenever the n-th total is well above the bound, and
+each estimate comes with its interval [estimate, estimate + error_bound()].
+Summaries of disjoint streams merge() with the same guarantee.
+
+The guarantee needs non-negative weights. Rows with a negative weight (a
+refund or a negative Amount) are left out of the summary rather than
+failing the stream; HeavyHitters counts them in `skipped_rows` and
+`skipped_weight`, so the caller can warn about them.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def top_n(table, n, column=None):
+    """
+    The `n` largest entries of a Series, or rows of a DataFrame by `column`,
+    largest first - table.sort_values(ascending=False).head(n) without the
+    full sort.
+    """
+    if column is None:
+        return table.nlargest(n, keep='first')
+    return table.nlargest(n, column, keep='first')
+
+
+def top_totals(keys, weights, n):
+    """Exact top_n() of `weights` summed per value of `keys` (HeavyHitters' in-memory counterpart)."""
+    keys = pd.Series(keys).reset_index(drop=True)
+    totals = pd.Series(np.asarray(weights)).groupby(keys, observed=True, dropna=True, sort=False).sum()
+    return top_n(totals, n)
+
+
+class HeavyHitters:
+    """Bounded-memory weighted top-N of one column (see the module docstring)."""
+
+    def __init__(self, capacity=1000):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self.counters = pd.Series(dtype=np.int64)
+        self.total = 0
+        self.skipped_rows = 0
+        self.skipped_weight = 0
+
+    def update(self, keys, weights):
+        """
+        Add integer `weights` per value of `keys`. Missing keys are skipped,
+        and so are negative weights (counted in skipped_rows/skipped_weight).
+        """
+        keys = pd.Series(keys).reset_index(drop=True)
+        weights = pd.Series(np.asarray(weights, dtype=np.int64))
+        negative = (weights < 0).to_numpy()
+        if negative.any():
+            self.skipped_rows += int(negative.sum())
+            self.skipped_weight += int(weights[negative].sum())
+            keys, weights = keys[~negative], weights[~negative]
+        batch = weights.groupby(keys, observed=True, dropna=True, sort=False).sum()
+        self._absorb(batch)
+
+    def merge(self, other):
+        """Fold in the summary of another (disjoint) stream."""
+        self.skipped_rows += other.skipped_rows
+        self.skipped_weight += other.skipped_weight
+        self._absorb(other.counters, other.total)
+
+    def _absorb(self, counts, total=None):
+        counts = counts.set_axis(counts.index.astype(object))
+        self.total += int(counts.sum()) if total is None else total
+        merged = self.counters.add(counts, fill_value=0).astype(np.int64)
+        if len(merged) > self.capacity:
+            # Misra-Gries reduction: take the (capacity + 1)-th largest count
+            # off every counter and drop those that reach zero
+            values = merged.to_numpy()
+            cut = len(values) - self.capacity - 1
+            threshold = np.partition(values, cut)[cut]
+            merged = merged[merged > threshold] - threshold
+        self.counters = merged
+
+    def error_bound(self):
+        """Most any kept counter can be below its true total (same units as the weights)."""
+        return (self.total - int(self.counters.sum())) / (self.capacity + 1)
+
+    def top(self, n):
+        """The `n` largest counters as a Series (lower-bound estimates), largest first."""
+        return top_n(self.counters, n)
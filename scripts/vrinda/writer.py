@@ -0,0 +1,150 @@
+"""
+Background output writing
+
+A run used to compute, then block on each of its writes in turn: a PNG per
+question, summary_report.txt and finally the Excel workbook, the largest of
+them. OutputWriter moves those writes onto a few threads fed by a bounded
+queue. The main thread queues a write and goes on to the next question.
+When the queue is full, submit() blocks, so a slow disk holds back the
+computation instead of letting finished outputs pile up in memory. wait()
+blocks until every queued write is done and re-raises the first error.
+
+Every file goes through atomic_write() or atomic_path(): it is written
+under a unique temporary name in the same folder and renamed into place, so
+readers of output/ never see a partial file.
+"""
+
+import contextlib
+import functools
+import os
+import queue
+import tempfile
+import threading
+
+# Writer threads and queued writes per OutputWriter
+WRITER_THREADS = 2
+MAX_PENDING = 16
+
+
+# Mode of new outputs where the umask cannot be read (see _file_mode)
+DEFAULT_MODE = 0o644
+
+
+@functools.lru_cache(maxsize=None)
+def _file_mode():
+    """
+    The mode a plain open() gives a new file: 0o666 less the umask. The
+    temporary files are created 0600 and get this mode before the rename.
+    os.umask() can only be read by setting it, which would race with other
+    threads creating files, so the umask is read from /proc (Linux) and
+    DEFAULT_MODE is used elsewhere.
+    """
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('Umask:'):
+                    return 0o666 & ~int(line.split()[1], 8)
+    except (OSError, ValueError):
+        pass
+    return DEFAULT_MODE
+
+
+@contextlib.contextmanager
+def atomic_path(path):
+    """
+    Yield a temporary path next to `path`; once the block succeeds it is
+    renamed to `path`, otherwise it is removed. The temporary name is
+    unique, so concurrent writers of the same file never share it.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.',
+                                    prefix=os.path.basename(path) + '.', suffix='.tmp')
+    os.close(fd)
+    try:
+        yield tmp_path
+        os.chmod(tmp_path, _file_mode())
+        os.replace(tmp_path, path)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(tmp_path)
+        raise
+
+
+def atomic_write(path, data, encoding='utf-8'):
+    """Write `data` (str or bytes) to `path` atomically; returns path."""
+    mode, options = ('w', {'encoding': encoding}) if isinstance(data, str) else ('wb', {})
+    with atomic_path(path) as tmp_path:
+        with open(tmp_path, mode, **options) as f:
+            f.write(data)
+    return path
+
+
+class OutputWriter:
+    """
+    Run write jobs on background threads (see the module docstring).
+
+    Threads start with the first job, so a run that writes nothing starts
+    none. Use as a context manager, or call close() when done.
+    """
+
+    def __init__(self, threads=WRITER_THREADS, max_pending=MAX_PENDING):
+        self.threads = max(1, threads)
+        self._queue = queue.Queue(maxsize=max(1, max_pending))
+        self._workers = []
+        self._errors = []
+        self._lock = threading.Lock()
+
+    def _work(self):
+        while True:
+            job = self._queue.get()
+            try:
+                if job is None:
+                    return
+                func, args, kwargs = job
+                func(*args, **kwargs)
+            except BaseException as e:
+                with self._lock:
+                    self._errors.append(e)
+            finally:
+                self._queue.task_done()
+
+    def submit(self, func, *args, **kwargs):
+        """Queue func(*args, **kwargs); blocks while MAX_PENDING jobs are waiting."""
+        if len(self._workers) < self.threads:
+            worker = threading.Thread(target=self._work, name='output-writer', daemon=True)
+            worker.start()
+            self._workers.append(worker)
+        self._queue.put((func, args, kwargs))
+
+    def write(self, path, data):
+        """Queue atomic_write(path, data)."""
+        self.submit(atomic_write, path, data)
+
+    def wait(self):
+        """Block until every queued job is done; re-raise the first error."""
+        self._queue.join()
+        with self._lock:
+            errors, self._errors = self._errors, []
+        if errors:
+            raise errors[0]
+
+    def close(self):
+        """wait(), then stop the threads."""
+        try:
+            self.wait()
+        finally:
+            for _ in self._workers:
+                self._queue.put(None)
+            for worker in self._workers:
+                worker.join()
+            self._workers = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        if exc[0] is None:
+            self.close()
+            return
+        # Already failing: stop the threads but keep the original error
+        with contextlib.suppress(BaseException):
+            self.close()
@@ -0,0 +1,27 @@
+"""
+Shared fixtures. The package lives in scripts/ and the seeded data
+generator in benchmarks/, so both are put on sys.path here.
+"""
+
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'scripts'))
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+import synth  # noqa: E402
+
+# Small enough to keep the tests fast, large enough that every state,
+# channel, category and status appears
+FIXTURE_ROWS = 3_000
+
+
+@pytest.fixture(scope='session')
+def store_csv(tmp_path_factory):
+    """A seeded synthetic export with the real export's columns and quirks."""
+    path = str(tmp_path_factory.mktemp('data') / 'store.csv')
+    synth.write_csv(path, FIXTURE_ROWS, seed=0)
+    return path
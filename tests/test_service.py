@@ -0,0 +1,139 @@
+"""The --serve JSON query service, on a random localhost port."""
+
+import json
+import os
+import shutil
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+from vrinda import service as service_module
+from vrinda.cli import _source_signature
+from vrinda.loading import read_clean
+from vrinda.service import HOST, AnalyticsService, make_server
+
+import synth
+
+
+@pytest.fixture
+def source(store_csv, tmp_path):
+    """A copy of the fixture CSV the test may rewrite."""
+    path = str(tmp_path / 'store.csv')
+    shutil.copyfile(store_csv, path)
+    return path
+
+
+@pytest.fixture
+def server(source):
+    """(service, base URL) of a server running in a thread on 127.0.0.1."""
+    service = AnalyticsService(lambda: read_clean(source), lambda: _source_signature(source))
+    httpd = make_server(service, 0)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield service, f'http://{HOST}:{httpd.server_address[1]}'
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+        thread.join()
+
+
+def get(url):
+    """(status, X-Cache header, JSON body) of GET `url`."""
+    try:
+        with urllib.request.urlopen(url, timeout=30) as response:
+            return response.status, response.headers.get('X-Cache'), json.load(response)
+    except urllib.error.HTTPError as e:
+        with e:
+            return e.code, e.headers.get('X-Cache'), json.load(e)
+
+
+def test_binds_to_localhost_only(server):
+    _, base = server
+    assert base.startswith('http://127.0.0.1:')
+
+
+def test_repeated_query_is_a_cache_hit(server):
+    _, base = server
+    status, cache, first = get(f'{base}/q5?period=2022-Q3&Channel=Amazon,Myntra&n=5')
+    assert (status, cache) == (200, 'miss')
+    assert len(first['result']) == 5
+    assert first['filters'] == {'Channel': ['Amazon', 'Myntra']}
+
+    status, cache, again = get(f'{base}/q5?period=2022-Q3&Channel=Myntra,Amazon&n=5')
+    assert (status, cache) == (200, 'hit')
+    assert again == first
+
+
+def test_unknown_query_is_404(server):
+    _, base = server
+    status, _, body = get(f'{base}/q9')
+    assert status == 404
+    assert 'unknown query' in body['error']
+
+
+def test_unknown_filter_is_400(server):
+    _, base = server
+    status, _, body = get(f'{base}/q1?Colour=Red')
+    assert status == 400
+    assert 'unknown filter' in body['error']
+
+
+@pytest.mark.parametrize('n', ['abc', '0', '-3', '2.5'])
+def test_bad_n_is_400(server, n):
+    _, base = server
+    status, _, body = get(f'{base}/q6?n={n}')
+    assert status == 400
+    assert body['error'].startswith('n must be a positive integer')
+
+
+def test_bad_period_is_400(server):
+    _, base = server
+    status, _, _ = get(f'{base}/q1?period=2022-Q9')
+    assert status == 400
+
+
+def test_changed_source_is_reloaded(server, source):
+    service, base = server
+    _, _, before = get(f'{base}/summary')
+    assert get(f'{base}/summary')[1] == 'hit'
+
+    synth.write_csv(source, 2_000, seed=1)
+    # Sizes differ, but make sure the mtime moves on coarse-timestamp filesystems too
+    stat = os.stat(source)
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    status, cache, after = get(f'{base}/summary')
+    assert (status, cache) == (200, 'miss')
+    assert after['version'] == before['version'] + 1
+    assert after['result'] != before['result']
+    assert get(f'{base}/health')[2]['rows'] == len(service.df)
+
+
+def test_reload_during_build_is_not_cached(store_csv, monkeypatch):
+    df = read_clean(store_csv)
+    source = [0]
+    service = AnalyticsService(lambda: df, lambda: source[0])
+    answer = service_module.answer
+
+    def reloading_answer(*args, **kwargs):
+        # The lock is free while a miss is built; another request reloads the data meanwhile
+        assert service._lock.acquire(blocking=False)
+        service._lock.release()
+        source[0] += 1
+        service._snapshot()
+        return answer(*args, **kwargs)
+
+    monkeypatch.setattr(service_module, 'answer', reloading_answer)
+    body, hit = service.query('q7', {'Category': ['Set']})
+    assert not hit
+    assert json.loads(body)['version'] == 1
+    assert service.version == 2
+    assert service.responses.stats()['entries'] == 0
+
+    monkeypatch.setattr(service_module, 'answer', answer)
+    body, hit = service.query('q7', {'Category': ['Set']})
+    assert (hit, json.loads(body)['version']) == (False, 2)
+    assert service.query('q7', {'Category': ['Set']})[1]